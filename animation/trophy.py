@@ -1,10 +1,200 @@
 """
 奖杯动画模块 - 处理奖杯的动画效果和交互
+光晕、闪电、星光等贴图只渲染一次，粒子保存在定长数组中，胜利动画期间每帧不再创建新的 Surface
 """
 import pygame
 import random
 import math
 
+from rsc_mng.rotation_cache import rotation_cache
+
+# 环绕发光粒子的容量（每帧最多生成一个、寿命不超过120帧，不会溢出）
+GLOW_PARTICLE_CAPACITY = 128
+# 爆炸粒子数量
+EXPLOSION_PARTICLE_COUNT = 150
+# 光晕、光环和粒子共用的绘制缓冲区边长（最大光晕直径 2 * (40 + 5 * 15 + 20)）
+SCRATCH_SIZE = 270
+# 星光缓冲区边长（星星最大 4 像素，贴图为 4 倍大小）
+STAR_SCRATCH_SIZE = 16
+
+GLOW_PARTICLE_COLORS = [
+    (255, 255, 100),  # 金黄色
+    (255, 200, 50),  # 橙黄色
+    (255, 255, 255),  # 白色
+    (255, 150, 0)  # 橙色
+]
+# 更丰富的颜色选择
+EXPLOSION_COLORS = [
+    (255, 215, 0),  # 金色
+    (255, 255, 0),  # 黄色
+    (255, 165, 0),  # 橙色
+    (255, 255, 255),  # 白色
+    (255, 100, 100),  # 粉红色
+    (100, 255, 100),  # 绿色
+]
+
+
+class ParticleArray:
+    """定长粒子数组：各字段存成并列列表并预先分配容量，不再为每个粒子创建字典"""
+
+    def __init__(self, capacity, fields):
+        self.capacity = capacity
+        self.count = 0
+        self.fields = fields
+        for field in fields:
+            setattr(self, field, [0] * capacity)
+
+    def __len__(self):
+        return self.count
+
+    def add(self, *values):
+        """按 fields 的顺序追加一个粒子，容量已满时丢弃，返回是否加入"""
+        index = self.count
+        if index >= self.capacity:
+            return False
+        for field, value in zip(self.fields, values):
+            getattr(self, field)[index] = value
+        self.count = index + 1
+        return True
+
+    def compact(self, alive):
+        """按 alive[i] 保留粒子，保持原有顺序"""
+        write = 0
+        columns = [getattr(self, field) for field in self.fields]
+        for read in range(self.count):
+            if alive[read]:
+                if write != read:
+                    for column in columns:
+                        column[write] = column[read]
+                write += 1
+        self.count = write
+
+    def clear(self):
+        self.count = 0
+
+
+class TrophyTextures:
+    """奖杯特效贴图缓存，所有奖杯共用"""
+
+    def __init__(self):
+        self._scratch = None
+        self._composites = {}  # (颜色, 透明度) -> 半透明圆先叠到透明底上得到的像素颜色
+        self._lightning = None
+        self._star = None  # 星光专用缓冲区（需要单独设置整体透明度）
+        self._tails = {}  # (大小, 颜色) -> 尾迹圆环贴图
+        self._bodies = {}  # (宽, 高) -> 无图片时的奖杯主体
+
+    @property
+    def scratch(self):
+        """可重复使用的绘制缓冲区"""
+        if self._scratch is None:
+            self._scratch = pygame.Surface((SCRATCH_SIZE, SCRATCH_SIZE), pygame.SRCALPHA)
+        return self._scratch
+
+    def composite(self, color, alpha):
+        """纯色图形 set_alpha 后叠加到透明表面上得到的像素颜色（与逐帧新建表面叠加的结果一致）"""
+        alpha = max(0, min(255, alpha))
+        key = (color, alpha)
+        pixel = self._composites.get(key)
+        if pixel is None:
+            source = pygame.Surface((1, 1), pygame.SRCALPHA)
+            source.fill(color)
+            source.set_alpha(alpha)
+            target = pygame.Surface((1, 1), pygame.SRCALPHA)
+            target.blit(source, (0, 0))
+            pixel = self._composites[key] = tuple(target.get_at((0, 0)))
+        return pixel
+
+    def draw_circle(self, surface, color, alpha, box_size, center, radius, width, position):
+        """在缓冲区左上角 box_size 大小的区域画半透明圆（环）后贴到 surface 的 position
+        贴完用透明色把同一个圆再画一遍擦掉，比整块 fill 清空快"""
+        scratch = self.scratch
+        pygame.draw.circle(scratch, self.composite(color, alpha), center, radius, width)
+        surface.blit(scratch, position, (0, 0, box_size, box_size))
+        pygame.draw.circle(scratch, (0, 0, 0, 0), center, radius, width)
+
+    @property
+    def lightning(self):
+        """十字加对角线的闪电贴图"""
+        if self._lightning is None:
+            lightning_surface = pygame.Surface((100, 100), pygame.SRCALPHA)
+            lightning_color = (255, 255, 255)
+
+            # 绘制十字闪光
+            cross = pygame.Surface((100, 100), pygame.SRCALPHA)
+            pygame.draw.line(cross, lightning_color, (50, 20), (50, 80), 3)
+            pygame.draw.line(cross, lightning_color, (20, 50), (80, 50), 3)
+            cross.set_alpha(200)
+            lightning_surface.blit(cross, (0, 0))
+
+            # 绘制对角线闪光
+            diagonal = pygame.Surface((100, 100), pygame.SRCALPHA)
+            pygame.draw.line(diagonal, lightning_color, (30, 30), (70, 70), 2)
+            pygame.draw.line(diagonal, lightning_color, (70, 30), (30, 70), 2)
+            diagonal.set_alpha(100)
+            lightning_surface.blit(diagonal, (0, 0))
+            self._lightning = lightning_surface
+        return self._lightning
+
+    def draw_star(self, surface, star_size, star_color, star_alpha, points, position):
+        """在星光专用缓冲区上画四角星（points 为缓冲区坐标）后以 star_alpha 贴到 surface 上"""
+        if self._star is None:
+            self._star = pygame.Surface((STAR_SCRATCH_SIZE, STAR_SCRATCH_SIZE), pygame.SRCALPHA)
+        star_surface = self._star
+        pygame.draw.polygon(star_surface, star_color, points)
+        star_surface.set_alpha(star_alpha)
+        surface.blit(star_surface, position, (0, 0, star_size * 4, star_size * 4))
+        pygame.draw.polygon(star_surface, (0, 0, 0, 0), points)
+
+    def tail(self, size, color):
+        """爆炸粒子的尾迹圆环（共享，绘制前需设置透明度）"""
+        key = (size, color)
+        tail_surface = self._tails.get(key)
+        if tail_surface is None:
+            tail_surface = pygame.Surface((size * 2 + 4, size * 2 + 4), pygame.SRCALPHA)
+            pygame.draw.circle(tail_surface, color, (size + 2, size + 2), size + 2, 2)
+            self._tails[key] = tail_surface
+        return tail_surface
+
+    def body(self, width, height):
+        """没有奖杯图片时使用的渐变奖杯主体"""
+        key = (width, height)
+        trophy_surface = self._bodies.get(key)
+        if trophy_surface is None:
+            trophy_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+
+            # 绘制渐变奖杯主体
+            for i in range(height):
+                color_ratio = i / height
+                r = int(255 * (1 - color_ratio * 0.3))
+                g = int(215 + color_ratio * 40)
+                b = int(color_ratio * 50)
+                pygame.draw.line(trophy_surface, (r, g, b), (0, i), (width, i))
+
+            # 绘制高光
+            highlight_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+            highlight_rect = (width // 4, height // 6, width // 2, height // 3)
+            pygame.draw.ellipse(highlight_surface, (255, 255, 255), highlight_rect)
+            highlight_surface.set_alpha(120)
+            trophy_surface.blit(highlight_surface, (0, 0))
+
+            # 绘制装饰边框
+            pygame.draw.rect(trophy_surface, (218, 165, 32), (0, 0, width, height), 4)
+            self._bodies[key] = trophy_surface
+        return trophy_surface
+
+    def clear(self):
+        """清空所有缓存"""
+        self._scratch = None
+        self._composites.clear()
+        self._lightning = None
+        self._star = None
+        self._tails.clear()
+        self._bodies.clear()
+
+
+trophy_textures = TrophyTextures()
+
 
 class Trophy:
     """奖杯类 - 包含完整的动画效果和粒子系统"""
@@ -15,7 +205,8 @@ class Trophy:
         self.width = 60
         self.height = 80
         self.collected = False
-        self.particles = []
+        self.particles = ParticleArray(EXPLOSION_PARTICLE_COUNT,
+                                       ('x', 'y', 'vx', 'vy', 'size', 'color', 'life', 'max_life'))
         self.explosion_started = False
         self.explosion_complete = False
         self.fade_timer = 0
@@ -41,7 +232,9 @@ class Trophy:
         # 脉冲发光效果
         self.pulse_timer = 0
         self.pulse_speed = 0.08
-        self.glow_particles = []
+        self.glow_particles = ParticleArray(GLOW_PARTICLE_CAPACITY,
+                                            ('angle', 'distance', 'life', 'max_life', 'size', 'color'))
+        self._alive = [True] * max(EXPLOSION_PARTICLE_COUNT, GLOW_PARTICLE_CAPACITY)
 
         # 环形光晕效果
         self.halo_timer = 0
@@ -52,31 +245,28 @@ class Trophy:
         if random.random() < 0.3:  # 30%概率生成新粒子
             angle = random.uniform(0, math.pi * 2)
             distance = random.uniform(35, 60)  # 距离奖杯中心的距离
-            self.glow_particles.append({
-                'angle': angle,
-                'distance': distance,
-                'life': random.randint(60, 120),
-                'max_life': random.randint(60, 120),
-                'size': random.randint(2, 5),
-                'color': random.choice([
-                    (255, 255, 100),  # 金黄色
-                    (255, 200, 50),  # 橙黄色
-                    (255, 255, 255),  # 白色
-                    (255, 150, 0)  # 橙色
-                ])
-            })
+            life = random.randint(60, 120)
+            max_life = random.randint(60, 120)
+            size = random.randint(2, 5)
+            color = random.choice(GLOW_PARTICLE_COLORS)
+            self.glow_particles.add(angle, distance, life, max_life, size, color)
 
     def update_glow_particles(self):
         """更新发光粒子"""
-        for particle in self.glow_particles[:]:
-            particle['angle'] += 0.03  # 粒子绕奖杯旋转
-            particle['life'] -= 1
-
-            if particle['life'] <= 0:
-                self.glow_particles.remove(particle)
+        particles = self.glow_particles
+        angles, lives, alive = particles.angle, particles.life, self._alive
+        removed = False
+        for i in range(particles.count):
+            angles[i] += 0.03  # 粒子绕奖杯旋转
+            lives[i] -= 1
+            alive[i] = lives[i] > 0
+            removed = removed or not alive[i]
+        if removed:
+            particles.compact(alive)
 
     def draw_enhanced_glow(self, surface):
         """绘制增强的发光效果"""
+        textures = trophy_textures
         center_x = self.x + self.width // 2
         center_y = self.y + self.height // 2
 
@@ -87,17 +277,10 @@ class Trophy:
         for i in range(6):  # 增加发光层数
             glow_radius = 40 + i * 15 + int(pulse_intensity * 20)
             glow_alpha = max(5, int((80 - i * 12) * pulse_intensity))
-
-            glow_surface = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
             glow_color = (255, min(255, 215 + int(pulse_intensity * 40)), 0)
-
-            # 创建临时表面来绘制圆形，然后设置透明度
-            temp_surface = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(temp_surface, glow_color, (glow_radius, glow_radius), glow_radius)
-            temp_surface.set_alpha(glow_alpha)
-            glow_surface.blit(temp_surface, (0, 0))
-
-            surface.blit(glow_surface, (center_x - glow_radius, center_y - glow_radius))
+            textures.draw_circle(surface, glow_color, glow_alpha, glow_radius * 2,
+                                 (glow_radius, glow_radius), glow_radius, 0,
+                                 (center_x - glow_radius, center_y - glow_radius))
 
         # 2. 绘制环形光晕
         self.halo_timer += self.halo_speed
@@ -108,34 +291,22 @@ class Trophy:
             halo_y = center_y + math.sin(halo_angle) * 5
 
             halo_alpha = int(100 + math.sin(halo_angle * 2) * 50)
-            halo_surface = pygame.Surface((int(halo_radius * 2), int(halo_radius * 2)), pygame.SRCALPHA)
-
-            # 创建临时表面来绘制环形，然后设置透明度
-            temp_halo = pygame.Surface((int(halo_radius * 2), int(halo_radius * 2)), pygame.SRCALPHA)
-            pygame.draw.circle(temp_halo, (255, 255, 200),
-                               (int(halo_radius), int(halo_radius)), int(halo_radius), 3)
-            temp_halo.set_alpha(halo_alpha)
-            halo_surface.blit(temp_halo, (0, 0))
-
-            surface.blit(halo_surface, (halo_x - halo_radius, halo_y - halo_radius))
+            textures.draw_circle(surface, (255, 255, 200), halo_alpha, int(halo_radius * 2),
+                                 (int(halo_radius), int(halo_radius)), int(halo_radius), 3,
+                                 (halo_x - halo_radius, halo_y - halo_radius))
 
         # 3. 绘制发光粒子
-        for particle in self.glow_particles:
-            particle_x = center_x + math.cos(particle['angle']) * particle['distance']
-            particle_y = center_y + math.sin(particle['angle']) * particle['distance']
-
-            alpha = int(255 * (particle['life'] / particle['max_life']))
-
-            particle_surface = pygame.Surface((particle['size'] * 2, particle['size'] * 2), pygame.SRCALPHA)
-            # 分别绘制颜色和透明度
-            color_surface = pygame.Surface((particle['size'] * 2, particle['size'] * 2), pygame.SRCALPHA)
-            pygame.draw.circle(color_surface, particle['color'],
-                               (particle['size'], particle['size']), particle['size'])
-            color_surface.set_alpha(alpha)
-            particle_surface.blit(color_surface, (0, 0))
-
-            surface.blit(particle_surface,
-                         (particle_x - particle['size'], particle_y - particle['size']))
+        particles = self.glow_particles
+        for i in range(particles.count):
+            angle = particles.angle[i]
+            distance = particles.distance[i]
+            size = particles.size[i]
+            particle_x = center_x + math.cos(angle) * distance
+            particle_y = center_y + math.sin(angle) * distance
+
+            alpha = int(255 * (particles.life[i] / particles.max_life[i]))
+            textures.draw_circle(surface, particles.color[i], alpha, size * 2, (size, size), size, 0,
+                                 (particle_x - size, particle_y - size))
 
     def draw(self, surface):
         """绘制奖杯主体"""
@@ -167,61 +338,17 @@ class Trophy:
 
             current_alpha = int(self.min_alpha + (self.max_alpha - self.min_alpha) * alpha_ratio)
 
-            # 绘制奖杯主体
-            if self.image:
-                # 创建旋转后的图像
-                trophy_surface = self.image.copy()
-                if self.rotation_angle != 0:
-                    trophy_surface = pygame.transform.rotate(trophy_surface, self.rotation_angle)
-                    # 重新计算绘制位置以保持居中
-                    new_rect = trophy_surface.get_rect()
-                    draw_x = self.x + self.width // 2 - new_rect.width // 2
-                    draw_y = current_y + self.height // 2 - new_rect.height // 2
-                else:
-                    draw_x = self.x
-                    draw_y = current_y
-
-                trophy_surface.set_alpha(current_alpha)
-                surface.blit(trophy_surface, (draw_x, draw_y))
-            else:
-                # 后备绘制方法 - 增强版
-                trophy_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-
-                # 绘制渐变奖杯主体
-                for i in range(self.height):
-                    color_ratio = i / self.height
-                    r = int(255 * (1 - color_ratio * 0.3))
-                    g = int(215 + color_ratio * 40)
-                    b = int(color_ratio * 50)
-
-                    line_color = (r, g, b)
-                    pygame.draw.line(trophy_surface, line_color,
-                                     (0, i), (self.width, i))
-
-                # 绘制高光
-                highlight_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-                highlight_rect = (self.width // 4, self.height // 6,
-                                  self.width // 2, self.height // 3)
-                pygame.draw.ellipse(highlight_surface, (255, 255, 255), highlight_rect)
-                highlight_surface.set_alpha(120)
-                trophy_surface.blit(highlight_surface, (0, 0))
-
-                # 绘制装饰边框
-                pygame.draw.rect(trophy_surface, (218, 165, 32),
-                                 (0, 0, self.width, self.height), 4)
-
-                # 应用旋转
-                if self.rotation_angle != 0:
-                    trophy_surface = pygame.transform.rotate(trophy_surface, self.rotation_angle)
-                    new_rect = trophy_surface.get_rect()
-                    draw_x = self.x + self.width // 2 - new_rect.width // 2
-                    draw_y = current_y + self.height // 2 - new_rect.height // 2
-                else:
-                    draw_x = self.x
-                    draw_y = current_y
-
-                trophy_surface.set_alpha(current_alpha)
-                surface.blit(trophy_surface, (draw_x, draw_y))
+            # 绘制奖杯主体：有图片用图片，否则用预先绘制的渐变奖杯（后备绘制方法）
+            body = self.image if self.image else trophy_textures.body(self.width, self.height)
+            # 取预先旋转好的图像（共享帧，下面每次都会重新设置透明度）
+            trophy_surface = rotation_cache.get(body, self.rotation_angle)
+            # 重新计算绘制位置以保持居中
+            new_rect = trophy_surface.get_rect()
+            draw_x = self.x + self.width // 2 - new_rect.width // 2
+            draw_y = current_y + self.height // 2 - new_rect.height // 2
+
+            trophy_surface.set_alpha(current_alpha)
+            surface.blit(trophy_surface, (draw_x, draw_y))
 
             # 绘制闪电效果
             if random.random() < 0.15:  # 15%概率出现闪电
@@ -233,26 +360,7 @@ class Trophy:
 
     def draw_lightning_effect(self, surface, center_x, center_y):
         """绘制闪电效果"""
-        lightning_surface = pygame.Surface((100, 100), pygame.SRCALPHA)
-
-        # 创建闪电颜色的临时表面
-        lightning_color = (255, 255, 255)
-
-        # 绘制十字闪光
-        temp_surface1 = pygame.Surface((100, 100), pygame.SRCALPHA)
-        pygame.draw.line(temp_surface1, lightning_color, (50, 20), (50, 80), 3)
-        pygame.draw.line(temp_surface1, lightning_color, (20, 50), (80, 50), 3)
-        temp_surface1.set_alpha(200)
-        lightning_surface.blit(temp_surface1, (0, 0))
-
-        # 绘制对角线闪光
-        temp_surface2 = pygame.Surface((100, 100), pygame.SRCALPHA)
-        pygame.draw.line(temp_surface2, lightning_color, (30, 30), (70, 70), 2)
-        pygame.draw.line(temp_surface2, lightning_color, (70, 30), (30, 70), 2)
-        temp_surface2.set_alpha(100)
-        lightning_surface.blit(temp_surface2, (0, 0))
-
-        surface.blit(lightning_surface, (center_x - 50, center_y - 50))
+        surface.blit(trophy_textures.lightning, (center_x - 50, center_y - 50))
 
     def draw_star_sparkles(self, surface, center_x, center_y):
         """绘制星光闪烁效果"""
@@ -273,14 +381,10 @@ class Trophy:
                 radius = star_size if j % 2 == 0 else star_size // 2
                 px = star_x + math.cos(star_angle) * radius
                 py = star_y + math.sin(star_angle) * radius
-                points.append((px, py))
+                points.append((px - star_x + star_size * 2, py - star_y + star_size * 2))
 
-            if len(points) >= 3:
-                star_surface = pygame.Surface((star_size * 4, star_size * 4), pygame.SRCALPHA)
-                adjusted_points = [(p[0] - star_x + star_size * 2, p[1] - star_y + star_size * 2) for p in points]
-                pygame.draw.polygon(star_surface, star_color, adjusted_points)
-                star_surface.set_alpha(star_alpha)
-                surface.blit(star_surface, (star_x - star_size * 2, star_y - star_size * 2))
+            trophy_textures.draw_star(surface, star_size, star_color, star_alpha, points,
+                                      (star_x - star_size * 2, star_y - star_size * 2))
 
     def check_click(self, pos):
         """检查鼠标点击"""
@@ -301,48 +405,38 @@ class Trophy:
 
     def create_explosion_particles(self):
         """创建更壮观的爆炸粒子"""
-        for _ in range(150):  # 增加粒子数量
+        origin_x = self.x + self.width // 2
+        origin_y = self.y + self.height // 2
+        for _ in range(EXPLOSION_PARTICLE_COUNT):  # 增加粒子数量
             angle = random.uniform(0, math.pi * 2)
             speed = random.uniform(3, 12)  # 增加速度范围
             size = random.randint(2, 8)  # 增加大小范围
             life = random.randint(40, 120)  # 增加生命周期
+            color_choice = random.choice(EXPLOSION_COLORS)
 
-            # 更丰富的颜色选择
-            color_choice = random.choice([
-                (255, 215, 0),  # 金色
-                (255, 255, 0),  # 黄色
-                (255, 165, 0),  # 橙色
-                (255, 255, 255),  # 白色
-                (255, 100, 100),  # 粉红色
-                (100, 255, 100),  # 绿色
-            ])
-
-            self.particles.append({
-                'x': self.x + self.width // 2,
-                'y': self.y + self.height // 2,
-                'vx': math.cos(angle) * speed,
-                'vy': math.sin(angle) * speed,
-                'size': size,
-                'color': color_choice,
-                'life': life,
-                'max_life': life
-            })
+            self.particles.add(origin_x, origin_y, math.cos(angle) * speed, math.sin(angle) * speed,
+                               size, color_choice, life, life)
 
     def update(self):
         """更新奖杯状态"""
         if self.explosion_started:
             # 更新粒子
-            for particle in self.particles[:]:
-                particle['x'] += particle['vx']
-                particle['y'] += particle['vy']
-                particle['vy'] += 0.15  # 稍微增加重力
-                particle['life'] -= 1
-
-                if particle['life'] <= 0:
-                    self.particles.remove(particle)
+            particles = self.particles
+            xs, ys, vxs, vys, lives = particles.x, particles.y, particles.vx, particles.vy, particles.life
+            alive = self._alive
+            removed = False
+            for i in range(particles.count):
+                xs[i] += vxs[i]
+                ys[i] += vys[i]
+                vys[i] += 0.15  # 稍微增加重力
+                lives[i] -= 1
+                alive[i] = lives[i] > 0
+                removed = removed or not alive[i]
+            if removed:
+                particles.compact(alive)
 
             # 检查爆炸是否完成
-            if not self.particles:
+            if not particles.count:
                 self.explosion_complete = True
 
             # 更新淡出计时器
@@ -351,28 +445,23 @@ class Trophy:
 
     def draw_particles(self, surface):
         """绘制爆炸粒子"""
-        for particle in self.particles:
-            alpha = int(255 * (particle['life'] / particle['max_life']))
-
-            # 绘制带尾迹的粒子
-            particle_surface = pygame.Surface((particle['size'] * 2, particle['size'] * 2), pygame.SRCALPHA)
-
-            # 主粒子 - 使用分离的颜色和透明度处理
-            main_surface = pygame.Surface((particle['size'] * 2, particle['size'] * 2), pygame.SRCALPHA)
-            pygame.draw.circle(main_surface, particle['color'],
-                               (particle['size'], particle['size']), particle['size'])
-            main_surface.set_alpha(alpha)
-            particle_surface.blit(main_surface, (0, 0))
+        textures = trophy_textures
+        particles = self.particles
+        for i in range(particles.count):
+            size = particles.size[i]
+            color = particles.color[i]
+            x = particles.x[i]
+            y = particles.y[i]
+            alpha = int(255 * (particles.life[i] / particles.max_life[i]))
 
             # 尾迹效果
-            if particle['size'] > 3:
-                tail_surface = pygame.Surface((particle['size'] * 2 + 4, particle['size'] * 2 + 4), pygame.SRCALPHA)
-                pygame.draw.circle(tail_surface, particle['color'],
-                                   (particle['size'] + 2, particle['size'] + 2), particle['size'] + 2, 2)
+            if size > 3:
+                tail_surface = textures.tail(size, color)
                 tail_surface.set_alpha(alpha // 3)
-                surface.blit(tail_surface, (particle['x'] - particle['size'] - 2, particle['y'] - particle['size'] - 2))
+                surface.blit(tail_surface, (x - size - 2, y - size - 2))
 
-            surface.blit(particle_surface, (particle['x'] - particle['size'], particle['y'] - particle['size']))
+            # 主粒子 - 使用分离的颜色和透明度处理
+            textures.draw_circle(surface, color, alpha, size * 2, (size, size), size, 0, (x - size, y - size))
 
     def is_fade_complete(self):
         """检查淡出是否完成"""
@@ -0,0 +1,299 @@
+"""
+关卡平衡批量模拟工具 - 用无界面游戏核心并行跑多局，统计胜率、通关时间等指标
+运行方式：
+    python balance_runner.py --levels 1-16 --runs 20 --strategy basic --out result.json
+    python balance_runner.py --levels 1,3,5 --strategy my_script.json --csv result.csv
+
+策略也可以使用参考机器人，如 --strategy bot:threat（见 bot_api.REFERENCE_BOTS）
+
+自定义策略脚本格式（JSON）：
+    {"actions": [{"tick": 0, "plant": "sunflower", "row": 0, "col": 0}, ...]}
+每个动作在到达指定帧后尝试执行，阳光不足或冷却中时会在后续帧继续重试
+"""
+import argparse
+import csv
+import json
+import os
+import statistics
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from core.constants import GRID_WIDTH, GRID_HEIGHT
+
+# 单局最长模拟帧数（60帧=1秒），超过视为超时
+DEFAULT_MAX_TICKS = 60 * 60 * 15
+# 阳光曲线采样间隔（帧）
+SUN_SAMPLE_INTERVAL = 60
+
+
+def _basic_strategy():
+    """基础策略：第一列向日葵，随后逐列补射手，最后在第7列放坚果墙"""
+    actions = []
+    for row in range(GRID_HEIGHT):
+        actions.append({"tick": 0, "plant": "sunflower", "row": row, "col": 0})
+    for col in range(1, 4):
+        for row in range(GRID_HEIGHT):
+            actions.append({"tick": 0, "plant": "shooter", "row": row, "col": col})
+    for row in range(GRID_HEIGHT):
+        actions.append({"tick": 0, "plant": "wall_nut", "row": row, "col": 6})
+    return actions
+
+
+def _economy_strategy():
+    """经济优先策略：两列向日葵后再铺射手和西瓜投手"""
+    actions = []
+    for col in range(2):
+        for row in range(GRID_HEIGHT):
+            actions.append({"tick": 0, "plant": "sunflower", "row": row, "col": col})
+    for row in range(GRID_HEIGHT):
+        actions.append({"tick": 0, "plant": "shooter", "row": row, "col": 2})
+    for row in range(GRID_HEIGHT):
+        actions.append({"tick": 0, "plant": "melon_pult", "row": row, "col": 3})
+    for row in range(GRID_HEIGHT):
+        actions.append({"tick": 0, "plant": "shooter", "row": row, "col": 4})
+    return actions
+
+
+BUILTIN_STRATEGIES = {
+    "basic": _basic_strategy,
+    "economy": _economy_strategy,
+}
+
+
+def load_strategy(strategy):
+    """加载策略：内置策略名称、"bot:机器人名" 或 JSON 脚本路径"""
+    if strategy.startswith("bot:"):
+        from bot_api import REFERENCE_BOTS
+        if strategy[4:] not in REFERENCE_BOTS:
+            raise ValueError(f"未知的机器人: {strategy[4:]}")
+        return strategy
+
+    if strategy in BUILTIN_STRATEGIES:
+        return BUILTIN_STRATEGIES[strategy]()
+
+    with open(strategy, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    actions = data.get("actions", []) if isinstance(data, dict) else data
+    for action in actions:
+        if not (0 <= action["row"] < GRID_HEIGHT and 0 <= action["col"] < GRID_WIDTH):
+            raise ValueError(f"动作位置超出战场范围: {action}")
+    return sorted(actions, key=lambda a: a.get("tick", 0))
+
+
+def parse_levels(text):
+    """解析关卡列表，支持 "1-16"、"1,3,5" 以及混合写法"""
+    levels = []
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-", 1)
+            levels.extend(range(int(start), int(end) + 1))
+        else:
+            levels.append(int(part))
+    return sorted(set(levels))
+
+
+# 每个工作进程持有一个复用的无界面会话
+_session = None
+
+
+def _init_worker():
+    """工作进程初始化：加载一次资源，后续各局复用"""
+    global _session
+    # 模拟过程中大量的调试输出没有意义，直接丢弃
+    sys.stdout = open(os.devnull, 'w', encoding='utf-8')
+
+    from headless import HeadlessSession
+    _session = HeadlessSession()
+
+
+def simulate_run(level_num, seed, actions, max_ticks=DEFAULT_MAX_TICKS):
+    """模拟一局，返回该局的统计数据；actions 为动作脚本或 bot:机器人名"""
+    session = _session
+    session.start_level(level_num, seed=seed)
+
+    bot = controller = None
+    pending = []
+    if isinstance(actions, str):
+        from bot_api import REFERENCE_BOTS, BotController
+        bot = REFERENCE_BOTS[actions[4:]]()
+        controller = BotController(session)
+    else:
+        available_types = {card["type"] for card in session.get_cards()}
+        # 当前关卡没有的植物直接跳过，避免阻塞后续动作
+        pending = [a for a in actions if a["plant"] in available_types]
+
+    peak_zombies = 0
+    sun_curve = []
+    tick_costs = []
+    outcome = None
+
+    while session.tick < max_ticks:
+        # 按顺序执行已到期的动作，遇到失败的动作就停下等待下一帧
+        while pending and pending[0].get("tick", 0) <= session.tick:
+            action = pending[0]
+            game = session.game
+            occupied = any(p.row == action["row"] and p.col == action["col"] for p in game["plants"])
+            if occupied or session.plant(action["plant"], action["row"], action["col"]):
+                pending.pop(0)
+            else:
+                break
+
+        if bot:
+            bot.on_tick(controller)
+            controller.apply_pending_actions()
+
+        tick_costs.append(session.step())
+
+        game = session.game
+        peak_zombies = max(peak_zombies, len(game["zombies"]))
+        if session.tick % SUN_SAMPLE_INTERVAL == 0:
+            sun_curve.append(game["sun"])
+
+        outcome = session.get_outcome()
+        if outcome:
+            break
+
+    tick_costs.sort()
+    return {
+        "level": level_num,
+        "seed": seed,
+        "outcome": outcome or "timeout",
+        "ticks": session.tick,
+        "peak_zombies": peak_zombies,
+        "sun_curve": sun_curve,
+        "tick_cost_mean_ms": statistics.fmean(tick_costs) * 1000 if tick_costs else 0.0,
+        "tick_cost_p95_ms": _p95(tick_costs) * 1000,
+        "tick_cost_max_ms": tick_costs[-1] * 1000 if tick_costs else 0.0,
+        # 每帧耗时（秒，已排序），只用于汇总，汇总后从结果中移除
+        "tick_costs": tick_costs,
+    }
+
+
+def _p95(sorted_costs):
+    """已排序耗时的 95 分位数"""
+    return sorted_costs[int(len(sorted_costs) * 0.95)] if sorted_costs else 0.0
+
+
+def summarize(level_num, runs):
+    """汇总同一关卡的多局结果"""
+    wins = [r for r in runs if r["outcome"] == "won"]
+    clear_seconds = [r["ticks"] / 60 for r in wins]
+
+    # 阳光曲线按采样点取平均（各局长度不同，只平均到最短的一局）
+    curves = [r["sun_curve"] for r in runs if r["sun_curve"]]
+    avg_curve = []
+    if curves:
+        length = min(len(c) for c in curves)
+        avg_curve = [round(statistics.fmean(c[i] for c in curves), 1) for i in range(length)]
+
+    # 耗时分布按所有局的全部帧合并统计，而不是各局统计值再取平均/最大
+    tick_costs = sorted(cost for r in runs for cost in r["tick_costs"])
+
+    return {
+        "level": level_num,
+        "runs": len(runs),
+        "win_rate": len(wins) / len(runs) if runs else 0.0,
+        "losses": sum(1 for r in runs if r["outcome"] == "lost"),
+        "timeouts": sum(1 for r in runs if r["outcome"] == "timeout"),
+        "clear_time_mean_s": round(statistics.fmean(clear_seconds), 2) if clear_seconds else None,
+        "clear_time_min_s": round(min(clear_seconds), 2) if clear_seconds else None,
+        "peak_zombies_max": max(r["peak_zombies"] for r in runs) if runs else 0,
+        "peak_zombies_mean": round(statistics.fmean(r["peak_zombies"] for r in runs), 2) if runs else 0,
+        "sun_curve_mean": avg_curve,
+        "tick_cost_mean_ms": round(statistics.fmean(tick_costs) * 1000, 4) if tick_costs else 0,
+        "tick_cost_p95_ms": round(_p95(tick_costs) * 1000, 4),
+        "tick_cost_max_ms": round(tick_costs[-1] * 1000, 4) if tick_costs else 0,
+    }
+
+
+def run_batch(levels, runs_per_level, actions, workers=None, base_seed=0, max_ticks=DEFAULT_MAX_TICKS):
+    """并行模拟所有关卡，返回 {关卡: 汇总结果}"""
+    results = {level: [] for level in levels}
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        futures = {}
+        for level in levels:
+            for i in range(runs_per_level):
+                seed = base_seed + level * 10000 + i
+                future = executor.submit(simulate_run, level, seed, actions, max_ticks)
+                futures[future] = level
+
+        for future in as_completed(futures):
+            level = futures[future]
+            try:
+                results[level].append(future.result())
+            except Exception as e:
+                print(f"第{level}关模拟失败: {e}")
+
+    summary = {}
+    for level in levels:
+        runs = sorted(results[level], key=lambda r: r["seed"])
+        summary[level] = {"summary": summarize(level, runs), "runs": runs}
+        for run in runs:
+            del run["tick_costs"]
+    return summary
+
+
+def write_csv(path, summary):
+    """把每关汇总写成 CSV（阳光曲线以分号分隔）"""
+    fields = ["level", "runs", "win_rate", "losses", "timeouts", "clear_time_mean_s", "clear_time_min_s",
+              "peak_zombies_max", "peak_zombies_mean", "tick_cost_mean_ms", "tick_cost_p95_ms",
+              "tick_cost_max_ms", "sun_curve_mean"]
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        for level in sorted(summary):
+            row = dict(summary[level]["summary"])
+            row["sun_curve_mean"] = ";".join(str(v) for v in row["sun_curve_mean"])
+            writer.writerow(row)
+
+
+def main():
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="关卡平衡批量模拟")
+    parser.add_argument("--levels", default="1-16", help="关卡列表，如 1-16 或 1,3,5")
+    parser.add_argument("--runs", type=int, default=10, help="每关模拟局数")
+    parser.add_argument("--strategy", default="basic",
+                        help=f"内置策略({', '.join(BUILTIN_STRATEGIES)})或 JSON 脚本路径")
+    parser.add_argument("--workers", type=int, default=None, help="并行进程数，默认等于 CPU 核数")
+    parser.add_argument("--seed", type=int, default=0, help="基础随机种子")
+    parser.add_argument("--max-ticks", type=int, default=DEFAULT_MAX_TICKS, help="单局最长帧数")
+    parser.add_argument("--out", default=None, help="JSON 输出路径（默认打印到标准输出）")
+    parser.add_argument("--csv", default=None, help="CSV 汇总输出路径")
+    parser.add_argument("--summary-only", action="store_true", help="JSON 中只保留汇总，不含每局明细")
+    args = parser.parse_args()
+
+    levels = parse_levels(args.levels)
+    actions = load_strategy(args.strategy)
+
+    summary = run_batch(levels, args.runs, actions, args.workers, args.seed, args.max_ticks)
+
+    output = {
+        "strategy": args.strategy,
+        "runs_per_level": args.runs,
+        "base_seed": args.seed,
+        "levels": {
+            str(level): (data["summary"] if args.summary_only else data)
+            for level, data in summary.items()
+        }
+    }
+
+    text = json.dumps(output, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"结果已写入 {args.out}")
+    else:
+        print(text)
+
+    if args.csv:
+        write_csv(args.csv, summary)
+        print(f"CSV 汇总已写入 {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""
+机器人接口 - 以程序方式驱动游戏，用于自动通关、压力测试和自动平衡
+observe() 返回紧凑的棋盘张量，动作在逻辑帧边界统一执行
+"""
+from array import array
+
+from core.cards_manager import PlantType
+from core.constants import GRID_WIDTH, GRID_HEIGHT
+
+# 植物类型编号（0 表示空格）
+PLANT_TYPE_IDS = {plant.value: index + 1 for index, plant in enumerate(PlantType)}
+PLANT_TYPE_NAMES = {index: name for name, index in PLANT_TYPE_IDS.items()}
+
+# 棋盘张量的通道
+CH_PLANT_TYPE = 0  # 植物类型编号
+CH_PLANT_HEALTH = 1  # 植物血量
+CH_ZOMBIE_COUNT = 2  # 该格存活僵尸数量
+CH_ZOMBIE_HEALTH = 3  # 该格僵尸总血量
+NUM_CHANNELS = 4
+
+# 射击类植物，机器人按优先级选用
+SHOOTER_PRIORITY = ["melon_pult", "lightning_flower", "cattail", "ice_cactus", "dandelion", "shooter"]
+
+
+class Observation:
+    """一帧的观测结果，board 为 (通道, 行, 列) 展平的整数数组"""
+
+    def __init__(self, tick, sun, board, cards, hammer_cooldown, carts, wave_mode, current_wave, max_waves,
+                 has_hammer=False):
+        self.tick = tick
+        self.sun = sun
+        self.board = board
+        self.shape = (NUM_CHANNELS, GRID_HEIGHT, GRID_WIDTH)
+        self.cards = cards  # [(植物类型, 花费, 剩余冷却帧数, 当前是否可用)]
+        self.hammer_cooldown = hammer_cooldown
+        self.has_hammer = has_hammer  # 是否已购买锤子
+        self.carts = carts  # 每行小推车是否可用
+        self.wave_mode = wave_mode
+        self.current_wave = current_wave
+        self.max_waves = max_waves
+
+    def get(self, channel, row, col):
+        """读取张量中的单个值"""
+        return self.board[(channel * GRID_HEIGHT + row) * GRID_WIDTH + col]
+
+    def plant_at(self, row, col):
+        """返回格子上的植物类型名称，没有则为 None"""
+        return PLANT_TYPE_NAMES.get(self.get(CH_PLANT_TYPE, row, col))
+
+    def zombies_in_row(self, row):
+        """该行存活僵尸数量"""
+        return sum(self.get(CH_ZOMBIE_COUNT, row, col) for col in range(GRID_WIDTH))
+
+    def leftmost_zombie_col(self, row):
+        """该行最靠左的僵尸所在列，没有僵尸时返回 None"""
+        for col in range(GRID_WIDTH):
+            if self.get(CH_ZOMBIE_COUNT, row, col):
+                return col
+        return None
+
+    def count_plants(self, plant_type, row=None):
+        """统计某类植物数量，可限定行"""
+        type_id = PLANT_TYPE_IDS.get(plant_type)
+        rows = range(GRID_HEIGHT) if row is None else (row,)
+        return sum(1 for r in rows for c in range(GRID_WIDTH) if self.get(CH_PLANT_TYPE, r, c) == type_id)
+
+    def is_card_ready(self, plant_type):
+        """卡片是否可以立即使用（阳光足够且不在冷却）"""
+        for card_type, _, _, available in self.cards:
+            if card_type == plant_type:
+                return available
+        return False
+
+    def has_card(self, plant_type):
+        """本局卡槽中是否有该植物"""
+        return any(card[0] == plant_type for card in self.cards)
+
+
+class BotController:
+    """机器人控制器：提供观测和动作接口，动作在下一个逻辑帧开始前执行"""
+
+    def __init__(self, session):
+        self.session = session
+        self.pending_actions = []
+        self.last_results = []
+
+    def observe(self):
+        """生成当前局面的观测"""
+        session = self.session
+        game = session.game
+        board = array('i', bytes(4 * NUM_CHANNELS * GRID_HEIGHT * GRID_WIDTH))
+        plane = GRID_HEIGHT * GRID_WIDTH
+
+        for plant in game["plants"]:
+            index = plant.row * GRID_WIDTH + int(plant.col)
+            board[CH_PLANT_TYPE * plane + index] = PLANT_TYPE_IDS.get(plant.plant_type, 0)
+            board[CH_PLANT_HEALTH * plane + index] = int(plant.health)
+
+        for zombie in game["zombies"]:
+            if zombie.is_dying:
+                continue
+            row = int(zombie.row)
+            col = min(max(int(zombie.col), 0), GRID_WIDTH - 1)
+            if 0 <= row < GRID_HEIGHT:
+                index = row * GRID_WIDTH + col
+                board[CH_ZOMBIE_COUNT * plane + index] += 1
+                board[CH_ZOMBIE_HEALTH * plane + index] += int(max(0, zombie.health))
+
+        cooldowns = game.get("card_cooldowns", {})
+        can_select = session.gm.event_handler._can_select_card
+        cards = [(card["type"], card["cost"], cooldowns.get(card["type"], 0), can_select(card))
+                 for card in session.get_cards()]
+
+        carts = [session.gm.cart_manager.has_cart_in_row(row) for row in range(GRID_HEIGHT)]
+        level_manager = game["level_manager"]
+
+        return Observation(session.tick, game["sun"], board, cards,
+                           game.get("hammer_cooldown", 0), carts,
+                           game["wave_mode"], level_manager.current_wave, level_manager.max_waves,
+                           session.gm.shop_manager.has_hammer())
+
+    # 动作接口：只入队，在 apply_pending_actions 时按顺序执行
+    def plant(self, plant_type, row, col):
+        """种植植物"""
+        self.pending_actions.append(("plant", plant_type, row, col))
+
+    def shovel(self, row, col):
+        """铲除植物"""
+        self.pending_actions.append(("shovel", row, col))
+
+    def hammer(self, row, col):
+        """锤子敲击格子；当前局面下敲不到僵尸（没有锤子、冷却中或格子是空的）时不入队并返回 False"""
+        if not self.session.can_hammer(row, col):
+            return False
+        self.pending_actions.append(("hammer", row, col))
+        return True
+
+    def trigger_cart(self, row):
+        """触发小推车"""
+        self.pending_actions.append(("trigger_cart", row))
+
+    def apply_pending_actions(self):
+        """在帧边界执行所有排队的动作，结果保存在 last_results"""
+        session = self.session
+        results = []
+        for action in self.pending_actions:
+            name, args = action[0], action[1:]
+            try:
+                results.append((action, bool(getattr(session, name)(*args))))
+            except Exception as e:
+                print(f"机器人动作执行失败 {action}: {e}")
+                results.append((action, False))
+        self.pending_actions.clear()
+        self.last_results = results
+        return results
+
+    def step(self):
+        """执行排队动作后推进一个逻辑帧，返回本帧耗时"""
+        self.apply_pending_actions()
+        return self.session.step()
+
+
+class BaseBot:
+    """机器人基类，子类实现 decide()"""
+
+    # 每隔多少帧做一次决策
+    decision_interval = 10
+
+    def decide(self, observation, controller):
+        """根据观测向控制器下达动作"""
+        raise NotImplementedError
+
+    def on_tick(self, controller):
+        """每帧调用，到达决策间隔时观测并决策"""
+        if controller.session.tick % self.decision_interval == 0:
+            self.decide(controller.observe(), controller)
+
+
+class GreedyShooterBot(BaseBot):
+    """贪心射手：先种固定数量向日葵，之后把阳光全部投入僵尸最多的行"""
+
+    def __init__(self, sunflower_target=5):
+        self.sunflower_target = sunflower_target
+
+    def decide(self, obs, controller):
+        if obs.count_plants("sunflower") < self.sunflower_target and obs.is_card_ready("sunflower"):
+            cell = _first_empty_cell(obs, cols=range(0, 2))
+            if cell:
+                controller.plant("sunflower", *cell)
+                return
+
+        shooter = _best_ready_card(obs, SHOOTER_PRIORITY)
+        if not shooter:
+            return
+
+        # 按行内僵尸数量从多到少选择
+        rows = sorted(range(GRID_HEIGHT), key=lambda r: (-obs.zombies_in_row(r), r))
+        for row in rows:
+            cell = _first_empty_cell(obs, rows=(row,), cols=range(1, 6))
+            if cell:
+                controller.plant(shooter, *cell)
+                return
+
+
+class ThreatResponseBot(BaseBot):
+    """威胁响应：维持向日葵经济，优先补防受威胁的行，紧急时使用锤子和小推车"""
+
+    decision_interval = 5
+
+    def __init__(self, sunflowers_per_row=1, shooters_per_row=3, danger_col=2):
+        self.sunflowers_per_row = sunflowers_per_row
+        self.shooters_per_row = shooters_per_row
+        self.danger_col = danger_col
+
+    def decide(self, obs, controller):
+        # 紧急处理：僵尸逼近房子
+        for row in range(GRID_HEIGHT):
+            col = obs.leftmost_zombie_col(row)
+            if col is None or col > self.danger_col:
+                continue
+            if col == 0 and obs.carts[row]:
+                controller.trigger_cart(row)
+                return
+            # 观测按格子统计僵尸，跨在两格之间的僵尸可能要敲右边一格；敲不到时继续往下补防
+            if obs.has_hammer and obs.hammer_cooldown <= 0:
+                if controller.hammer(row, col) or controller.hammer(row, col + 1):
+                    return
+
+        # 受威胁且防御最弱的行优先
+        def defense(row):
+            return sum(1 for col in range(GRID_WIDTH)
+                       if obs.plant_at(row, col) in SHOOTER_PRIORITY)
+
+        threatened = [r for r in range(GRID_HEIGHT) if obs.zombies_in_row(r)]
+        threatened.sort(key=lambda r: (defense(r) - obs.zombies_in_row(r), r))
+
+        shooter = _best_ready_card(obs, SHOOTER_PRIORITY)
+        for row in threatened:
+            if shooter and defense(row) < self.shooters_per_row + obs.zombies_in_row(row) // 3:
+                cell = _first_empty_cell(obs, rows=(row,), cols=range(1, 6))
+                if cell:
+                    controller.plant(shooter, *cell)
+                    return
+            if obs.is_card_ready("wall_nut") and not any(obs.plant_at(row, c) == "wall_nut" for c in range(6, 8)):
+                cell = _first_empty_cell(obs, rows=(row,), cols=range(6, 8))
+                if cell:
+                    controller.plant("wall_nut", *cell)
+                    return
+
+        # 没有威胁时发展经济，再均匀补射手
+        if obs.is_card_ready("sunflower"):
+            for row in range(GRID_HEIGHT):
+                if obs.count_plants("sunflower", row) < self.sunflowers_per_row:
+                    cell = _first_empty_cell(obs, rows=(row,), cols=range(0, 2))
+                    if cell:
+                        controller.plant("sunflower", *cell)
+                        return
+
+        if shooter:
+            for row in sorted(range(GRID_HEIGHT), key=defense):
+                if defense(row) < self.shooters_per_row:
+                    cell = _first_empty_cell(obs, rows=(row,), cols=range(1, 6))
+                    if cell:
+                        controller.plant(shooter, *cell)
+                        return
+
+
+def _first_empty_cell(obs, rows=range(GRID_HEIGHT), cols=range(GRID_WIDTH)):
+    """按列优先顺序找第一个空格子"""
+    for col in cols:
+        for row in rows:
+            if not obs.get(CH_PLANT_TYPE, row, col):
+                return row, col
+    return None
+
+
+def _best_ready_card(obs, priority):
+    """按优先级返回第一张可用的卡片"""
+    for plant_type in priority:
+        if obs.is_card_ready(plant_type):
+            return plant_type
+    return None
+
+
+REFERENCE_BOTS = {
+    "greedy": GreedyShooterBot,
+    "threat": ThreatResponseBot,
+}
+
+
+def run_bot(session, bot, level_num, seed=None, max_ticks=60 * 60 * 15):
+    """用机器人完整打一局，返回 (结果, 帧数)"""
+    session.start_level(level_num, seed=seed)
+    controller = BotController(session)
+
+    while session.tick < max_ticks:
+        bot.on_tick(controller)
+        controller.step()
+        outcome = session.get_outcome()
+        if outcome:
+            return outcome, session.tick
+
+    return "timeout", session.tick
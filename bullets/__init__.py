@@ -3,7 +3,22 @@ from .pea_bullet import PeaBullet
 from .melon_bullet import MelonBullet
 from .spike_bullet import SpikeBullet
 from .ice_bullet import IceBullet
-from .dandelion_seed import DandelionSeed
+from .dandelion_seed import DandelionSeed, update_seed_batch, create_seed, release_seed
+from performance import ObjectPool
+
+BULLET_CLASSES = {
+    "pea": PeaBullet,
+    "melon": MelonBullet,
+    "spike": SpikeBullet,
+    "ice": IceBullet
+}
+
+# 每种子弹一个对象池，离场的子弹回收后用 reset 重新初始化复用
+BULLET_POOL_SIZE = 128
+_bullet_pools = {
+    bullet_class: ObjectPool(bullet_class, bullet_class.reset, BULLET_POOL_SIZE, bullet_class.__name__)
+    for bullet_class in BULLET_CLASSES.values()
+}
 
 
 # 工厂函数，用于创建不同类型的子弹，支持传送门穿越
@@ -18,17 +33,10 @@ def create_bullet(bullet_type, row, col, **kwargs):
         **kwargs: 其他参数，包括传送门相关参数
 
     Returns:
-        对应类型的子弹对象
+        对应类型的子弹对象（优先复用对象池中回收的子弹）
     """
-    bullet_classes = {
-        "pea": PeaBullet,
-        "melon": MelonBullet,
-        "spike": SpikeBullet,
-        "ice": IceBullet
-    }
-
-    bullet_class = bullet_classes.get(bullet_type, PeaBullet)
-    bullet = bullet_class(row, col, **kwargs)
+    bullet_class = BULLET_CLASSES.get(bullet_type, PeaBullet)
+    bullet = _bullet_pools[bullet_class].get_object(row, col, **kwargs)
 
     # 传送门支持设置（在子弹创建后设置，避免修改每个子弹类的构造函数）
     _setup_portal_support(bullet, bullet_type, **kwargs)
@@ -36,6 +44,13 @@ def create_bullet(bullet_type, row, col, **kwargs):
     return bullet
 
 
+def release_bullet(bullet):
+    """回收已经移出场地的子弹（调用方不能再使用它）"""
+    pool = _bullet_pools.get(type(bullet))
+    if pool is not None:
+        pool.return_object(bullet)
+
+
 def _setup_portal_support(bullet, bullet_type, **kwargs):
     """
     为子弹设置传送门支持
@@ -136,5 +151,9 @@ __all__ = [
     'SpikeBullet',
     'IceBullet',
     'DandelionSeed',
-    'create_bullet'
+    'update_seed_batch',
+    'create_bullet',
+    'release_bullet',
+    'create_seed',
+    'release_seed'
 ]
\ No newline at end of file
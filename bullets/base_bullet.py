@@ -10,6 +10,15 @@ import random
 class BaseBullet:
     """所有子弹的基础类 - 支持传送门穿越"""
 
+    # 所有字段在这里声明，实例不再带 __dict__；子类只声明自己新增的字段
+    __slots__ = (
+        'row', 'col', 'bullet_type', 'speed', 'dmg', 'splash_dmg',
+        'can_penetrate', 'hit_zombies', 'splash_hit_zombies',
+        'supports_portal_travel', 'source_plant_row', 'source_plant_col',
+        'has_traveled_through_portal', 'portal_manager', 'original_row',
+        'constants', 'images', 'prev_col', 'prev_row',
+    )
+
     def __init__(self, row, col, bullet_type="base", constants=None, images=None, **kwargs):
         self.row = row
         self.col = col
@@ -37,7 +46,20 @@ class BaseBullet:
         self.constants = constants
         self.images = images
 
-    def update(self, zombies_list=None):
+        # 上一逻辑帧的位置，供渲染插值使用
+        self.prev_col = None
+        self.prev_row = None
+
+    def reset(self, row, col, **kwargs):
+        """回收复用：按新的参数重新初始化全部字段，结果与新建的子弹完全相同"""
+        type(self).__init__(self, row, col, **kwargs)
+
+    def forget_zombie(self, zombie_id):
+        """僵尸离场时清除以 id(僵尸) 记录的命中状态，复用同一对象的僵尸不会被当成已击中"""
+        self.hit_zombies.discard(zombie_id)
+        self.splash_hit_zombies.discard(zombie_id)
+
+    def update(self, zombies_list=None, area_index=None):
         """更新子弹位置，返回是否应该移除"""
         # 检查传送门穿越（仅对支持传送门的子弹）
         if self.supports_portal_travel and not self.has_traveled_through_portal:
@@ -49,7 +71,7 @@ class BaseBullet:
         self.col += self.speed
 
         # 检查边界
-        grid_width = self.constants['GRID_WIDTH'] if self.constants else 9
+        grid_width = self.constants.GRID_WIDTH if self.constants else 9
         return self.col > grid_width
 
     def _check_portal_travel(self):
@@ -140,8 +162,7 @@ class BaseBullet:
             return 0
 
         # 检查僵尸是否触发免疫
-        if (hasattr(zombie, 'immunity_chance') and
-                random.random() < zombie.immunity_chance):
+        if random.random() < zombie.immunity_chance:
             self.hit_zombies.add(zombie_id)
             return 2  # 免疫
 
@@ -162,7 +183,7 @@ class BaseBullet:
         else:
             zombie.health -= self.dmg
 
-    def apply_splash_damage(self, zombies):
+    def apply_splash_damage(self, zombies, area_index=None):
         """对范围内的僵尸应用溅射伤害（基类默认不支持）"""
         return 0
 
@@ -178,14 +199,12 @@ class BaseBullet:
         # 获取显示位置
         display_col, display_row, vertical_offset = self.get_display_position()
 
-        x = self.constants['BATTLEFIELD_LEFT'] + int(
-            display_col * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP']))
-        y = (self.constants['BATTLEFIELD_TOP'] +
-             display_row * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP']) +
-             self.constants['GRID_SIZE'] // 2)
+        x = self.constants.BATTLEFIELD_LEFT + int(display_col * self.constants.CELL_STEP)
+        y = (self.constants.cell_y(display_row) +
+             self.constants.GRID_SIZE // 2)
 
         # 应用垂直偏移（抛物线效果）
-        y -= int(vertical_offset * self.constants['GRID_SIZE'])
+        y -= int(vertical_offset * self.constants.GRID_SIZE)
 
         # 如果子弹穿越了传送门，添加特殊视觉效果
         if self.has_traveled_through_portal:
@@ -207,7 +226,7 @@ class BaseBullet:
     def _draw_bullet(self, surface, x, y):
         """绘制具体的子弹外观（子类重写）"""
         # 默认绘制一个白色圆圈
-        white = self.constants.get('WHITE', (255, 255, 255)) if self.constants else (255, 255, 255)
+        white = self.constants.WHITE if self.constants else (255, 255, 255)
         color = (100, 150, 255) if self.can_penetrate else white
 
         # 如果穿越了传送门，使用特殊颜色
@@ -5,10 +5,66 @@ import pygame
 import math
 import random
 
+from performance import ObjectPool
+from rsc_mng.rotation_cache import rotation_cache
+
+# 命中判定半径（格）
+SEED_HIT_RADIUS = 0.4
+# 微风扰动只与存活帧数有关，所有种子共用预先算好的 sin/cos（覆盖默认生命周期）
+MICRO_WIND_STEPS = 256
+_MICRO_WIND = {t: (math.sin(t * 0.1), math.cos(t * 0.08)) for t in range(MICRO_WIND_STEPS)}
+
+
+def _micro_wind(life_time):
+    """存活帧数对应的微风 (sin, cos)，超出预计算范围时直接计算"""
+    wind = _MICRO_WIND.get(life_time)
+    if wind is None:
+        wind = (math.sin(life_time * 0.1), math.cos(life_time * 0.08))
+    return wind
+
+
+def update_seed_batch(seeds, zombies_list, area_index, on_hit=None):
+    """一次推进所有种子一帧并结算命中，返回仍然保留的种子列表
+    每颗种子先移动再只和所在格子附近的僵尸做命中判定，顺序与逐个更新完全一致；
+    命中时立即调用 on_hit(seed, zombie)，命中的种子直接移除；移除的种子交还对象池"""
+    survivors = []
+    for seed in seeds:
+        if seed.update(zombies_list, area_index):
+            _seed_pool.return_object(seed)
+            continue
+
+        for zombie in seed.collision_candidates(area_index):
+            if seed.attack_zombie(zombie):
+                if on_hit is not None:
+                    on_hit(seed, zombie)
+                _seed_pool.return_object(seed)
+                break
+        else:
+            survivors.append(seed)
+    return survivors
+
+
+def create_seed(start_x, start_y, target_zombie, constants=None, images=None):
+    """创建蒲公英种子（优先复用对象池中回收的种子）"""
+    return _seed_pool.get_object(start_x, start_y, target_zombie, constants, images)
+
+
+def release_seed(seed):
+    """回收已经移出场地的种子（调用方不能再使用它）"""
+    _seed_pool.return_object(seed)
+
 
 class DandelionSeed:
     """蒲公英种子 - 飘散攻击，自然风吹效果，击中后渐隐消失"""
 
+    __slots__ = (
+        'start_x', 'start_y', 'current_x', 'current_y', 'target_zombie', 'target_x', 'target_y',
+        'damage', 'speed', 'life_time', 'max_life_time',
+        'wind_amplitude', 'wind_frequency', 'drift_speed_x', 'drift_speed_y', 'rotation', 'rotation_speed',
+        'has_hit', 'progress', 'is_fading', 'fade_out_timer', 'fade_out_duration', 'hit_slow_factor',
+        'constants', 'images',
+    )
+
     def __init__(self, start_x, start_y, target_zombie, constants=None, images=None):
         self.start_x = start_x
         self.start_y = start_y
@@ -49,7 +105,11 @@ class DandelionSeed:
         self.constants = constants
         self.images = images
 
-    def update(self, zombies_list=None):
+    def reset(self, start_x, start_y, target_zombie, constants=None, images=None):
+        """回收复用：按新的参数重新初始化全部字段，结果与新建的种子完全相同（随机数消耗也相同）"""
+        self.__init__(start_x, start_y, target_zombie, constants, images)
+
+    def update(self, zombies_list=None, area_index=None):
         """更新种子位置和状态，支持击中后渐隐效果 - 修复：目标死亡后不再瞬移"""
         # 如果正在渐隐，只更新渐隐逻辑
         if self.is_fading:
@@ -74,10 +134,12 @@ class DandelionSeed:
         if self.life_time >= self.max_life_time:
             return True  # 生命周期结束
 
-        # 修复关键部分：检查目标僵尸是否还活着
-        target_is_valid = (self.target_zombie and
-                           self.target_zombie.health > 0 and
-                           zombies_list and self.target_zombie in zombies_list)
+        # 修复关键部分：检查目标僵尸是否还活着（有索引时 O(1) 判断是否还在场上）
+        target = self.target_zombie
+        if area_index is not None:
+            target_is_valid = bool(target and target.health > 0 and zombies_list and area_index.contains(target))
+        else:
+            target_is_valid = (target and target.health > 0 and zombies_list and target in zombies_list)
 
         # 如果目标无效，不再重新寻找目标，而是继续按当前方向飞行
         if not target_is_valid:
@@ -128,8 +190,9 @@ class DandelionSeed:
                 self.life_time * self.wind_frequency * 0.7) * self.wind_amplitude * fade_factor * 0.3
 
             # 减弱的随机微风扰动
-            micro_wind_x = math.sin(self.life_time * 0.1) * 0.05 * fade_factor
-            micro_wind_y = math.cos(self.life_time * 0.08) * 0.04 * fade_factor
+            micro_sin, micro_cos = _micro_wind(self.life_time)
+            micro_wind_x = micro_sin * 0.05 * fade_factor
+            micro_wind_y = micro_cos * 0.04 * fade_factor
 
             # 最终位置
             self.current_x = base_x + wind_offset_x + micro_wind_x
@@ -159,8 +222,9 @@ class DandelionSeed:
             wind_offset_y = math.cos(self.life_time * self.wind_frequency * 0.7) * self.wind_amplitude * 0.5
 
             # 添加随机微风扰动
-            micro_wind_x = math.sin(self.life_time * 0.1) * 0.1
-            micro_wind_y = math.cos(self.life_time * 0.08) * 0.08
+            micro_sin, micro_cos = _micro_wind(self.life_time)
+            micro_wind_x = micro_sin * 0.1
+            micro_wind_y = micro_cos * 0.08
 
             # 最终位置
             self.current_x = base_x + wind_offset_x + micro_wind_x
@@ -181,7 +245,12 @@ class DandelionSeed:
         # 检查距离
         distance = math.sqrt((zombie.col - self.current_x) ** 2 +
                              (zombie.row - self.current_y) ** 2)
-        return distance < 0.4
+        return distance < SEED_HIT_RADIUS
+
+    def collision_candidates(self, area_index):
+        """种子所在格子附近可能被命中的僵尸（保持列表顺序），代替遍历全部僵尸"""
+        return area_index.candidates(self.current_y - SEED_HIT_RADIUS, self.current_y + SEED_HIT_RADIUS,
+                                     self.current_x - SEED_HIT_RADIUS, self.current_x + SEED_HIT_RADIUS)
 
     def attack_zombie(self, zombie):
         """攻击僵尸 - 修改：只有当僵尸血量确实降低时才开始渐隐动画"""
@@ -242,11 +311,9 @@ class DandelionSeed:
             return
 
         # 计算屏幕坐标
-        x = (self.constants['BATTLEFIELD_LEFT'] +
-             self.current_x * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP']))
-        y = (self.constants['BATTLEFIELD_TOP'] +
-             self.current_y * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP']) +
-             self.constants['GRID_SIZE'] // 2)
+        x = self.constants.cell_x(self.current_x)
+        y = (self.constants.cell_y(self.current_y) +
+             self.constants.GRID_SIZE // 2)
 
         # 计算当前透明度
         alpha = self.get_current_alpha()
@@ -259,14 +326,8 @@ class DandelionSeed:
             # 使用种子图片
             seed_img = self.images['dandelion_seed_img']
 
-            # 旋转图片
-            if abs(self.rotation) > 0.1:
-                rotated_img = pygame.transform.rotate(seed_img, self.rotation)
-            else:
-                rotated_img = seed_img
-
-            # 应用透明度
-            rotated_img = rotated_img.copy()
+            # 取预先旋转好的帧（固定角度步长），帧是共享的，绘制前设置本颗种子的透明度
+            rotated_img = rotation_cache.get(seed_img, self.rotation)
             rotated_img.set_alpha(alpha)
 
             # 绘制种子
@@ -290,4 +351,9 @@ class DandelionSeed:
                 if trail_alpha > 10:
                     trail_surface = pygame.Surface((6, 6), pygame.SRCALPHA)
                     pygame.draw.circle(trail_surface, (255, 255, 200, trail_alpha), (3, 3), 2)
-                    surface.blit(trail_surface, (int(trail_x - 3), int(trail_y - 3)))
\ No newline at end of file
+                    surface.blit(trail_surface, (int(trail_x - 3), int(trail_y - 3)))
+
+
+# 种子对象池，过期和命中的种子回收后用 reset 重新初始化复用
+SEED_POOL_SIZE = 128
+_seed_pool = ObjectPool(DandelionSeed, DandelionSeed.reset, SEED_POOL_SIZE, "DandelionSeed")
@@ -6,11 +6,14 @@ import random
 import pygame
 import math
 from .base_bullet import BaseBullet
+from core import sim_clock
 
 
 class IceBullet(BaseBullet):
     """冰子弹类 - 造成伤害并冰冻敌人的特殊子弹"""
 
+    __slots__ = ('freeze_duration', 'freeze_applied_zombies')
+
     def __init__(self, row, col, constants=None, images=None, **kwargs):
         super().__init__(row, col, bullet_type="ice", constants=constants, images=images, **kwargs)
 
@@ -20,6 +23,11 @@ class IceBullet(BaseBullet):
         self.freeze_duration = 5000  # 冰冻持续时间（毫秒）
         self.freeze_applied_zombies = set()  # 已冻结过的僵尸集合update_freeze_effects
 
+    def forget_zombie(self, zombie_id):
+        """僵尸离场时同时清除冰冻记录"""
+        super().forget_zombie(zombie_id)
+        self.freeze_applied_zombies.discard(zombie_id)
+
     def can_hit_zombie(self, zombie):
         """寒冰子弹碰撞检测"""
         if zombie.is_dying:
@@ -39,8 +47,7 @@ class IceBullet(BaseBullet):
             return 0
 
         # 检查免疫
-        if (hasattr(zombie, 'immunity_chance') and
-                random.random() < zombie.immunity_chance):
+        if random.random() < zombie.immunity_chance:
             self.freeze_applied_zombies.add(zombie_id)
             return 2
 
@@ -61,10 +68,10 @@ class IceBullet(BaseBullet):
 
         # 应用冰冻效果（如果僵尸还活着）
         if zombie.health > 0:
-            current_time = pygame.time.get_ticks()
+            current_time = sim_clock.get_ticks()
 
             # 如果僵尸已经被冰冻，重置冰冻计时器
-            if getattr(zombie, 'is_frozen', False):
+            if zombie.is_frozen:
                 zombie.freeze_start_time = current_time
             else:
                 # 首次冰冻
@@ -72,7 +79,7 @@ class IceBullet(BaseBullet):
                 zombie.freeze_start_time = current_time
 
                 # 保存原始速度并减慢移动
-                if not hasattr(zombie, 'original_speed'):
+                if zombie.original_speed is None:
                     zombie.original_speed = zombie.speed
                 zombie.speed = zombie.original_speed * 0.5  # 速度减半
 
@@ -5,11 +5,19 @@ import pygame
 import math
 import random
 from .base_bullet import BaseBullet
+from core.area_query import ZombieAreaIndex
 
 
 class MelonBullet(BaseBullet):
     """西瓜子弹类 - 抛物线飞行，着陆爆炸造成溅射伤害"""
 
+    __slots__ = (
+        'start_col', 'target_col', 'flight_progress', 'max_height', 'flight_speed',
+        'has_landed', 'splash_applied', 'has_hit_target', 'splash_targets',
+        'show_splash_effect', 'splash_effect_timer', 'splash_effect_duration',
+        'explosion_particles', 'show_explosion', 'explosion_triggered',
+    )
+
     def __init__(self, row, col, target_col=None, constants=None, images=None, **kwargs):
         super().__init__(row, col, bullet_type="melon", constants=constants, images=images, **kwargs)
 
@@ -19,13 +27,14 @@ class MelonBullet(BaseBullet):
 
         # 西瓜抛物线参数
         self.start_col = col
-        self.target_col = target_col if target_col is not None else (constants['GRID_WIDTH'] if constants else 9)
+        self.target_col = target_col if target_col is not None else (constants.GRID_WIDTH if constants else 9)
         self.flight_progress = 0.0  # 飞行进度 0-1
         self.max_height = 2.0  # 最大飞行高度（网格单位）
         self.flight_speed = 0.03  # 西瓜飞行速度
         self.has_landed = False  # 是否已经落地
         self.splash_applied = False  # 是否已经应用溅射伤害
         self.has_hit_target = False  # 是否已经击中过目标（防止多次击中）
+        self.splash_targets = []  # 本次溅射命中的僵尸
 
         # 添加溅射效果显示相关属性
         self.show_splash_effect = False
@@ -37,7 +46,7 @@ class MelonBullet(BaseBullet):
         self.show_explosion = False
         self.explosion_triggered = False
 
-    def update(self, zombies_list=None):
+    def update(self, zombies_list=None, area_index=None):
         """更新西瓜子弹的抛物线飞行"""
         # 增加飞行进度
         self.flight_progress += self.flight_speed
@@ -53,7 +62,7 @@ class MelonBullet(BaseBullet):
         self.col = self.start_col + (self.target_col - self.start_col) * self.flight_progress
 
         # 检查是否超出屏幕右边缘
-        grid_width = self.constants['GRID_WIDTH'] if self.constants else 9
+        grid_width = self.constants.GRID_WIDTH if self.constants else 9
         return self.col > grid_width
 
     def can_hit_zombie(self, zombie):
@@ -79,16 +88,22 @@ class MelonBullet(BaseBullet):
         normalized_distance = (horizontal_distance / 1.0) ** 2 + (vertical_distance / 1.5) ** 2
         return normalized_distance <= 1.0
 
-    def apply_splash_damage(self, zombies):
+    def apply_splash_damage(self, zombies, area_index=None):
         """对范围内的僵尸应用溅射伤害，返回受到溅射伤害的僵尸数量"""
         if not self.has_landed or self.splash_applied:
             return 0
 
+        # 只检查溅射椭圆（水平±1.0格，垂直±1.5格）内的僵尸
+        if area_index is None:
+            area_index = ZombieAreaIndex(zombies)
+        self.splash_targets = []
+
         splash_count = 0
-        for zombie in zombies:
+        for zombie in area_index.query_radius(self.row, self.col, 1.0, 1.5):
             if self.can_splash_hit_zombie(zombie) and id(zombie) not in self.splash_hit_zombies:
                 # 记录已溅射击中的僵尸
                 self.splash_hit_zombies.add(id(zombie))
+                self.splash_targets.append(zombie)
 
                 # 溅射伤害直接作用于僵尸本体，无视护甲
                 zombie.health -= self.splash_dmg
@@ -112,8 +127,7 @@ class MelonBullet(BaseBullet):
             return 0
 
         # 检查免疫
-        if (hasattr(zombie, 'immunity_chance') and
-                random.random() < zombie.immunity_chance):
+        if random.random() < zombie.immunity_chance:
             self.hit_zombies.add(zombie_id)
             return 2
 
@@ -148,12 +162,10 @@ class MelonBullet(BaseBullet):
 
         # 获取爆炸位置
         display_col, display_row, vertical_offset = self.get_display_position()
-        explosion_x = self.constants['BATTLEFIELD_LEFT'] + int(
-            display_col * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP']))
-        explosion_y = (self.constants['BATTLEFIELD_TOP'] +
-                       display_row * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP']) +
-                       self.constants['GRID_SIZE'] // 2)
-        explosion_y -= int(vertical_offset * self.constants['GRID_SIZE'])
+        explosion_x = self.constants.BATTLEFIELD_LEFT + int(display_col * self.constants.CELL_STEP)
+        explosion_y = (self.constants.cell_y(display_row) +
+                       self.constants.GRID_SIZE // 2)
+        explosion_y -= int(vertical_offset * self.constants.GRID_SIZE)
 
         # 创建粒子
         for _ in range(max_particles):
@@ -266,7 +278,7 @@ class MelonBullet(BaseBullet):
             surface.blit(particle_surface, (int(particle['x'] - particle['size']),
                                             int(particle['y'] - particle['size'])))
 
-    def update(self, zombies_list=None):
+    def update(self, zombies_list=None, area_index=None):
         """重写update方法，包含爆炸粒子更新"""
         # 更新爆炸粒子
         if self.show_explosion:
@@ -291,5 +303,5 @@ class MelonBullet(BaseBullet):
         self.col = self.start_col + (self.target_col - self.start_col) * self.flight_progress
 
         # 检查是否超出屏幕右边缘
-        grid_width = self.constants['GRID_WIDTH'] if self.constants else 9
+        grid_width = self.constants.GRID_WIDTH if self.constants else 9
         return self.col > grid_width
\ No newline at end of file
@@ -8,6 +8,8 @@ from .base_bullet import BaseBullet
 class PeaBullet(BaseBullet):
     """豌豆子弹类 - 植物大战僵尸的基础子弹"""
 
+    __slots__ = ()
+
     def __init__(self, row, col, can_penetrate=False, constants=None, images=None, **kwargs):
         super().__init__(row, col, bullet_type="pea", constants=constants, images=images, **kwargs)
 
@@ -31,6 +33,6 @@ class PeaBullet(BaseBullet):
             surface.blit(pea_img, (x - 10, y - 10))
         else:
             # 没有图片时使用颜色圆圈
-            white = self.constants.get('WHITE', (255, 255, 255)) if self.constants else (255, 255, 255)
+            white = self.constants.WHITE if self.constants else (255, 255, 255)
             color = (100, 150, 255) if self.can_penetrate else white  # 穿透豌豆是蓝色
             pygame.draw.circle(surface, color, (x, y), 5)
\ No newline at end of file
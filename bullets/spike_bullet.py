@@ -3,18 +3,38 @@
 """
 import pygame
 import math
+import weakref
+from rsc_mng.rotation_cache import rotation_cache
 from .base_bullet import BaseBullet
 
+# 重新锁定时依次扩大的搜索半径（格），都找不到时再遍历全部僵尸
+RETARGET_SEARCH_RADII = (1.5, 3.0, 6.0, 12.0)
+
+
+def _is_targetable(zombie):
+    """可以被锁定的僵尸：还活着且没有被黄瓜标记为即将死亡"""
+    return zombie.health > 0 and not zombie.cucumber_marked_for_death
+
 
 class SpikeBullet(BaseBullet):
     """尖刺子弹类 - 能够追踪目标的智能子弹"""
 
+    # 命中判定的行列距离
+    HIT_RANGE = 0.6
+
+    __slots__ = (
+        '_target_ref', 'tracking_speed', 'direction_x', 'direction_y', 'actual_x', 'actual_y',
+        'retargeting_cooldown', 'max_retargeting_cooldown', 'base_turn_rate', 'max_turn_rate',
+        'target_direction_x', 'target_direction_y',
+    )
+
     def __init__(self, row, col, target_zombie=None, constants=None, images=None, **kwargs):
         super().__init__(row, col, bullet_type="spike", constants=constants, images=images, **kwargs)
 
         # 尖刺子弹属性
         self.dmg = 40
         self.splash_dmg = 0
+        self._target_ref = None
         self.target_zombie = target_zombie
 
         # 追踪子弹特有属性
@@ -34,8 +54,18 @@ class SpikeBullet(BaseBullet):
         self.target_direction_x = self.direction_x  # 目标方向X
         self.target_direction_y = self.direction_y  # 目标方向Y
 
-    def update(self, zombies_list=None):
-        """更新追踪尖刺子弹，支持重新锁定，修复原地打转问题"""
+    @property
+    def target_zombie(self):
+        """当前锁定的僵尸；只持有弱引用，僵尸被释放后返回 None"""
+        return self._target_ref() if self._target_ref is not None else None
+
+    @target_zombie.setter
+    def target_zombie(self, zombie):
+        self._target_ref = weakref.ref(zombie) if zombie is not None else None
+
+    def update(self, zombies_list=None, area_index=None):
+        """更新追踪尖刺子弹，支持重新锁定，修复原地打转问题
+        area_index 为本帧共享的僵尸范围查询索引，用于 O(1) 判断目标是否仍在场上和就近重新锁定"""
         if not self.constants:
             return True
 
@@ -44,14 +74,15 @@ class SpikeBullet(BaseBullet):
             self.retargeting_cooldown -= 1
 
         # 检查当前目标是否还有效
-        target_is_valid = (self.target_zombie and
-                           self.target_zombie.health > 0 and
-                           self.target_zombie in zombies_list)  # 确保目标还在僵尸列表中
+        target = self.target_zombie
+        target_is_valid = (target is not None and target.health > 0 and
+                           self._is_on_field(target, zombies_list, area_index))  # 确保目标还在僵尸列表中
 
         # 如果目标无效且冷却时间已过，尝试重新锁定
         if not target_is_valid and self.retargeting_cooldown <= 0 and zombies_list:
-            new_target = self._find_nearest_zombie(zombies_list)
+            new_target = self._find_nearest_zombie(zombies_list, area_index)
             if new_target:
+                target = new_target
                 self.target_zombie = new_target
                 self.retargeting_cooldown = self.max_retargeting_cooldown
                 target_is_valid = True
@@ -59,8 +90,8 @@ class SpikeBullet(BaseBullet):
         # 如果有有效目标，计算目标方向
         if target_is_valid:
             # 计算到目标的方向
-            target_x = self.target_zombie.col
-            target_y = self.target_zombie.row
+            target_x = target.col
+            target_y = target.row
 
             dx = target_x - self.actual_x
             dy = target_y - self.actual_y
@@ -84,8 +115,8 @@ class SpikeBullet(BaseBullet):
                 # 这可以避免原地打转，让子弹有机会接近其他僵尸
                 pass
 
-        # 平滑转向目标方向
-        self._smooth_turn_to_target()
+        # 平滑转向目标方向（失效的目标不再参与转弯速率计算）
+        self._smooth_turn_to_target(target if target_is_valid else None)
 
         # 按当前方向移动
         self.actual_x += self.direction_x * self.tracking_speed
@@ -96,14 +127,21 @@ class SpikeBullet(BaseBullet):
         self.row = self.actual_y
 
         # 检查是否超出边界
-        grid_width = self.constants['GRID_WIDTH'] if self.constants else 9
-        grid_height = self.constants['GRID_HEIGHT'] if self.constants else 5
+        grid_width = self.constants.GRID_WIDTH if self.constants else 9
+        grid_height = self.constants.GRID_HEIGHT if self.constants else 5
 
         # 增加边界检查的宽容度，避免子弹过早消失
         return (self.col > grid_width + 2 or self.col < -2 or
                 self.row > grid_height + 2 or self.row < -2)
 
-    def _smooth_turn_to_target(self):
+    @staticmethod
+    def _is_on_field(zombie, zombies_list, area_index):
+        """僵尸是否还在僵尸列表中，有索引时为 O(1) 查询"""
+        if area_index is not None:
+            return area_index.contains(zombie)
+        return bool(zombies_list) and zombie in zombies_list
+
+    def _smooth_turn_to_target(self, target):
         """平滑转向目标方向，动态调整转弯速率"""
         # 计算当前方向与目标方向之间的角度差
         current_angle = math.atan2(self.direction_y, self.direction_x)
@@ -133,9 +171,9 @@ class SpikeBullet(BaseBullet):
 
         # 基于到目标距离的转弯速率调整
         distance_turn_rate = 1.0
-        if self.target_zombie:
-            distance = math.sqrt((self.target_zombie.col - self.actual_x) ** 2 +
-                                 (self.target_zombie.row - self.actual_y) ** 2)
+        if target is not None:
+            distance = math.sqrt((target.col - self.actual_x) ** 2 +
+                                 (target.row - self.actual_y) ** 2)
 
             # 距离越近，转弯越急
             if distance < 1.0:
@@ -166,21 +204,24 @@ class SpikeBullet(BaseBullet):
         self.direction_x = math.cos(new_angle)
         self.direction_y = math.sin(new_angle)
 
-    def _find_nearest_zombie(self, zombies_list):
-        """找到离子弹最近的有效僵尸，改进版本"""
+    def _find_nearest_zombie(self, zombies_list, area_index=None):
+        """找到离子弹最近的有效僵尸，有索引时由近到远逐步扩大范围查询"""
         if not zombies_list:
             return None
 
+        if area_index is not None:
+            # 半径内找到的最近僵尸一定也是全局最近的（范围外的距离都更远）
+            for radius in RETARGET_SEARCH_RADII:
+                found = area_index.nearest(self.actual_y, self.actual_x, radius, 1, _is_targetable)
+                if found:
+                    return found[0]
+
         nearest_zombie = None
         min_distance = float('inf')
 
         for zombie in zombies_list:
-            # 只考虑还活着的僵尸
-            if zombie.health <= 0:
-                continue
-
-            # 额外检查：确保僵尸没有被标记为即将死亡（黄瓜效果）
-            if hasattr(zombie, 'cucumber_marked_for_death') and zombie.cucumber_marked_for_death:
+            # 只考虑还活着、没有被标记为即将死亡（黄瓜效果）的僵尸
+            if not _is_targetable(zombie):
                 continue
 
             # 计算距离
@@ -202,16 +243,21 @@ class SpikeBullet(BaseBullet):
 
         horizontal_distance = abs(zombie.col - self.col)
         vertical_distance = abs(zombie.row - self.row)
-        return horizontal_distance < 0.6 and vertical_distance < 0.6
+        return horizontal_distance < self.HIT_RANGE and vertical_distance < self.HIT_RANGE
+
+    def collision_candidates(self, area_index):
+        """子弹所在格子附近可能被命中的僵尸（保持列表顺序），代替遍历全部僵尸"""
+        hit_range = self.HIT_RANGE
+        return area_index.candidates(self.row - hit_range, self.row + hit_range,
+                                     self.col - hit_range, self.col + hit_range)
 
     def _draw_bullet(self, surface, x, y):
         """绘制尖刺子弹"""
         spike_img = self.images.get('spike_img') if self.images else None
         if spike_img:
-            # 根据飞行方向旋转尖刺图片
+            # 根据飞行方向取预先旋转好的尖刺图片
             angle = math.degrees(math.atan2(self.direction_y, self.direction_x))
-            rotated_img = pygame.transform.rotate(spike_img, -angle)
-            rect = rotated_img.get_rect(center=(x, y))
+            rotated_img, rect = rotation_cache.get_centered(spike_img, -angle, (x, y))
             surface.blit(rotated_img, rect)
         else:
             # 没有图片时绘制简单的三角形尖刺
@@ -9,7 +9,10 @@ from .cards_manager import cards_manager, get_available_cards_new, get_plant_sel
 from .features_manager import features_manager
 from .game_state_manager import GameStateManager
 from .level_manager import LevelManager
+from .config_watcher import get_config_watcher, stop_all_config_watchers
 from .event_handler import EventHandler
+from .snapshot import GameSnapshot, SnapshotHistory
+from .level_preparer import LevelPreparer
 from .constants import *
 
 __all__ = [
@@ -19,6 +22,11 @@ __all__ = [
     'features_manager',
     'GameStateManager',
     'LevelManager',
+    'get_config_watcher',
+    'stop_all_config_watchers',
     'EventHandler',
+    'GameSnapshot',
+    'SnapshotHistory',
+    'LevelPreparer',
     # constants中的所有内容会通过 * 导入
 ]
@@ -0,0 +1,112 @@
+"""
+范围查询服务 - 按 (行, 列) 分桶的僵尸索引
+爆炸、溅射、闪电跳跃等范围效果只检查目标区域附近桶里的僵尸，不再遍历全部僵尸
+查询结果保持僵尸在 game["zombies"] 中的先后顺序，与原来逐个遍历的结果一致
+"""
+import math
+
+
+class ZombieAreaIndex:
+    """僵尸分桶索引，首次查询时构建；僵尸移动后需调用 invalidate()"""
+
+    def __init__(self, zombies):
+        self.zombies = zombies
+        self._buckets = None  # (行, 列下取整) -> [僵尸]
+        self._rows = None  # 行 -> [僵尸]
+        self._order = None  # id(僵尸) -> 在列表中的位置
+
+    def invalidate(self):
+        """僵尸位置或列表变化后调用，下次查询时重建"""
+        self._buckets = None
+
+    def _build(self):
+        buckets = {}
+        rows = {}
+        order = {}
+        for index, zombie in enumerate(self.zombies):
+            order[id(zombie)] = index
+            row = math.floor(zombie.row)
+            key = (row, math.floor(zombie.col))
+            bucket = buckets.get(key)
+            if bucket is None:
+                buckets[key] = [zombie]
+            else:
+                bucket.append(zombie)
+            rows.setdefault(row, []).append(zombie)
+        self._buckets = buckets
+        self._rows = rows
+        self._order = order
+
+    def contains(self, zombie):
+        """僵尸是否仍在列表中（O(1)，代替 zombie in zombies 的线性查找）"""
+        if self._buckets is None:
+            self._build()
+        return id(zombie) in self._order
+
+    def query_row(self, row):
+        """整行查询"""
+        if self._buckets is None:
+            self._build()
+        return self._rows.get(row, ())
+
+    def candidates(self, min_row, max_row, min_col, max_col):
+        """行、列坐标落在闭区间范围内所在桶的僵尸（可能包含范围外的，调用方需精确判断）"""
+        if self._buckets is None:
+            self._build()
+
+        result = []
+        buckets = self._buckets
+        for row in range(math.floor(min_row), math.floor(max_row) + 1):
+            for col in range(math.floor(min_col), math.floor(max_col) + 1):
+                bucket = buckets.get((row, col))
+                if bucket:
+                    result.extend(bucket)
+
+        if len(result) > 1:
+            order = self._order
+            result.sort(key=lambda zombie: order[id(zombie)])
+        return result
+
+    def query_rect(self, min_row, max_row, min_col, max_col):
+        """矩形范围查询（闭区间）"""
+        return [zombie for zombie in self.candidates(min_row, max_row, min_col, max_col)
+                if min_row <= zombie.row <= max_row and min_col <= zombie.col <= max_col]
+
+    def query_cells(self, cells):
+        """格子集合查询：僵尸所在行与四舍五入后的列落在 cells 中（爆炸范围判定）"""
+        cells = set(cells)
+        if not cells:
+            return []
+        rows = [row for row, _ in cells]
+        cols = [col for _, col in cells]
+        # 四舍五入到某列的僵尸列坐标在该列 ±0.5 以内
+        return [zombie for zombie in self.candidates(min(rows), max(rows), min(cols) - 1, max(cols) + 1)
+                if (zombie.row, int(round(zombie.col))) in cells]
+
+    def query_radius(self, row, col, radius, row_radius=None):
+        """椭圆范围查询：(列距/radius)² + (行距/row_radius)² <= 1，row_radius 默认等于 radius"""
+        if row_radius is None:
+            row_radius = radius
+        result = []
+        for zombie in self.candidates(row - row_radius, row + row_radius, col - radius, col + radius):
+            normalized = (abs(zombie.col - col) / radius) ** 2 + (abs(zombie.row - row) / row_radius) ** 2
+            if normalized <= 1.0:
+                result.append(zombie)
+        return result
+
+    def nearest(self, row, col, max_distance, k=1, predicate=None):
+        """范围内最近的 k 个僵尸（欧氏距离），距离相同时按列表顺序；predicate 用于过滤"""
+        found = []
+        for zombie in self.candidates(row - max_distance, row + max_distance,
+                                      col - max_distance, col + max_distance):
+            if predicate is not None and not predicate(zombie):
+                continue
+            dx = zombie.col - col
+            dy = zombie.row - row
+            distance = (dx * dx + dy * dy) ** 0.5
+            if distance <= max_distance:
+                found.append((distance, zombie))
+
+        # 候选已按列表顺序排列，稳定排序保证距离相同时先出现的僵尸在前
+        found.sort(key=lambda item: item[0])
+        return [zombie for _, zombie in found[:k]]
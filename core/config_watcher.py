@@ -0,0 +1,263 @@
+"""
+配置文件监听模块 - 在后台线程中监听关卡配置文件的变化
+Linux 下使用 inotify，其他平台退化为后台轮询 mtime；
+解析和校验都在后台完成，游戏主循环只在帧边界换入已编译好的配置
+"""
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+
+# inotify 事件掩码
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+
+_INOTIFY_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE_SELF | IN_MOVE_SELF
+_INOTIFY_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len
+
+# 编辑器保存文件时常常分多次写入，等待写入稳定后再解析
+DEBOUNCE_SECONDS = 0.15
+
+
+class CompiledLevelConfig:
+    """编译后的关卡配置（只读快照），每个关卡已与默认配置合并好"""
+
+    def __init__(self, config_data, version=0, mtime=None):
+        self.config_data = config_data
+        self.version = version
+        self.mtime = mtime
+        self.default_config = dict(config_data.get("default_config", {}))
+        self.levels = {}
+
+        for level_key, level_data in config_data.get("levels", {}).items():
+            merged = self.default_config.copy()
+            merged.update(level_data)
+            self.levels[str(level_key)] = merged
+
+        self.max_level = max((int(k) for k in self.levels), default=1)
+
+    def get_level_config(self, level_num):
+        """获取指定关卡的合并后配置（返回副本）"""
+        config = self.levels.get(str(level_num))
+        if config is not None:
+            return config.copy()
+
+        config = self.default_config.copy()
+        config["name"] = f"第{level_num}关：未知挑战"
+        return config
+
+
+def validate_level_config(config_data):
+    """校验配置结构，不合法时抛出 ValueError"""
+    if not isinstance(config_data, dict):
+        raise ValueError("配置根节点必须是对象")
+
+    default_config = config_data.get("default_config", {})
+    if not isinstance(default_config, dict):
+        raise ValueError("default_config 必须是对象")
+
+    levels = config_data.get("levels", {})
+    if not isinstance(levels, dict):
+        raise ValueError("levels 必须是对象")
+
+    for level_key, level_data in levels.items():
+        if not str(level_key).isdigit():
+            raise ValueError(f"关卡编号必须是数字: {level_key}")
+        if not isinstance(level_data, dict):
+            raise ValueError(f"第{level_key}关配置必须是对象")
+        max_waves = level_data.get("max_waves", default_config.get("max_waves", 5))
+        if not isinstance(max_waves, int) or max_waves <= 0:
+            raise ValueError(f"第{level_key}关 max_waves 无效: {max_waves}")
+
+
+def compile_level_config(config_data, version=0, mtime=None):
+    """校验并编译配置数据"""
+    validate_level_config(config_data)
+    return CompiledLevelConfig(config_data, version, mtime)
+
+
+class ConfigWatcher:
+    """配置文件监听器，一个配置文件路径对应一个实例，由所有关卡管理器共享"""
+
+    def __init__(self, config_path, poll_interval=1.0):
+        self.config_path = os.path.abspath(config_path)
+        self.poll_interval = poll_interval
+
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._version = 0
+        self._last_mtime = None
+
+        self._thread = None
+        self._stop_event = threading.Event()
+        self.backend = None  # "inotify" 或 "polling"
+
+    @property
+    def version(self):
+        """当前已发布配置的版本号"""
+        return self._version
+
+    def get_snapshot(self):
+        """获取最新发布的已编译配置（不访问磁盘）"""
+        return self._snapshot
+
+    def load_now(self):
+        """同步读取并发布配置，成功返回快照，失败返回 None"""
+        return self._load_and_publish()
+
+    def _load_and_publish(self):
+        """读取、校验、编译配置并发布新版本"""
+        try:
+            mtime = os.path.getmtime(self.config_path)
+            with open(self.config_path, 'r', encoding='utf-8') as f:
+                config_data = json.load(f)
+            with self._lock:
+                snapshot = compile_level_config(config_data, self._version + 1, mtime)
+                self._version = snapshot.version
+                self._snapshot = snapshot
+                self._last_mtime = mtime
+            return snapshot
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"加载配置文件失败: {e}")
+            # 记录 mtime，避免轮询模式下对同一个坏文件反复报错
+            try:
+                self._last_mtime = os.path.getmtime(self.config_path)
+            except OSError:
+                pass
+            return None
+
+    def start(self):
+        """启动后台监听线程（重复调用无副作用）"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="ConfigWatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """停止后台监听线程"""
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+
+    def is_running(self):
+        """后台线程是否在运行"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        """线程入口：优先使用 inotify，不可用时退化为轮询"""
+        if sys.platform.startswith("linux"):
+            try:
+                self._run_inotify()
+                return
+            except OSError as e:
+                print(f"inotify 不可用，改用轮询监听配置文件: {e}")
+
+        self._run_polling()
+
+    def _run_polling(self):
+        """轮询 mtime 的后备实现"""
+        self.backend = "polling"
+        while not self._stop_event.wait(self.poll_interval):
+            try:
+                mtime = os.path.getmtime(self.config_path)
+            except OSError:
+                continue
+            if mtime != self._last_mtime:
+                time.sleep(DEBOUNCE_SECONDS)
+                self._publish_change()
+
+    def _run_inotify(self):
+        """基于 inotify 的实现，监听所在目录以兼容编辑器的"写临时文件再改名"保存方式"""
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | getattr(os, "O_CLOEXEC", 0))
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 失败")
+
+        try:
+            directory = os.path.dirname(self.config_path) or "."
+            wd = libc.inotify_add_watch(fd, directory.encode(), _INOTIFY_MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"无法监听目录 {directory}")
+
+            self.backend = "inotify"
+            target_name = os.path.basename(self.config_path).encode()
+
+            while not self._stop_event.is_set():
+                # 带超时的 select，保证 stop() 能及时退出
+                readable, _, _ = select.select([fd], [], [], 0.5)
+                if not readable:
+                    continue
+
+                if self._drain_inotify_events(fd, target_name):
+                    # 等待写入稳定后，把这段时间内的后续事件一并吞掉
+                    time.sleep(DEBOUNCE_SECONDS)
+                    self._drain_inotify_events(fd, target_name)
+                    self._publish_change()
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _drain_inotify_events(fd, target_name):
+        """读取所有待处理事件，返回是否涉及目标文件"""
+        touched = False
+        while True:
+            try:
+                buffer = os.read(fd, 4096)
+            except BlockingIOError:
+                break
+            if not buffer:
+                break
+
+            offset = 0
+            while offset + _INOTIFY_EVENT.size <= len(buffer):
+                _, _, _, name_len = _INOTIFY_EVENT.unpack_from(buffer, offset)
+                offset += _INOTIFY_EVENT.size
+                name = buffer[offset:offset + name_len].rstrip(b"\0")
+                offset += name_len
+                if name == target_name:
+                    touched = True
+        return touched
+
+    def _publish_change(self):
+        """文件变化后重新编译配置"""
+        if self._load_and_publish():
+            print("检测到配置文件更新，已在后台完成解析")
+
+
+# 每个配置文件路径共享一个监听器
+_watchers = {}
+_watchers_lock = threading.Lock()
+
+
+def get_config_watcher(config_path):
+    """获取（必要时创建）指定配置文件的监听器"""
+    key = os.path.abspath(config_path)
+    with _watchers_lock:
+        watcher = _watchers.get(key)
+        if watcher is None:
+            watcher = ConfigWatcher(config_path)
+            _watchers[key] = watcher
+        return watcher
+
+
+def stop_all_config_watchers():
+    """停止所有监听线程（程序退出时调用）"""
+    with _watchers_lock:
+        watchers = list(_watchers.values())
+    for watcher in watchers:
+        watcher.stop()
@@ -72,31 +72,103 @@ NORMAL_SPAWN_DELAY = 180
 WAVE_INTERVAL = 360
 MAX_NORMAL_ZOMBIES = 100
 
+# 主循环固定步长设置
+LOGIC_TICK_RATE = 60  # 每秒逻辑帧数
+LOGIC_TICK_SECONDS = 1.0 / LOGIC_TICK_RATE
+GAME_SPEEDS = (1, 2, 4)  # 可选的游戏倍速
+MAX_SUBSTEPS = 8  # 每个渲染帧最多补跑的逻辑帧数，避免卡顿时越追越慢
+MAX_FRAME_SECONDS = 0.25  # 单帧计入的最长时间（拖动窗口、断点等长时间停顿）
+INTERPOLATION_MAX_JUMP = 1.0  # 两帧间位移超过该格数视为瞬移，不做插值
+
 # 图鉴按钮相关常量
 CODEX_BUTTON_SIZE = 80  # 图鉴按钮尺寸（正方形）
 CODEX_BUTTON_X = 100  # 与商店按钮同一水平位置
 CODEX_BUTTON_Y = BASE_HEIGHT // 2 - 50  # 在商店按钮上方
 
 
+class GameConstants:
+    """
+    只读的游戏常量对象，全局共享一份
+    同时预先计算每行、每列格子左上角的像素坐标，绘制时查表即可；
+    保留 constants['GRID_SIZE'] / constants.get(...) 的字典式访问以兼容旧代码
+    """
+    __slots__ = (
+        'BATTLEFIELD_LEFT', 'BATTLEFIELD_TOP', 'GRID_SIZE', 'GRID_GAP', 'GRID_WIDTH', 'GRID_HEIGHT',
+        'GREEN', 'ORANGE', 'GRAY', 'RED', 'BLUE', 'ARMOR_COLOR', 'WHITE', 'BITE_INTERVAL', 'MAX_SUN',
+        'CELL_STEP', 'COL_X', 'ROW_Y',
+    )
+
+    def __init__(self):
+        values = {
+            'BATTLEFIELD_LEFT': BATTLEFIELD_LEFT,
+            'BATTLEFIELD_TOP': BATTLEFIELD_TOP,
+            'GRID_SIZE': GRID_SIZE,
+            'GRID_GAP': GRID_GAP,
+            'GRID_WIDTH': GRID_WIDTH,
+            'GRID_HEIGHT': GRID_HEIGHT,
+            'GREEN': GREEN,
+            'ORANGE': ORANGE,
+            'GRAY': GRAY,
+            'RED': RED,
+            'BLUE': BLUE,
+            'ARMOR_COLOR': ARMOR_COLOR,
+            'WHITE': WHITE,
+            'BITE_INTERVAL': 30,
+            'MAX_SUN': MAX_SUN,
+            # 相邻格子的像素间距
+            'CELL_STEP': GRID_SIZE + GRID_GAP,
+            # 第 col 列 / 第 row 行格子左上角的像素坐标
+            'COL_X': tuple(BATTLEFIELD_LEFT + col * (GRID_SIZE + GRID_GAP) for col in range(GRID_WIDTH)),
+            'ROW_Y': tuple(BATTLEFIELD_TOP + row * (GRID_SIZE + GRID_GAP) for row in range(GRID_HEIGHT)),
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("GameConstants 是只读的")
+
+    def __delattr__(self, name):
+        raise AttributeError("GameConstants 是只读的")
+
+    def __reduce__(self):
+        # 复制、序列化后仍指向共享实例
+        return get_constants, ()
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def __contains__(self, key):
+        return key in self.__slots__
+
+    def get(self, key, default=None):
+        """字典式访问，缺少的键返回默认值"""
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    def cell_x(self, col):
+        """格子左边缘的像素 x，整数列直接查表"""
+        if type(col) is int and 0 <= col < self.GRID_WIDTH:
+            return self.COL_X[col]
+        return self.BATTLEFIELD_LEFT + col * self.CELL_STEP
+
+    def cell_y(self, row):
+        """格子上边缘的像素 y，整数行直接查表"""
+        if type(row) is int and 0 <= row < self.GRID_HEIGHT:
+            return self.ROW_Y[row]
+        return self.BATTLEFIELD_TOP + row * self.CELL_STEP
+
+
+_game_constants = None
+
+
 def get_constants():
-    """获取常量字典，供Plant和Zombie类使用"""
-    return {
-        'BATTLEFIELD_LEFT': BATTLEFIELD_LEFT,
-        'BATTLEFIELD_TOP': BATTLEFIELD_TOP,
-        'GRID_SIZE': GRID_SIZE,
-        'GRID_GAP': GRID_GAP,
-        'GRID_WIDTH': GRID_WIDTH,
-        'GRID_HEIGHT': GRID_HEIGHT,
-        'GREEN': GREEN,
-        'ORANGE': ORANGE,
-        'GRAY': GRAY,
-        'RED': RED,
-        'BLUE': BLUE,
-        'ARMOR_COLOR': ARMOR_COLOR,
-        'WHITE': WHITE,
-        'BITE_INTERVAL': 30,
-        'MAX_SUN': MAX_SUN
-    }
+    """获取共享的常量对象，供Plant和Zombie类使用"""
+    global _game_constants
+    if _game_constants is None:
+        _game_constants = GameConstants()
+    return _game_constants
 
 
 def add_sun_safely(current_sun, amount_to_add):
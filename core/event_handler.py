@@ -6,6 +6,12 @@ from ui import *
 from .game_logic import *
 from rsc_mng.audio_manager import play_sound_with_music_pause, set_sounds_volume
 from database import *
+from .replay import INPUT_CLICK, INPUT_RIGHT_CLICK, INPUT_SPACE
+from ui.hit_test import (
+    UILayouts, MAIN_MENU_LABELS, build_main_menu_layout, build_level_select_layout,
+    build_codex_layout, build_codex_detail_layout, build_shop_layout,
+    build_settings_layout, build_playing_layout
+)
 
 
 
@@ -18,10 +24,18 @@ class EventHandler:
         # 添加滑块拖拽状态跟踪
         self.dragging_slider = False
         self.slider_bg_rect = None
+        # 各界面的控件布局索引，悬浮和点击检测共用
+        self.layouts = UILayouts()
 
     def handle_events(self):
         """处理游戏事件"""
+        last_motion_pos = None
         for event in pygame.event.get():
+            # 按键前先处理积攒的鼠标移动，保证拖拽、悬浮与点击的先后顺序不变
+            if last_motion_pos is not None and event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+                self._dispatch_mouse_motion(last_motion_pos)
+                last_motion_pos = None
+
             if event.type == pygame.QUIT:
                 # 在退出前保存游戏进度
                 if self.game_manager.should_save_game_on_exit():
@@ -39,6 +53,7 @@ class EventHandler:
                 if event.key == pygame.K_ESCAPE:
                     self.game_manager.toggle_fullscreen()
                 elif event.key == pygame.K_SPACE:
+                    self.game_manager.record_replay_input(INPUT_SPACE)
                     self._handle_space_key()
                 elif event.key == pygame.K_F5:
                     self._handle_f5_key()  # 手动重载配置
@@ -46,15 +61,23 @@ class EventHandler:
                     self._handle_f6_key()  # 切换热重载开关
                 elif event.key == pygame.K_F7:
                     self._handle_f7_key()  # 显示配置信息
+                elif event.key == pygame.K_F8:
+                    self.game_manager.toggle_replay_recording()  # 切换回放录制
+                elif event.key == pygame.K_F9:
+                    self.game_manager.cycle_game_speed()  # 切换游戏倍速
+                elif event.key == pygame.K_F10:
+                    self.game_manager.toggle_practice_rewind()  # 切换练习模式回退
+                elif event.key == pygame.K_BACKSPACE:
+                    self.game_manager.rewind_practice()  # 练习模式下回退 5 秒
 
             elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 # 在过渡动画期间禁用鼠标点击
                 if self.game_manager.state_manager.is_in_transition():
                     continue
 
-                should_continue = self.handle_mouse_click(
-                    self.game_manager.transform_mouse_pos(event.pos)
-                )
+                mouse_pos = self.game_manager.transform_mouse_pos(event.pos)
+                self.game_manager.record_replay_input(INPUT_CLICK, mouse_pos)
+                should_continue = self.handle_mouse_click(mouse_pos)
                 if should_continue is False:
                     return False  # 传播退出信号
 
@@ -65,6 +88,7 @@ class EventHandler:
                     continue
 
                 # 右键点击取消当前选中的植物或铲子
+                self.game_manager.record_replay_input(INPUT_RIGHT_CLICK)
                 self._handle_right_click_cancel()
 
             elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
@@ -72,14 +96,23 @@ class EventHandler:
                 self._handle_mouse_release()
 
             elif event.type == pygame.MOUSEMOTION:
-                if not self.game_manager.state_manager.is_in_transition():
-                    mouse_pos = self.game_manager.transform_mouse_pos(event.pos)
-                    self.handle_mouse_motion(mouse_pos)
-                    # 处理滑块拖拽
-                    self._handle_slider_drag(mouse_pos)
+                # 一帧内的多次移动只处理最后一次
+                last_motion_pos = event.pos
+
+        if last_motion_pos is not None:
+            self._dispatch_mouse_motion(last_motion_pos)
 
         return True
 
+    def _dispatch_mouse_motion(self, screen_pos):
+        """处理（合并后的）鼠标移动"""
+        if self.game_manager.state_manager.is_in_transition():
+            return
+        mouse_pos = self.game_manager.transform_mouse_pos(screen_pos)
+        self.handle_mouse_motion(mouse_pos)
+        # 处理滑块拖拽
+        self._handle_slider_drag(mouse_pos)
+
     def _handle_mouse_release(self):
         """处理鼠标松开事件"""
         # 停止滑块拖拽
@@ -167,31 +200,10 @@ class EventHandler:
         if self.game_manager.animation_manager.level_select_exit_animation:
             return
 
-        x, y = pos
-
-        # 图鉴主页悬浮处理
-        # 检查返回按钮悬浮
-        back_btn = pygame.Rect(20, 20, 100, 40)  # 与draw_codex_page保持一致
-        if back_btn.collidepoint(x, y):
-            self.game_manager.state_manager.set_hover_button("back", "codex")
-            return
-
-        # 检查植物图鉴按钮悬浮
-        button_width = 320
-        button_height = 400
-        button_spacing = 60
-
-        total_width = 2 * button_width + button_spacing
-        start_x = (BASE_WIDTH - total_width) // 2
-        start_y = 120
-
-        plant_btn = pygame.Rect(start_x, start_y, button_width, button_height)
-        zombie_btn = pygame.Rect(start_x + button_width + button_spacing, start_y, button_width, button_height)
-
-        if plant_btn.collidepoint(x, y):
-            self.game_manager.state_manager.set_hover_button("plants", "codex")
-        elif zombie_btn.collidepoint(x, y):
-            self.game_manager.state_manager.set_hover_button("zombies", "codex")
+        # 返回按钮、植物图鉴按钮、僵尸图鉴按钮
+        widget = self.layouts.get("codex", None, build_codex_layout).hit(pos)
+        if widget is not None:
+            self.game_manager.state_manager.set_hover_button(widget, "codex")
 
     def _handle_codex_detail_click(self, x, y):
         """处理详细图鉴页面点击"""
@@ -226,23 +238,6 @@ class EventHandler:
 
     def _handle_codex_detail_hover(self, pos):
         """处理详细图鉴页面悬浮"""
-        x, y = pos
-
-        # 检查返回按钮悬浮
-        back_btn = pygame.Rect(20, 20, 100, 40)
-        if back_btn.collidepoint(x, y):
-            self.game_manager.state_manager.set_hover_button("back", "codex_detail")
-            return
-
-        # 检查网格项目悬浮
-        grid_cols = 6
-        grid_rows = 5
-        cell_size = 80
-        cell_spacing = 8
-
-        grid_start_x = 50
-        grid_start_y = 120
-
         # 获取当前图鉴数据以确定有效范围
         if self.game_manager.state_manager.get_codex_detail_type() == "plants":
             from ui import get_plants_codex_data
@@ -251,19 +246,11 @@ class EventHandler:
             from ui import get_zombies_codex_data
             codex_data = get_zombies_codex_data()
 
-        for row in range(grid_rows):
-            for col in range(grid_cols):
-                index = row * grid_cols + col
-                if index >= len(codex_data):
-                    break  # 超出数据范围就停止
-
-                cell_x = grid_start_x + col * (cell_size + cell_spacing)
-                cell_y = grid_start_y + row * (cell_size + cell_spacing)
-                cell_rect = pygame.Rect(cell_x, cell_y, cell_size, cell_size)
-
-                if cell_rect.collidepoint(x, y):
-                    self.game_manager.state_manager.set_hover_button(f"grid_{index}", "codex_detail")
-                    return
+        widget = self.layouts.get("codex_detail", len(codex_data), build_codex_detail_layout).hit(pos)
+        if widget == "back":
+            self.game_manager.state_manager.set_hover_button("back", "codex_detail")
+        elif widget is not None:
+            self.game_manager.state_manager.set_hover_button(f"grid_{widget[1]}", "codex_detail")
 
     def _handle_settings_click(self, x, y):
         """处理设置菜单点击 - 修复重置逻辑"""
@@ -328,44 +315,12 @@ class EventHandler:
         if (self.game_manager.animation_manager.menu_animation_complete and
                 not self.game_manager.animation_manager.menu_exit_animation):
 
-            x, y = pos
-            # 主菜单按钮参数（与draw_main_menu保持一致）
-            menu_width = 250
-            menu_x = BASE_WIDTH - menu_width - 50
-            menu_y = 150
-
-            button_labels = ["主线模式", "挑战模式", "无尽模式", "设置"]
-
-            for i, label in enumerate(button_labels):
-                btn_y = menu_y + i * 70
-                btn_rect = pygame.Rect(menu_x, btn_y, menu_width, 50)
-
-                if btn_rect.collidepoint(x, y):
-                    self.game_manager.state_manager.set_hover_button(i, "main_menu")
-                    break
-            # 检查商店按钮悬浮（在现有按钮检测后面添加）
-            if (self.game_manager.animation_manager.menu_animation_complete and
-                    not self.game_manager.animation_manager.menu_exit_animation):
-
-                # 商店按钮参数（与draw_main_menu保持一致）
-                shop_button_size = 80
-                shop_x = 100
-                shop_y = BASE_HEIGHT // 2 + 50
-                shop_rect = pygame.Rect(shop_x, shop_y, shop_button_size, shop_button_size)
-
-                if shop_rect.collidepoint(x, y):
-                    self.game_manager.state_manager.set_hover_button("shop", "main_menu")
-                    return  # 找到悬浮按钮后返回
-
-                # 检查图鉴按钮悬浮（新增）
-                codex_button_size = CODEX_BUTTON_SIZE
-                codex_x = CODEX_BUTTON_X
-                codex_y = CODEX_BUTTON_Y
-                codex_rect = pygame.Rect(codex_x, codex_y, codex_button_size, codex_button_size)
-
-                if codex_rect.collidepoint(x, y):
-                    self.game_manager.state_manager.set_hover_button("codex", "main_menu")
-                    return  # 找到悬浮按钮后返回
+            # 模式按钮悬浮用序号，商店和图鉴按钮用名称
+            widget = self.layouts.get("main_menu", None, build_main_menu_layout).hit(pos)
+            if isinstance(widget, tuple):
+                self.game_manager.state_manager.set_hover_button(widget[1], "main_menu")
+            elif widget is not None:
+                self.game_manager.state_manager.set_hover_button(widget, "main_menu")
 
     def _handle_playing_hover(self, pos):
         """处理游戏界面悬浮"""
@@ -373,44 +328,21 @@ class EventHandler:
             return
 
         x, y = pos
+        cards = self.game_manager.get_available_cards_for_current_state()
 
-        # 检查设置按钮悬浮
-        settings_rect = pygame.Rect(SETTINGS_BUTTON_X, SETTINGS_BUTTON_Y,
-                                    SETTINGS_BUTTON_WIDTH, SETTINGS_BUTTON_HEIGHT)
-        if settings_rect.collidepoint(x, y):
-            self.game_manager.state_manager.set_hover_button("settings", "game_ui")
+        # 设置按钮、铲子、锤子和卡片悬浮
+        widget = self._get_playing_layout(cards).hit(pos)
+        if isinstance(widget, tuple):
+            # 检查卡片是否可用
+            if self._is_card_hoverable(cards[widget[1]]):
+                self.game_manager.state_manager.set_hover_button(f"card_{widget[1]}", "game_ui")
             self.game_manager.state_manager.clear_plant_preview()
             return
-
-        # 检查铲子悬浮
-        shovel_rect = pygame.Rect(self.game_manager.shovel["x"], self.game_manager.shovel["y"],
-                                  self.game_manager.shovel["width"], self.game_manager.shovel["height"])
-        if shovel_rect.collidepoint(x, y):
-            self.game_manager.state_manager.set_hover_button("shovel", "game_ui")
+        elif widget is not None:
+            self.game_manager.state_manager.set_hover_button(widget, "game_ui")
             self.game_manager.state_manager.clear_plant_preview()
             return
 
-        # 新增：检查锤子悬浮
-        if (hasattr(self.game_manager, 'shop_manager') and
-                self.game_manager.shop_manager.has_hammer()):
-            hammer_rect = pygame.Rect(HAMMER_X, HAMMER_Y, HAMMER_WIDTH, HAMMER_HEIGHT)
-            if hammer_rect.collidepoint(x, y):
-                self.game_manager.state_manager.set_hover_button("hammer", "game_ui")
-                self.game_manager.state_manager.clear_plant_preview()
-                return
-
-        # 检查卡片悬浮
-        cards = self.game_manager.get_available_cards_for_current_state()
-        for i, card in enumerate(cards):
-            card_x = CARD_START_X + i * CARD_WIDTH
-            card_rect = pygame.Rect(card_x, CARD_Y, CARD_WIDTH, CARD_HEIGHT)
-            if card_rect.collidepoint(x, y):
-                # 检查卡片是否可用
-                if self._is_card_hoverable(card):
-                    self.game_manager.state_manager.set_hover_button(f"card_{i}", "game_ui")
-                self.game_manager.state_manager.clear_plant_preview()
-                return
-
         # 新增：处理锤子鼠标跟随
         selected = self.game_manager.game["selected"]
         if selected == "hammer":
@@ -437,6 +369,11 @@ class EventHandler:
         if self.game_manager.plant_selection_manager.show_plant_select:
             self._handle_plant_select_hover(pos)
 
+    def _get_playing_layout(self, cards):
+        """游戏界面工具栏布局，随卡片数量和是否购买锤子变化"""
+        has_hammer = self.game_manager.shop_manager.has_hammer()
+        return self.layouts.get("playing", (len(cards), has_hammer), build_playing_layout)
+
     def _handle_plant_preview(self, x, y, cards):
         """处理植物种植预览"""
         from utils import pixel_to_grid, can_place_plant_at_position
@@ -509,55 +446,11 @@ class EventHandler:
 
     def _handle_settings_hover(self, pos):
         """处理设置菜单悬浮"""
-        x, y = pos
-
-        # 设置菜单按钮检测（需要与show_settings_menu_with_hotreload保持一致）
-        popup_width = 400
-        popup_height = 400 if self.game_manager.state_manager.game_state == "playing" else 300  # 更新高度
-        popup = pygame.Rect((BASE_WIDTH - popup_width) // 2,
-                            (BASE_HEIGHT - popup_height) // 2,
-                            popup_width, popup_height)
-
+        # 设置菜单按钮布局在游戏内和主菜单不同
         in_game = self.game_manager.state_manager.game_state == "playing"
-
-        # 全屏按钮
-        fullscreen_btn = pygame.Rect(popup.left + 75, popup.top + 120, 250, 40)
-        if fullscreen_btn.collidepoint(x, y):
-            self.game_manager.state_manager.set_hover_button("fullscreen", "settings")
-            return
-
-        # 重置按钮（主菜单）
-        if not in_game:
-            reset_btn = pygame.Rect(popup.left + 75, popup.top + 175, 250, 40)
-            if reset_btn.collidepoint(x, y):
-                self.game_manager.state_manager.set_hover_button("reset", "settings")
-                return
-
-        # 重新开始按钮（游戏内）
-        if in_game:
-            restart_game_btn = pygame.Rect(popup.left + 75, popup.top + 175, 250, 40)
-            if restart_game_btn.collidepoint(x, y):
-                self.game_manager.state_manager.set_hover_button("restart_game", "settings")
-                return
-
-            # 新增：返回选关页面按钮悬浮检测（游戏内）
-            return_to_level_select_btn = pygame.Rect(popup.left + 75, popup.top + 230, 250, 40)
-            if return_to_level_select_btn.collidepoint(x, y):
-                self.game_manager.state_manager.set_hover_button("return_level_select", "settings")
-                return
-
-        # 继续/返回主页按钮
-        if not in_game:
-            continue_btn = pygame.Rect(popup.left + 50, popup.top + 235, 140, 35)  # 主菜单位置
-            quit_btn = pygame.Rect(popup.left + 210, popup.top + 235, 140, 35)
-        else:
-            continue_btn = pygame.Rect(popup.left + 50, popup.top + 285, 140, 35)  # 游戏内位置（更低）
-            quit_btn = pygame.Rect(popup.left + 210, popup.top + 285, 140, 35)
-
-        if continue_btn.collidepoint(x, y):
-            self.game_manager.state_manager.set_hover_button("continue", "settings")
-        elif quit_btn.collidepoint(x, y):
-            self.game_manager.state_manager.set_hover_button("quit", "settings")
+        widget = self.layouts.get("settings", in_game, build_settings_layout).hit(pos)
+        if widget is not None:
+            self.game_manager.state_manager.set_hover_button(widget, "settings")
 
     def _is_card_hoverable(self, card):
         """检查卡片是否可以悬浮高亮"""
@@ -584,41 +477,17 @@ class EventHandler:
         if self.game_manager.animation_manager.level_select_exit_animation:
             return
 
-        x, y = pos
+        widget = self.layouts.get("level_select", None, build_level_select_layout).hit(pos)
 
         # 先检查返回按钮悬浮
-        back_btn = pygame.Rect(20, 20, 100, 40)  # 与draw_level_select保持一致
-        if back_btn.collidepoint(x, y):
+        if widget == "back":
             self.game_manager.state_manager.set_hover_button("back", "level_select")
             # 清除关卡悬浮状态
             self.game_manager.state_manager.clear_hover_level()
             return
 
-        # 重新计算关卡按钮位置（与draw_level_select中的逻辑保持一致）
-        grid_width = 7
-        grid_height = 4
-        level_size = 80
-        level_spacing = 20
-        grid_start_x = (BASE_WIDTH - (grid_width * (level_size + level_spacing) - level_spacing)) // 2
-        grid_start_y = 100
-
-        hover_level = None
-        hovered_level_button = None
-
-        for row in range(grid_height):
-            for col in range(grid_width):
-                level_num = row * grid_width + col + 1
-                if level_num > 28:  # 最多28关
-                    break
-
-                level_x = grid_start_x + col * (level_size + level_spacing)
-                level_y = grid_start_y + row * (level_size + level_spacing)
-                level_rect = pygame.Rect(level_x, level_y, level_size, level_size)
-
-                if level_rect.collidepoint(x, y):
-                    hover_level = level_num
-                    hovered_level_button = f"level_{level_num}"
-                    break
+        hover_level = widget[1] if widget is not None else None
+        hovered_level_button = f"level_{hover_level}" if hover_level else None
 
         # 更新悬浮状态
         if hover_level != self.game_manager.state_manager.hover_level:
@@ -796,6 +665,8 @@ class EventHandler:
         # 执行购买
         success = self.game_manager.shop_manager.purchase_item(item['id'])
         if success:
+            # 第七卡槽等商品会改变卡槽内容
+            self.game_manager.invalidate_card_bar()
             # 扣除金币
             self.game_manager.add_coins(-item['price'])  # 使用负数来扣除金币
 
@@ -811,44 +682,15 @@ class EventHandler:
 
     def _handle_shop_hover(self, pos):
         """处理商店界面悬浮"""
-        x, y = pos
-
-        # 获取当前页面的商品数量
-        current_items = self.game_manager.shop_manager.get_current_page_items()
+        # 布局随当前页面的商品数量变化
+        item_count = len(self.game_manager.shop_manager.get_current_page_items())
+        widget = self.layouts.get("shop", item_count, build_shop_layout).hit(pos)
 
-        # 计算商品网格布局（与draw_shop_page保持一致）
-        grid_cols = 4
-        item_width = 120
-        item_height = 140
-        item_spacing_x = 30
-        item_spacing_y = 20
-
-        total_grid_width = grid_cols * item_width + (grid_cols - 1) * item_spacing_x
-        grid_start_x = (BASE_WIDTH - total_grid_width) // 2
-        grid_start_y = 120
-
-        # 检查商品悬浮
-        for i, item in enumerate(current_items):
-            row = i // grid_cols
-            col = i % grid_cols
-
-            item_x = grid_start_x + col * (item_width + item_spacing_x)
-            item_y = grid_start_y + row * (item_height + item_spacing_y)
-            item_rect = pygame.Rect(item_x, item_y, item_width, item_height)
-
-            if item_rect.collidepoint(x, y):
-                self.game_manager.state_manager.set_hover_button(f"item_{i}", "shop")
-                return
-
-        # 检查分页按钮悬浮
-        page_y = grid_start_y + (2 * item_height + item_spacing_y) + 40
-
-        prev_btn = pygame.Rect(BASE_WIDTH // 2 - 120, page_y, 80, 35)
-        next_btn = pygame.Rect(BASE_WIDTH // 2 + 40, page_y, 80, 35)
-
-        if prev_btn.collidepoint(x, y) and self.game_manager.shop_manager.can_prev_page():
+        if isinstance(widget, tuple):
+            self.game_manager.state_manager.set_hover_button(f"item_{widget[1]}", "shop")
+        elif widget == "prev_page" and self.game_manager.shop_manager.can_prev_page():
             self.game_manager.state_manager.set_hover_button("prev_page", "shop")
-        elif next_btn.collidepoint(x, y) and self.game_manager.shop_manager.can_next_page():
+        elif widget == "next_page" and self.game_manager.shop_manager.can_next_page():
             self.game_manager.state_manager.set_hover_button("next_page", "shop")
 
     def _handle_continue_dialog_click(self, x, y):
@@ -876,7 +718,7 @@ class EventHandler:
                 self.game_manager.state_manager.set_pending_game_data(
                     None, self.game_manager.state_manager.selected_level_for_continue
                 )
-            self.game_manager.state_manager.start_level_transition_animation()
+            self.game_manager.begin_level_transition()
 
         elif restart_btn.collidepoint(x, y):
             # 重新开始
@@ -886,7 +728,7 @@ class EventHandler:
             self.game_manager.state_manager.set_pending_game_data(
                 None, self.game_manager.state_manager.selected_level_for_continue
             )
-            self.game_manager.state_manager.start_level_transition_animation()
+            self.game_manager.begin_level_transition()
 
         elif back_btn.collidepoint(x, y):
             # 返回选关页面
@@ -1008,7 +850,7 @@ class EventHandler:
         else:
             # 没有保存进度，直接开始新游戏
             self.game_manager.state_manager.set_pending_game_data(None, level_num)
-            self.game_manager.state_manager.start_level_transition_animation()
+            self.game_manager.begin_level_transition()
 
     def _handle_playing_click(self, x, y):
         """处理游戏中的点击"""
@@ -1092,20 +934,17 @@ class EventHandler:
         if self.game_manager.cart_manager.handle_cart_click(x, y):
             return  # 点击了小推车，直接返回
 
+        # 获取可用卡片，定位点击的工具栏控件
+        cards = self.game_manager.get_available_cards_for_current_state()
+        widget = self._get_playing_layout(cards).hit((x, y))
+
         # 检查设置按钮
-        settings_rect = pygame.Rect(SETTINGS_BUTTON_X, SETTINGS_BUTTON_Y,
-                                    SETTINGS_BUTTON_WIDTH, SETTINGS_BUTTON_HEIGHT)
-        if settings_rect.collidepoint(x, y):
+        if widget == "settings":
             self.game_manager.state_manager.toggle_settings()
             return
 
-        # 获取可用卡片
-        cards = self.game_manager.get_available_cards_for_current_state()
-
         # 检测是否点击铲子
-        shovel_rect = pygame.Rect(self.game_manager.shovel["x"], self.game_manager.shovel["y"],
-                                  self.game_manager.shovel["width"], self.game_manager.shovel["height"])
-        if shovel_rect.collidepoint(x, y):
+        if widget == "shovel":
             # 如果之前选中的是锤子，清除锤子跟随状态
             if self.game_manager.game["selected"] == "hammer":
                 self.game_manager.state_manager.clear_hammer_cursor()
@@ -1113,36 +952,27 @@ class EventHandler:
             self.game_manager.game["selected"] = "shovel"
             return
 
-        # 检测是否点击锤子
-        if (hasattr(self.game_manager, 'shop_manager') and
-                self.game_manager.shop_manager.has_hammer()):
-
-            hammer_rect = pygame.Rect(HAMMER_X, HAMMER_Y, HAMMER_WIDTH, HAMMER_HEIGHT)
-            if hammer_rect.collidepoint(x, y):
-                # 检查锤子是否在冷却中
-                hammer_cooldown = self.game_manager.game.get("hammer_cooldown", 0)
-                if hammer_cooldown <= 0:
-                    # 清除之前可能存在的锤子跟随状态
-                    self.game_manager.state_manager.clear_hammer_cursor()
+        # 检测是否点击锤子（只有购买了锤子才会注册该控件）
+        if widget == "hammer":
+            # 检查锤子是否在冷却中
+            hammer_cooldown = self.game_manager.game.get("hammer_cooldown", 0)
+            if hammer_cooldown <= 0:
+                # 清除之前可能存在的锤子跟随状态
+                self.game_manager.state_manager.clear_hammer_cursor()
 
-                    self.game_manager.game["selected"] = "hammer"
+                self.game_manager.game["selected"] = "hammer"
 
-                    # 启用锤子跟随鼠标（在下次鼠标移动时会设置位置）
-                    return
-                else:
-                    # 锤子在冷却中，播放提示音或显示提示
-                    print(f"锤子冷却中，还需要 {int(hammer_cooldown / 60) + 1} 秒")
-                    return
+                # 启用锤子跟随鼠标（在下次鼠标移动时会设置位置）
+                return
+            else:
+                # 锤子在冷却中，播放提示音或显示提示
+                print(f"锤子冷却中，还需要 {int(hammer_cooldown / 60) + 1} 秒")
+                return
 
         # 检测是否点击卡槽（使用动态卡片列表）
         clicked_card = None
-        for i, card in enumerate(cards):
-            card_x = CARD_START_X + i * CARD_WIDTH
-            card_rect = pygame.Rect(card_x, CARD_Y, CARD_WIDTH, CARD_HEIGHT)
-            if card_rect.collidepoint(x, y):
-                if self._can_select_card(card):
-                    clicked_card = card["type"]
-                    break
+        if isinstance(widget, tuple) and self._can_select_card(cards[widget[1]]):
+            clicked_card = cards[widget[1]]["type"]
 
         if clicked_card:
             # 如果之前选中的是锤子，清除锤子跟随状态
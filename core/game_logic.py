@@ -8,11 +8,13 @@ import random
 
 from .constants import *
 from performance import SpatialGrid
+from .area_query import ZombieAreaIndex
 from plants import Plant
 from zombies import *
 import bullets
 from .cards_manager import get_available_cards_new, cards_manager
-from zombies import create_zombie
+from . import sim_clock
+from zombies import create_zombie, release_zombie
 import bullets
 from ui.portal_manager import PortalManager
 
@@ -60,11 +62,13 @@ def update_bullets(game, level_manager, level_settings=None, sounds=None):
     spatial_grid = SpatialGrid(GRID_WIDTH, GRID_HEIGHT)
     for zombie in game["zombies"]:
         spatial_grid.add_zombie(zombie)
+    # 溅射等范围效果共用的查询索引（子弹更新过程中僵尸不会移动，首次查询时构建）
+    area_index = ZombieAreaIndex(game["zombies"])
 
     for bullet in game["bullets"][:]:
         # 更新子弹位置
-        if bullet.update(game["zombies"]):
-            game["bullets"].remove(bullet)
+        if bullet.update(game["zombies"], area_index):
+            remove_bullet(game, bullet)
             continue
 
         # 检测子弹击中僵尸
@@ -100,19 +104,18 @@ def update_bullets(game, level_manager, level_settings=None, sounds=None):
                             sounds["watermelon_hit"].play()
                             hit_sound_played = True
 
-                        splash_count = bullet.apply_splash_damage(game["zombies"])
+                        splash_count = bullet.apply_splash_damage(game["zombies"], area_index)
 
-                        for zombie in game["zombies"]:
-                            if (zombie.health <= 0 and not zombie.is_dying and
-                                    id(zombie) in bullet.splash_hit_zombies):
+                        for zombie in bullet.splash_targets:
+                            if zombie.health <= 0 and not zombie.is_dying:
                                 zombie.start_death_animation()
                 elif bullet.has_landed:
                     bullet.has_hit_target = True
-                    splash_count = bullet.apply_splash_damage(game["zombies"])
+                    splash_count = bullet.apply_splash_damage(game["zombies"], area_index)
 
         elif bullet.bullet_type == "spike":
-            # 尖刺子弹的处理逻辑
-            zombies_to_check = game["zombies"]
+            # 尖刺子弹的处理逻辑：只检查子弹所在格子附近的僵尸
+            zombies_to_check = bullet.collision_candidates(area_index)
 
             for zombie in zombies_to_check:
                 attack_result = bullet.attack_zombie(zombie, level_settings)
@@ -131,7 +134,7 @@ def update_bullets(game, level_manager, level_settings=None, sounds=None):
                     if zombie.health <= 0 and not zombie.is_dying:
                         zombie.start_death_animation()
 
-                    game["bullets"].remove(bullet)
+                    remove_bullet(game, bullet)
                     bullet_removed = True
                     break
 
@@ -145,7 +148,7 @@ def update_bullets(game, level_manager, level_settings=None, sounds=None):
                                 sounds["zombie_hit"].play()
                         hit_sound_played = True
 
-                    game["bullets"].remove(bullet)
+                    remove_bullet(game, bullet)
                     bullet_removed = True
                     break
 
@@ -185,7 +188,7 @@ def update_bullets(game, level_manager, level_settings=None, sounds=None):
                                 sounds["冻结"].play()
 
                     if not bullet.can_penetrate:
-                        game["bullets"].remove(bullet)
+                        remove_bullet(game, bullet)
                         bullet_removed = True
                     break
 
@@ -211,7 +214,7 @@ def update_bullets(game, level_manager, level_settings=None, sounds=None):
                         zombie.start_death_animation()
 
                     if not bullet.can_penetrate:
-                        game["bullets"].remove(bullet)
+                        remove_bullet(game, bullet)
                         bullet_removed = True
                         break
                     break
@@ -227,7 +230,7 @@ def update_bullets(game, level_manager, level_settings=None, sounds=None):
                         hit_sound_played = True
 
                     if not bullet.can_penetrate:
-                        game["bullets"].remove(bullet)
+                        remove_bullet(game, bullet)
                         bullet_removed = True
                     break
 
@@ -241,25 +244,177 @@ def update_bullets(game, level_manager, level_settings=None, sounds=None):
         # 检查西瓜子弹是否应该被移除
         if (bullet.bullet_type == "melon" and bullet.has_hit_target and
                 not bullet.show_explosion and bullet in game["bullets"]):
-            game["bullets"].remove(bullet)
+            remove_bullet(game, bullet)
 
 
-def update_plant_shooting(game, level_manager, sounds=None):
-    """更新植物射击逻辑 - 支持传送门穿越"""
+class PlantShootingContext:
+    """一帧内植物开火共用的数据"""
+
+    def __init__(self, game, level_manager, sounds=None):
+        self.game = game
+        self.level_manager = level_manager
+        self.sounds = sounds
+        self.portal_manager = game.get("portal_manager")
+        # 闪电跳跃等范围查询共用的僵尸索引（植物攻击不会移动僵尸，首次查询时构建）
+        self.area_index = ZombieAreaIndex(game["zombies"])
+
+    def play_sound(self, name):
+        """播放音效，未加载时忽略"""
+        if name and self.sounds and self.sounds.get(name):
+            self.sounds[name].play()
+
+    def add_bullet(self, bullet):
+        if bullet:
+            self.game["bullets"].append(bullet)
+
+
+# ==================== 植物行为注册表 ====================
+# 植物类通过 targeting / fire_action / fire_sound 声明行为，这里按名称注册具体实现
+# 目标检测：(植物, 僵尸列表, 上下文) -> 是否有目标
+# 开火动作：(植物, 上下文) -> 是否真正开火（开火后重置射击计时器）
+
+def _target_row_ahead(plant, zombies, context):
+    """本行前方有僵尸（考虑传送门）"""
+    return has_zombie_in_row_ahead_with_portal(plant, zombies, context.portal_manager)
+
 
-    # 获取传送门管理器
-    portal_manager = game.get("portal_manager")
+def _target_any_zombie(plant, zombies, context):
+    """地图上有任意僵尸"""
+    return len(zombies) > 0
 
-    def has_zombie_in_row_ahead(plant, zombies):
-        """检测植物前方是否有僵尸，考虑传送门逻辑"""
-        return has_zombie_in_row_ahead_with_portal(plant, zombies, portal_manager)
 
-    def has_any_zombie_on_map(zombies):
-        return len(zombies) > 0
+def _fire_pea(plant, context):
+    """豌豆射手：普通子弹，支持关卡穿透和传送门穿越"""
+    level_manager = context.level_manager
+    can_penetrate = level_manager.has_bullet_penetration()
+    random_penetration_prob = level_manager.get_random_penetration_prob()
+    if random_penetration_prob > 0 and random.random() < random_penetration_prob:
+        can_penetrate = True
 
-    def find_nearest_zombie_in_row(plant, zombies):
-        """寻找行内最近的僵尸，考虑传送门逻辑"""
-        return find_nearest_zombie_with_portal(plant, zombies, portal_manager)
+    context.add_bullet(bullets.create_bullet(
+        bullet_type="pea",
+        row=plant.row,
+        col=plant.col + 0.5,
+        can_penetrate=can_penetrate,
+        constants=get_constants(),
+        images=None,
+        portal_manager=context.portal_manager,
+        source_plant_row=plant.row,
+        source_plant_col=plant.col
+    ))
+    return True
+
+
+def _fire_melon(plant, context):
+    """西瓜投手：西瓜子弹，考虑传送门目标"""
+    target_col = get_bullet_target_col_with_portal(plant, context.game["zombies"], context.portal_manager)
+    context.add_bullet(bullets.create_bullet(
+        bullet_type="melon",
+        row=plant.row,
+        col=plant.col + 0.5,
+        target_col=target_col,
+        constants=get_constants(),
+        images=None
+    ))
+    return True
+
+
+def _fire_spike(plant, context):
+    """猫尾草：追踪最近僵尸的尖刺子弹"""
+    target_zombie = plant.find_nearest_zombie(context.game["zombies"])
+    if target_zombie is None:
+        return False
+
+    context.add_bullet(bullets.create_bullet(
+        bullet_type="spike",
+        row=plant.row,
+        col=plant.col + 0.5,
+        target_zombie=target_zombie,
+        constants=get_constants(),
+        images=None
+    ))
+    return True
+
+
+def _fire_dandelion_seeds(plant, context):
+    """蒲公英：释放飘散种子"""
+    game = context.game
+    seeds = plant.create_dandelion_seeds(game["zombies"])
+    if "dandelion_seeds" not in game:
+        game["dandelion_seeds"] = []
+    game["dandelion_seeds"].extend(seeds)
+
+    context.play_sound(plant.fire_sound)
+    return True
+
+
+def _fire_lightning_chain(plant, context):
+    """闪电花：链式攻击，击中僵尸时才播放音效"""
+    zombies_hit = plant.perform_lightning_attack(context.game["zombies"], context.sounds, context.area_index)
+    if zombies_hit > 0:
+        context.play_sound(plant.fire_sound)
+    return True
+
+
+def _fire_ice(plant, context):
+    """寒冰仙人掌：寒冰穿透子弹，支持传送门穿越"""
+    context.add_bullet(bullets.create_bullet(
+        bullet_type="ice",
+        row=plant.row,
+        col=plant.col + 0.5,
+        can_penetrate=True,
+        constants=get_constants(),
+        images=None,
+        portal_manager=context.portal_manager,
+        source_plant_row=plant.row,
+        source_plant_col=plant.col
+    ))
+
+    context.play_sound(plant.fire_sound)
+    return True
+
+
+TARGETING_QUERIES = {
+    "row_ahead": _target_row_ahead,
+    "any_zombie": _target_any_zombie,
+}
+
+FIRE_ACTIONS = {
+    "pea": _fire_pea,
+    "melon": _fire_melon,
+    "spike": _fire_spike,
+    "dandelion_seeds": _fire_dandelion_seeds,
+    "lightning_chain": _fire_lightning_chain,
+    "ice": _fire_ice,
+}
+
+# 植物类 -> (目标检测, 开火动作)，非射击植物为 None
+_plant_behavior_cache = {}
+
+
+def get_plant_behavior(plant_class):
+    """按植物类解析行为，结果按类缓存"""
+    if plant_class in _plant_behavior_cache:
+        return _plant_behavior_cache[plant_class]
+
+    behavior = None
+    if plant_class.targeting is not None and plant_class.fire_action is not None:
+        targeting = TARGETING_QUERIES.get(plant_class.targeting)
+        fire_action = FIRE_ACTIONS.get(plant_class.fire_action)
+        if targeting and fire_action:
+            behavior = (targeting, fire_action)
+        else:
+            print(f"植物行为未注册: {plant_class.__name__} "
+                  f"({plant_class.targeting}, {plant_class.fire_action})")
+
+    _plant_behavior_cache[plant_class] = behavior
+    return behavior
+
+
+def update_plant_shooting(game, level_manager, sounds=None):
+    """更新植物状态和射击逻辑 - 按植物类声明的行为分派，支持传送门穿越"""
+    context = PlantShootingContext(game, level_manager, sounds)
+    zombies = game["zombies"]
 
     for plant in game["plants"]:
         update_result = plant.update()
@@ -268,157 +423,52 @@ def update_plant_shooting(game, level_manager, sounds=None):
         if isinstance(update_result, int) and update_result > 0:
             game["sun"] = add_sun_safely(game["sun"], update_result)
 
+        # 樱桃炸弹、黄瓜的爆炸音效
+        if plant.explosion_sound and plant.should_play_explosion_sound():
+            context.play_sound(plant.explosion_sound)
+            plant.mark_sound_played()
+
+        behavior = get_plant_behavior(type(plant))
+        if behavior is None:
+            continue
+
+        targeting, fire_action = behavior
+
         # 检测是否有新僵尸波次出现
-        if plant.plant_type in ["shooter", "melon_pult", "cattail", "dandelion", "lightning_flower", "ice_cactus"]:
-            if plant.plant_type == "cattail":
-                has_target = has_any_zombie_on_map(game["zombies"])
-            elif plant.plant_type in ["dandelion", "lightning_flower"]:
-                has_target = has_any_zombie_on_map(game["zombies"])
-            elif plant.plant_type == "ice_cactus":
-                has_target = has_zombie_in_row_ahead(plant, game["zombies"])
-            else:
-                has_target = has_zombie_in_row_ahead(plant, game["zombies"])
-            plant.check_for_new_wave(has_target)
+        has_target = targeting(plant, zombies, context)
+        plant.check_for_new_wave(has_target)
 
         # 射击逻辑
-        if plant.can_shoot():
-            should_shoot = False
-            target_zombie = None
-
-            if plant.plant_type == "cattail":
-                if has_any_zombie_on_map(game["zombies"]):
-                    target_zombie = plant.find_nearest_zombie(game["zombies"])
-                    should_shoot = target_zombie is not None
-            elif plant.plant_type in ["dandelion", "lightning_flower"]:
-                if has_any_zombie_on_map(game["zombies"]):
-                    should_shoot = True
-            elif plant.plant_type in ["shooter", "melon_pult"]:
-                should_shoot = has_zombie_in_row_ahead(plant, game["zombies"])
-            elif plant.plant_type == "ice_cactus":
-                should_shoot = has_zombie_in_row_ahead(plant, game["zombies"])
-
-            if should_shoot:
-                bullet = None
-
-                # 使用 bullets.create_bullet 工厂函数，修复：直接传递传送门参数
-                if plant.plant_type == "melon_pult":
-                    # 西瓜投手：创建西瓜子弹，考虑传送门目标
-                    target_col = get_bullet_target_col_with_portal(plant, game["zombies"], portal_manager)
-
-                    bullet = bullets.create_bullet(
-                        bullet_type="melon",
-                        row=plant.row,
-                        col=plant.col + 0.5,
-                        target_col=target_col,
-                        constants=get_constants(),
-                        images=None
-                    )
-
-                elif plant.plant_type == "cattail":
-                    # 猫尾草：创建追踪尖刺子弹
-                    bullet = bullets.create_bullet(
-                        bullet_type="spike",
-                        row=plant.row,
-                        col=plant.col + 0.5,
-                        target_zombie=target_zombie,
-                        constants=get_constants(),
-                        images=None
-                    )
-
-                elif plant.plant_type == "dandelion":
-                    # 蒲公英：创建飘散种子（特殊处理）
-                    seeds = plant.create_dandelion_seeds(game["zombies"])
-                    if "dandelion_seeds" not in game:
-                        game["dandelion_seeds"] = []
-                    game["dandelion_seeds"].extend(seeds)
-
-                    if sounds and sounds.get("dandelion_shoot"):
-                        sounds["dandelion_shoot"].play()
-
-                elif plant.plant_type == "lightning_flower":
-                    # 闪电花：执行链式攻击
-                    zombies_hit = plant.perform_lightning_attack(game["zombies"], sounds)
-                    if zombies_hit > 0:
-                        if sounds and sounds.get("lightning_flower"):
-                            sounds["lightning_flower"].play()
-
-                elif plant.plant_type == "ice_cactus":
-                    # 寒冰仙人掌：创建寒冰穿透子弹，支持传送门穿越
-                    bullet = bullets.create_bullet(
-                        bullet_type="ice",
-                        row=plant.row,
-                        col=plant.col + 0.5,
-                        can_penetrate=True,
-                        constants=get_constants(),
-                        images=None,
-                        portal_manager=portal_manager,
-                        source_plant_row=plant.row,
-                        source_plant_col=plant.col
-                    )
-
-                    if sounds and sounds.get("ice_cactus_shoot"):
-                        sounds["ice_cactus_shoot"].play()
-
-                else:
-                    # 豌豆射手：创建普通子弹，支持传送门穿越
-                    can_penetrate = level_manager.has_bullet_penetration()
-                    random_penetration_prob = level_manager.get_random_penetration_prob()
-                    if random_penetration_prob > 0 and random.random() < random_penetration_prob:
-                        can_penetrate = True
-
-                    bullet = bullets.create_bullet(
-                        bullet_type="pea",
-                        row=plant.row,
-                        col=plant.col + 0.5,
-                        can_penetrate=can_penetrate,
-                        constants=get_constants(),
-                        images=None,
-                        portal_manager=portal_manager,
-                        source_plant_row=plant.row,
-                        source_plant_col=plant.col
-                    )
-
-                # 将子弹添加到游戏状态
-                if bullet:
-                    game["bullets"].append(bullet)
-
-                plant.reset_shoot_timer()
+        if has_target and plant.can_shoot() and fire_action(plant, context):
+            plant.reset_shoot_timer()
 
 def update_dandelion_seeds(game, level_manager, level_settings=None, sounds=None):
     """更新蒲公英种子状态和碰撞检测 - 使用 bullets 模块"""
     if "dandelion_seeds" not in game:
         game["dandelion_seeds"] = []
         return
+    if not game["dandelion_seeds"]:
+        return
 
-    for seed in game["dandelion_seeds"][:]:
-        # 更新种子位置
-        if seed.update(game["zombies"]):
-            game["dandelion_seeds"].remove(seed)
-            continue
-
-        # 检测种子击中僵尸
-        hit_any_zombie = False
-        for zombie in game["zombies"][:]:
-            if seed.attack_zombie(zombie):
-                hit_any_zombie = True
-
-                # 播放击中音效
-                if sounds:
-                    if zombie.has_armor and zombie.armor_health > 0:
-                        if sounds.get("armor_hit"):
-                            sounds["armor_hit"].play()
-                    else:
-                        if sounds.get("zombie_hit"):
-                            sounds["zombie_hit"].play()
+    def on_seed_hit(seed, zombie):
+        # 播放击中音效
+        if sounds:
+            if zombie.has_armor and zombie.armor_health > 0:
+                if sounds.get("armor_hit"):
+                    sounds["armor_hit"].play()
+            else:
+                if sounds.get("zombie_hit"):
+                    sounds["zombie_hit"].play()
 
-                # 检查僵尸是否需要开始死亡动画
-                if zombie.health <= 0 and not zombie.is_dying:
-                    zombie.start_death_animation()
+        # 检查僵尸是否需要开始死亡动画
+        if zombie.health <= 0 and not zombie.is_dying:
+            zombie.start_death_animation()
 
-                # 种子击中后移除
-                if seed in game["dandelion_seeds"]:
-                    game["dandelion_seeds"].remove(seed)
-                break
+    # 所有种子共用一个僵尸范围索引：存活判断 O(1)，命中只检查所在格子附近的僵尸
+    area_index = ZombieAreaIndex(game["zombies"])
+    # 过期和击中的种子一次性移除
+    game["dandelion_seeds"][:] = bullets.update_seed_batch(
+        game["dandelion_seeds"], game["zombies"], area_index, on_seed_hit)
 
 def update_hammer_cooldown(game):
     """更新锤子冷却时间"""
@@ -450,11 +500,7 @@ def handle_plant_placement(game, cards, x, y, level_manager, level_settings=None
                 return False
 
         # 找到该位置的植物（如有）
-        target_plant = None
-        for p in game["plants"]:
-            if p.row == row and p.col == col:
-                target_plant = p
-                break
+        target_plant = game["plants"].get(row, col)
 
         # 铲子模式：移除植物
         if game["selected"] == "shovel" and target_plant:
@@ -482,30 +528,12 @@ def handle_plant_placement(game, cards, x, y, level_manager, level_settings=None
 
                 # 只检查同一行的僵尸
                 if zombie_row == row:
-                    # 计算僵尸的实际占用范围
-                    zombie_size = getattr(zombie, 'size_multiplier', 1.0)  # 获取僵尸大小倍数
-                    zombie_left = zombie.col  # 僵尸左边界
-                    zombie_right = zombie.col + zombie_size  # 僵尸右边界
-                    zombie_center = zombie.col + zombie_size / 2  # 僵尸中心点
-
-                    # 格子的范围
-                    grid_left = col
-                    grid_right = col + 1
-
-                    # 计算重叠范围
-                    overlap_left = max(zombie_left, grid_left)
-                    overlap_right = min(zombie_right, grid_right)
-                    overlap_length = max(0, overlap_right - overlap_left)
-
-                    # 判断条件：僵尸的四分之一以上在格子内，或者僵尸中心在格子内
-                    zombie_quarter_size = zombie_size / 4
-                    is_quarter_inside = overlap_length >= zombie_quarter_size
-                    is_center_inside = grid_left <= zombie_center <= grid_right
-
                     # 如果满足任一条件，则杀死僵尸
-                    if is_quarter_inside or is_center_inside:
+                    if hammer_hits_zombie(zombie, col):
                         # 杀死僵尸
                         game["zombies"].remove(zombie)
+                        forget_zombie(game, zombie)
+                        release_zombie(zombie)
                         zombies_killed += 1
 
                         # 更新击杀计数器（只在非波次模式下计算）
@@ -743,71 +771,42 @@ def update_zombie_portal_interaction(game):
                 if success:
                     pass
 
-def spawn_zombie_wave_fixed(game_state, first_wave=False, zombies_per_row=None, sounds=None):
-    """修复后的生成僵尸波次函数，准确计算僵尸数量并使用关卡配置 - 更新：使用特性管理系统"""
-    # 第一波僵尸播放预警音效
-    if first_wave and sounds and sounds.get("wave_warning"):
-        sounds["wave_warning"].play()  # 普通播放，不暂停背景音乐
-
-    if zombies_per_row is None:
-        zombies_per_row = [random.randint(3, 4) for _ in range(GRID_HEIGHT)]
-
-    # 获取关卡管理器
-    level_manager = game_state.get("level_manager")
-    if not level_manager:
-        # 如果没有关卡管理器，使用默认值
-        armor_prob = 0.5
-        fast_multiplier = 2.5
-        all_fast = False
-    else:
-        # 从关卡管理器获取配置 - 使用特性管理系统
-        armor_prob = level_manager.get_zombie_armor_prob()
-        fast_multiplier = level_manager.get_fast_zombie_multiplier()
-        all_fast = level_manager.has_all_fast_zombies()  # 检查是否全员快速
-
-    for row in range(GRID_HEIGHT):
-        # 每行生成指定数量的僵尸
-        zombie_count = zombies_per_row[row]
-        # 如果是全员快速模式，所有僵尸都是快速的；否则随机选择一个位置作为快速僵尸
-        if all_fast:
-            fast_zombie_indices = list(range(zombie_count))  # 所有僵尸都快速
-        else:
-            fast_zombie_indices = [random.randint(0, zombie_count - 1)] if zombie_count > 0 else []
-
-        for i in range(zombie_count):
-            # 每个僵尸之间有间隔，避免重叠
-            spawn_delay = i * 30  # 每个僵尸间隔30帧生成
-
-            # 使用关卡配置的铁甲概率（而不是硬编码50%）
-            has_armor = random.random() < armor_prob
-
-            # 当前是否为快速僵尸
-            is_fast = (i in fast_zombie_indices)
-
-            # 确定僵尸类型 - 新增：第13关及以后有概率生成巨人僵尸
-            zombie_type = "normal"
-            if level_manager and level_manager.current_level >= 13:
-                # 10%概率生成巨人僵尸
-                if random.random() < 0.1:
-                    zombie_type = "giant"
-
-            # 创建僵尸，传入波次模式和是否为快速僵尸参数
-            zombie = create_zombie(
-                row=row,
-                zombie_type=zombie_type,
-                has_armor_prob=1.0 if has_armor else 0.0,
-                is_fast=is_fast,
-                wave_mode=True,
-                fast_multiplier=fast_multiplier,
-                constants=get_constants(),
-                sounds=sounds,
-                images=None,
-                level_settings=None
-            )
-
-            # 稍微错开一点位置，避免完全重叠
-            zombie.col += i * 0.3
-            game_state["zombies"].append(zombie)
+def hammer_hits_zombie(zombie, col):
+    """锤子敲击第 col 列格子时是否打中该僵尸（调用方负责判断同一行）
+    判断条件：僵尸的四分之一以上在格子内，或者僵尸中心在格子内"""
+    # 计算僵尸的实际占用范围
+    zombie_size = zombie.size_multiplier  # 获取僵尸大小倍数
+    zombie_left = zombie.col  # 僵尸左边界
+    zombie_right = zombie.col + zombie_size  # 僵尸右边界
+    zombie_center = zombie.col + zombie_size / 2  # 僵尸中心点
+
+    # 格子的范围
+    grid_left = col
+    grid_right = col + 1
+
+    # 计算重叠范围
+    overlap_left = max(zombie_left, grid_left)
+    overlap_right = min(zombie_right, grid_right)
+    overlap_length = max(0, overlap_right - overlap_left)
+
+    is_quarter_inside = overlap_length >= zombie_size / 4
+    is_center_inside = grid_left <= zombie_center <= grid_right
+    return is_quarter_inside or is_center_inside
+
+
+def forget_zombie(game, zombie):
+    """僵尸移出场地后清除以 id(僵尸) 记录的计时器和子弹命中记录，复用的僵尸对象不会继承旧状态"""
+    zombie_id = id(zombie)
+    game.get("zombie_stun_timers", {}).pop(zombie_id, None)
+    game.get("cucumber_spray_timers", {}).pop(zombie_id, None)
+    for bullet in game["bullets"]:
+        bullet.forget_zombie(zombie_id)
+
+
+def remove_bullet(game, bullet):
+    """把子弹移出场地并交还对象池"""
+    game["bullets"].remove(bullet)
+    bullets.release_bullet(bullet)
 
 
 def update_card_cooldowns(game):
@@ -849,9 +848,9 @@ def handle_cucumber_fullscreen_explosion(game, cucumber_explosion_data, sounds=N
         zombie_id = id(zombie)
 
         # 检查僵尸是否已经冰冻，如果是则保存冰冻状态
-        was_frozen = hasattr(zombie, 'is_frozen') and zombie.is_frozen
-        original_speed = getattr(zombie, 'original_speed', None)
-        freeze_start_time = getattr(zombie, 'freeze_start_time', None)
+        was_frozen = zombie.is_frozen
+        original_speed = zombie.original_speed
+        freeze_start_time = zombie.freeze_start_time
 
         # 1. 应用眩晕效果（5秒）
         game["zombie_stun_timers"][zombie_id] = stun_duration
@@ -861,8 +860,7 @@ def handle_cucumber_fullscreen_explosion(game, cucumber_explosion_data, sounds=N
 
         # 3. 50%概率在喷射后死亡（延迟执行）
         if random.random() < death_probability:
-            if not hasattr(zombie, 'cucumber_marked_for_death'):
-                zombie.cucumber_marked_for_death = True
+            zombie.cucumber_marked_for_death = True
 
         # 恢复冰冻状态（如果之前是冰冻的）
         if was_frozen:
@@ -882,10 +880,9 @@ def handle_cucumber_fullscreen_explosion(game, cucumber_explosion_data, sounds=N
     if "cucumber_plant_healing" not in game:
         game["cucumber_plant_healing"] = {}
 
-    # 记录需要持续治疗的植物位置（所有植物）
+    # 记录需要持续治疗的植物格子（所有植物），键为 (行, 列)
     for plant in game["plants"]:
-        plant_key = f"{plant.row}_{plant.col}"
-        game["cucumber_plant_healing"][plant_key] = spray_duration
+        game["cucumber_plant_healing"][(plant.row, plant.col)] = spray_duration
 
 
 def update_cucumber_effects(game, sounds=None):
@@ -911,27 +908,18 @@ def update_cucumber_effects(game, sounds=None):
         del game["zombie_stun_timers"][zombie_id]
 
     healing_to_remove = []
+    plant_board = game["plants"]
     for plant_key, timer in game["cucumber_plant_healing"].items():
         game["cucumber_plant_healing"][plant_key] = timer - 1
 
         # 每20帧治疗一次植物
         if timer % 20 == 0:
-            row_str, col_str = plant_key.split('_')
-            row, col = int(row_str), int(col_str)
-
-            # 查找并治疗植物
-            for plant in game["plants"]:
-                if plant.row == row and plant.col == col:
-                    if plant.health < plant.max_health:
-                        old_health = plant.health
-                        # 每次治疗50点血量
-                        heal_amount = min(50, plant.max_health - plant.health)
-                        plant.health = min(plant.max_health, plant.health + heal_amount)
-
-                        # 计算治疗进度
-                        health_percentage = (plant.health / plant.max_health) * 100
-
-                    break
+            # 查找并治疗该格子上的植物
+            plant = plant_board.get(*plant_key)
+            if plant is not None and plant.health < plant.max_health:
+                # 每次治疗50点血量
+                heal_amount = min(50, plant.max_health - plant.health)
+                plant.health = min(plant.max_health, plant.health + heal_amount)
 
         if game["cucumber_plant_healing"][plant_key] <= 0:
             healing_to_remove.append(plant_key)
@@ -954,7 +942,7 @@ def update_cucumber_effects(game, sounds=None):
             # 查找对应的僵尸对象
             for zombie in game["zombies"]:
                 if id(zombie) == zombie_id:
-                    if hasattr(zombie, 'cucumber_marked_for_death') and zombie.cucumber_marked_for_death:
+                    if zombie.cucumber_marked_for_death:
                         zombies_to_remove.append(zombie)
                     break
 
@@ -966,9 +954,10 @@ def update_cucumber_effects(game, sounds=None):
     for zombie in zombies_to_remove:
         if zombie in game["zombies"]:
             # 在移除僵尸前检查是否处于冰冻状态
-            was_frozen = hasattr(zombie, 'is_frozen') and zombie.is_frozen
+            was_frozen = zombie.is_frozen
 
             game["zombies"].remove(zombie)
+            forget_zombie(game, zombie)
 
             # 更新击杀计数器（只在非波次模式下计算）
             if not game.get("wave_mode", False):
@@ -1016,26 +1005,27 @@ def update_cucumber_effects(game, sounds=None):
                 if level_mgr:
                     level_mgr.zombie_defeated()
 
+            release_zombie(zombie)
+
 
 def update_freeze_effects(game):
     """更新所有僵尸的冰冻效果 """
-    current_time = pygame.time.get_ticks()
+    current_time = sim_clock.get_ticks()
     freeze_duration = 5000  # 5秒 = 5000毫秒
 
     for zombie in game["zombies"]:
-        if hasattr(zombie, 'is_frozen') and zombie.is_frozen:
+        if zombie.is_frozen:
             # 检查冰冻是否过期
             time_frozen = current_time - zombie.freeze_start_time
 
             if time_frozen >= freeze_duration:
                 # 解除冰冻
                 zombie.is_frozen = False
-                if hasattr(zombie, 'original_speed'):
+                if zombie.original_speed is not None:
                     zombie.speed = zombie.original_speed
                     print(f"僵尸冰冻效果结束，速度恢复到 {zombie.speed}")
-                    del zombie.original_speed
-                if hasattr(zombie, 'freeze_start_time'):
-                    del zombie.freeze_start_time
+                    zombie.original_speed = None
+                zombie.freeze_start_time = None
 
 
 
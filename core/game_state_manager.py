@@ -4,6 +4,8 @@
 import pygame
 from .constants import *
 from .level_manager import LevelManager
+from .plant_board import PlantBoard
+from .wave_planner import WavePlanner
 
 
 class GameStateManager:
@@ -98,24 +100,26 @@ class GameStateManager:
         """获取植物预览状态"""
         return self.plant_preview.copy() if self.plant_preview['enabled'] else None
 
-    def reset_game(self, keep_level=None):
+    def reset_game(self, keep_level=None, level_manager=None):
         """
         重置游戏状态，修改为使用新的配置系统和特性管理器
         更新：完全集成特性管理系统，修复传送门系统重置问题
+        level_manager 为关卡预加载已经准备好（已开始对应关卡）的关卡管理器
         """
-        # 创建关卡管理器（现在从配置文件加载）
-        level_manager = LevelManager("database/levels.json")  # 指定配置文件路径
-        level_manager.enable_hot_reload(True)  # 默认启用热重载
+        if level_manager is None:
+            # 创建关卡管理器（现在从配置文件加载）
+            level_manager = LevelManager("database/levels.json")  # 指定配置文件路径
 
-        # 如果指定了保持关卡，则设置对应关卡
-        if keep_level is not None:
-            level_manager.start_level(keep_level)
+            # 如果指定了保持关卡，则设置对应关卡
+            if keep_level is not None:
+                level_manager.start_level(keep_level)
+        level_manager.enable_hot_reload(True)  # 默认启用热重载
 
         # 根据关卡配置设置初始阳光 - 使用特性管理器
         initial_sun = level_manager.get_initial_sun()
 
         new_game = {
-            "plants": [], "zombies": [], "bullets": [],
+            "plants": PlantBoard(), "zombies": [], "bullets": [],
             "zombie_timer": 0, "sun": initial_sun, "game_over": False, "selected": None,
             "wave_mode": False,
             "wave_timer": 0,
@@ -138,6 +142,7 @@ class GameStateManager:
             "cucumber_spray_timers": {},
             "cucumber_plant_healing": {},
             "dandelion_seeds": [],
+            "wave_planner": WavePlanner(),
             "_pending_coins": 0
         }
 
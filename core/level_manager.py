@@ -3,6 +3,7 @@ import os
 from datetime import datetime
 from animation import Trophy
 from .features_manager import features_manager
+from .config_watcher import get_config_watcher, compile_level_config
 
 
 class LevelConfigManager:
@@ -11,22 +12,36 @@ class LevelConfigManager:
     def __init__(self, config_path="database/levels.json"):
         self.config_path = config_path
         self.config_data = None
+        self.compiled_config = None
+        self.config_version = 0
         self.last_modified = None
-        self.load_config()
+
+        # 同一配置文件的监听器全局共享，已有编译好的配置时直接复用，避免重复读盘
+        self.watcher = get_config_watcher(config_path)
+        snapshot = self.watcher.get_snapshot()
+        if snapshot:
+            self._apply_snapshot(snapshot)
+        else:
+            self.load_config()
+
+    def _apply_snapshot(self, snapshot):
+        """换入已编译的配置快照"""
+        self.compiled_config = snapshot
+        self.config_data = snapshot.config_data
+        self.config_version = snapshot.version
+        self.last_modified = snapshot.mtime
 
     def load_config(self):
         """从JSON文件加载配置"""
-        try:
-            if os.path.exists(self.config_path):
-                self.last_modified = os.path.getmtime(self.config_path)
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    self.config_data = json.load(f)
-
-            else:
-                print(f"配置文件不存在: {self.config_path}，使用默认配置")
-                self.create_default_config()
-        except Exception as e:
-            print(f"加载配置文件失败: {e}")
+        if not os.path.exists(self.config_path):
+            print(f"配置文件不存在: {self.config_path}，使用默认配置")
+            self.create_default_config()
+            return
+
+        snapshot = self.watcher.load_now()
+        if snapshot:
+            self._apply_snapshot(snapshot)
+        else:
             self.create_default_config()
 
     def create_default_config(self):
@@ -52,42 +67,30 @@ class LevelConfigManager:
                 }
             }
         }
+        self.compiled_config = compile_level_config(self.config_data, self.config_version)
 
-    def check_for_updates(self):
-        """检查配置文件是否被修改"""
-        if not os.path.exists(self.config_path):
-            return False
+    def start_watching(self):
+        """启动后台文件监听"""
+        self.watcher.start()
 
-        current_modified = os.path.getmtime(self.config_path)
-        if self.last_modified != current_modified:
-            return True
-        return False
+    def check_for_updates(self):
+        """检查后台是否已编译好更新的配置（只比较版本号，不访问磁盘）"""
+        snapshot = self.watcher.get_snapshot()
+        return snapshot is not None and snapshot.version != self.config_version
 
     def reload_if_changed(self):
-        """如果文件被修改则重新加载"""
+        """如果后台已准备好新配置则换入"""
         if self.check_for_updates():
-            print("检测到配置文件更新，重新加载...")
-            self.load_config()
+            self._apply_snapshot(self.watcher.get_snapshot())
+            print("检测到配置文件更新，已换入新配置")
             return True
         return False
 
     def get_level_config(self, level_num):
         """获取指定关卡的配置"""
-        if not self.config_data:
+        if not self.compiled_config:
             return None
-
-        level_key = str(level_num)
-        levels = self.config_data.get("levels", {})
-        default_config = self.config_data.get("default_config", {})
-
-        if level_key in levels:
-            config = default_config.copy()
-            config.update(levels[level_key])
-            return config
-        else:
-            config = default_config.copy()
-            config["name"] = f"第{level_num}关：未知挑战"
-            return config
+        return self.compiled_config.get_level_config(level_num)
 
     def get_all_levels(self):
         """获取所有关卡列表"""
@@ -97,9 +100,8 @@ class LevelConfigManager:
 
     def get_max_level(self):
         """获取最大关卡数"""
-        levels = self.get_all_levels()
-        if levels:
-            return max(int(k) for k in levels.keys())
+        if self.compiled_config:
+            return self.compiled_config.max_level
         return 1
 
 
@@ -124,10 +126,8 @@ class LevelManager:
         # 配置管理器
         self.config_manager = LevelConfigManager(config_path)
 
-        # 热重载设置
+        # 热重载设置（文件监听在后台线程完成，这里每帧只比较版本号）
         self.hot_reload_enabled = True
-        self.last_reload_check = 0
-        self.reload_check_interval = 60
 
         # 新增：游戏数据库引用，用于获取全局设置
         self.game_db = game_db
@@ -136,21 +136,19 @@ class LevelManager:
         """启用或禁用热重载"""
         self.hot_reload_enabled = enabled
         if enabled:
+            self.config_manager.start_watching()
             print("关卡配置热重载已启用")
         else:
             pass
 
     def check_hot_reload(self):
-        """检查并执行热重载"""
+        """检查并执行热重载（在帧边界换入后台已编译好的配置）"""
         if not self.hot_reload_enabled:
             return False
 
-        self.last_reload_check += 1
-        if self.last_reload_check >= self.reload_check_interval:
-            self.last_reload_check = 0
-            if self.config_manager.reload_if_changed():
-                self.load_level_config(self.current_level)
-                return True
+        if self.config_manager.reload_if_changed():
+            self.load_level_config(self.current_level)
+            return True
         return False
 
     def start_level(self, level):
@@ -471,6 +469,7 @@ class LevelManager:
                 "last_modified": metadata.get("last_modified", "未知"),
                 "total_levels": len(self.config_manager.get_all_levels()),
                 "hot_reload": self.hot_reload_enabled,
+                "watch_backend": self.config_manager.watcher.backend or "未启动",
                 "current_features": self.level_features,
                 "active_global_settings": active_global_settings  # 新增
             }
@@ -0,0 +1,88 @@
+"""
+关卡预加载模块 - 点击关卡（或继续/重新开始）时就在后台线程准备下一关：
+创建关卡管理器并载入关卡配置、解析存档快照并重建植物/僵尸/子弹表，
+过渡动画渐暗结束时主线程直接取用准备好的结果，不必在那一帧里全部做完
+后台线程不碰全局随机数、模拟时钟、数据库连接和界面状态，这些仍由主线程在换入时处理，
+因此预加载与否对局结果和回放都完全一致
+"""
+import threading
+
+from database.save_manager import decode_saved_game
+from .level_manager import LevelManager
+
+LEVEL_CONFIG_PATH = "database/levels.json"
+
+
+class PreparedLevel:
+    """准备好的关卡：关卡管理器（已开始对应关卡）和存档解析结果"""
+
+    def __init__(self, level_num, saved_data):
+        self.level_num = level_num
+        self.saved_data = saved_data
+        self.level_manager = None
+        self.decoded = None  # 新存档的 (snapshot, game)，新游戏、旧存档或解析失败时为空
+
+
+def prepare_level(level_num, saved_data, images=None, sounds=None):
+    """准备关卡（后台线程和主线程共用同一套流程）"""
+    prepared = PreparedLevel(level_num, saved_data)
+    level_manager = LevelManager(LEVEL_CONFIG_PATH)
+    level_manager.start_level(level_num)
+    prepared.level_manager = level_manager
+
+    if saved_data and "snapshot" in saved_data:
+        try:
+            prepared.decoded = decode_saved_game(saved_data, level_manager, images, sounds)
+        except Exception as e:
+            # 留给主线程按原流程恢复，失败时清除存档改开新局
+            print(f"预加载存档失败: {e}")
+    return prepared
+
+
+class _PrepareRequest:
+    """一次预加载请求，后台线程只把结果写进自己的请求，旧线程不会覆盖新请求的结果"""
+
+    def __init__(self, level_num, saved_data):
+        self.level_num = level_num
+        self.saved_data = saved_data
+        self.thread = None
+        self.result = None
+
+
+class LevelPreparer:
+    """在过渡动画期间于后台线程准备下一关，同一时间只保留最近一次请求"""
+
+    def __init__(self):
+        self._request = None
+
+    def start(self, level_num, saved_data, images=None, sounds=None):
+        """开始准备关卡（新请求会取代尚未取用的旧请求）"""
+        request = _PrepareRequest(level_num, saved_data)
+        request.thread = threading.Thread(
+            target=self._run, args=(request, images, sounds), name="LevelPreparer", daemon=True)
+        self._request = request
+        request.thread.start()
+
+    @staticmethod
+    def _run(request, images, sounds):
+        try:
+            request.result = prepare_level(request.level_num, request.saved_data, images, sounds)
+        except Exception as e:
+            print(f"预加载关卡失败: {e}")
+
+    def take(self, level_num, saved_data):
+        """取出为这次加载准备好的关卡，还没准备完就等它完成；没有匹配的结果时返回 None
+        无论是否匹配，取用后都清空当前请求"""
+        request = self._request
+        self.cancel()
+        if request is None or request.level_num != level_num or request.saved_data is not saved_data:
+            return None
+        request.thread.join()
+        prepared = request.result
+        if prepared is None or prepared.level_num != level_num or prepared.saved_data is not saved_data:
+            return None
+        return prepared
+
+    def cancel(self):
+        """丢弃当前请求（正在运行的线程结束后结果会被忽略）"""
+        self._request = None
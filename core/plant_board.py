@@ -0,0 +1,144 @@
+"""
+植物占位网格 - 按格子索引场上的植物
+PlantBoard 本身就是植物列表（保持原有的遍历顺序和列表操作），
+同时维护 行x列 的植物引用表和每行的占位位掩码，按格子查找植物是 O(1)
+"""
+import math
+
+from core.constants import GRID_WIDTH, GRID_HEIGHT
+
+
+class PlantBoard(list):
+    """植物列表 + 格子索引，append/remove 等操作会同步更新索引"""
+
+    def __init__(self, plants=(), rows=GRID_HEIGHT, cols=GRID_WIDTH):
+        super().__init__()
+        self.rows = rows
+        self.cols = cols
+        self._cells = [[None] * cols for _ in range(rows)]
+        self.row_masks = [0] * rows  # 每行的占位位掩码，第 col 位为 1 表示该格有植物
+        self.extend(plants)
+
+    # ---------- 索引维护 ----------
+
+    def _cell_of(self, plant):
+        """植物所在格子，超出战场范围时返回 None"""
+        row, col = int(plant.row), int(plant.col)
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return row, col
+        return None
+
+    def _index(self, plant):
+        cell = self._cell_of(plant)
+        if cell is None:
+            return
+        row, col = cell
+        # 同一格子有多棵植物时以先加入的为准，与原来按列表顺序查找的结果一致
+        if self._cells[row][col] is None:
+            self._cells[row][col] = plant
+            self.row_masks[row] |= 1 << col
+
+    def _unindex(self, plant):
+        cell = self._cell_of(plant)
+        if cell is None:
+            return
+        row, col = cell
+        if self._cells[row][col] is not plant:
+            return
+        self._cells[row][col] = None
+        self.row_masks[row] &= ~(1 << col)
+        # 极少数情况下同一格还有其他植物（如异常存档），按列表顺序补上
+        for other in self:
+            if other is not plant and self._cell_of(other) == cell:
+                self._index(other)
+                break
+
+    def rebuild(self):
+        """根据列表内容重建索引"""
+        self._cells = [[None] * self.cols for _ in range(self.rows)]
+        self.row_masks = [0] * self.rows
+        for plant in self:
+            self._index(plant)
+
+    # ---------- 列表操作 ----------
+
+    def append(self, plant):
+        super().append(plant)
+        self._index(plant)
+
+    def extend(self, plants):
+        for plant in plants:
+            self.append(plant)
+
+    def insert(self, index, plant):
+        super().insert(index, plant)
+        self.rebuild()
+
+    def remove(self, plant):
+        super().remove(plant)
+        self._unindex(plant)
+
+    def pop(self, index=-1):
+        plant = super().pop(index)
+        self._unindex(plant)
+        return plant
+
+    def clear(self):
+        super().clear()
+        self.rebuild()
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self.rebuild()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self.rebuild()
+
+    def __iadd__(self, plants):
+        self.extend(plants)
+        return self
+
+    # ---------- 查询 ----------
+
+    def get(self, row, col):
+        """返回格子上的植物，没有则为 None"""
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return self._cells[row][col]
+        return None
+
+    def is_occupied(self, row, col):
+        """格子上是否有植物"""
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return bool(self.row_masks[row] >> col & 1)
+        return False
+
+    def plant_near(self, row, col):
+        """返回与浮点列坐标距离小于半格的植物（僵尸啃咬判定）"""
+        if not 0 <= row < self.rows:
+            return None
+        cell_col = int(col + 0.5) if col >= -0.5 else -1
+        plant = self.get(row, cell_col)
+        if plant is not None and abs(col - plant.col) < 0.5:
+            return plant
+        return None
+
+    def first_in_span(self, row, left, right):
+        """返回该行与区间 (left, right) 重叠的植物中列表顺序最靠前的一棵（植物占 [col, col+1)），
+        与原来按列表顺序逐个检查的结果一致"""
+        if not 0 <= row < self.rows:
+            return None
+        mask = self.row_masks[row]
+        if not mask:
+            return None
+        start = max(0, math.floor(left))
+        end = min(self.cols, math.ceil(right))
+        cells = self._cells[row]
+        found = [cells[col] for col in range(start, end) if mask >> col & 1]
+        if len(found) <= 1:
+            return found[0] if found else None
+        # 跨过多个有植物的格子（巨人僵尸）时按列表顺序取第一棵
+        for plant in self:
+            if any(plant is candidate for candidate in found):
+                return plant
+        return None
@@ -0,0 +1,142 @@
+"""
+回放录制模块 - 记录一局游戏的随机种子、关卡配置快照和玩家输入
+输入以模拟帧号为时间戳，写成紧凑的二进制日志，回放时可以逐帧重现同样的负载
+"""
+import json
+import os
+import struct
+import time
+
+# 文件格式：文件头 + 元数据 JSON + 定长输入记录
+REPLAY_MAGIC = b"PVZR"
+REPLAY_VERSION = 1
+REPLAY_EXTENSION = ".pvzr"
+
+# magic, 版本, 随机种子, 模拟时钟帧数, 关卡号, 元数据长度
+_HEADER = struct.Struct("<4sHQIHI")
+# 模拟帧号, 输入类型, x, y
+_EVENT = struct.Struct("<IBff")
+
+# 输入类型
+INPUT_CLICK = 1  # 左键点击（游戏坐标）
+INPUT_RIGHT_CLICK = 2  # 右键取消选中
+INPUT_SPACE = 3  # 空格暂停/继续
+INPUT_END = 255  # 录制结束标记，帧号为最后一帧
+
+# 最多保留的回放文件数量
+MAX_REPLAY_FILES = 20
+# 录制时每隔多少逻辑帧记录一次状态摘要（见 core/snapshot.py），回放时用来发现不同步
+CHECKSUM_INTERVAL_TICKS = 300
+
+
+class ReplayLog:
+    """一份回放数据"""
+
+    def __init__(self, seed, level, start_clock_tick, metadata=None, events=None, end_tick=0):
+        self.seed = seed
+        self.level = level
+        self.start_clock_tick = start_clock_tick
+        self.metadata = metadata or {}
+        self.events = events if events is not None else []  # [(帧号, 输入类型, x, y)]
+        self.end_tick = end_tick
+
+    def write(self, path):
+        """写入二进制回放文件"""
+        meta_bytes = json.dumps(self.metadata, ensure_ascii=False).encode('utf-8')
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.seed,
+                                 self.start_clock_tick, self.level, len(meta_bytes)))
+            f.write(meta_bytes)
+            for tick, kind, x, y in self.events:
+                f.write(_EVENT.pack(tick, kind, x, y))
+            f.write(_EVENT.pack(self.end_tick, INPUT_END, 0.0, 0.0))
+
+    @classmethod
+    def read(cls, path):
+        """读取二进制回放文件"""
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        magic, version, seed, clock_tick, level, meta_len = _HEADER.unpack_from(data, 0)
+        if magic != REPLAY_MAGIC:
+            raise ValueError(f"不是有效的回放文件: {path}")
+        if version != REPLAY_VERSION:
+            raise ValueError(f"不支持的回放文件版本: {version}")
+
+        offset = _HEADER.size
+        metadata = json.loads(data[offset:offset + meta_len].decode('utf-8'))
+        offset += meta_len
+
+        events = []
+        end_tick = 0
+        for tick, kind, x, y in _EVENT.iter_unpack(data[offset:]):
+            if kind == INPUT_END:
+                end_tick = tick
+                break
+            events.append((tick, kind, x, y))
+
+        return cls(seed, level, clock_tick, metadata, events, end_tick)
+
+
+class ReplayRecorder:
+    """回放录制器，由 GameManager 持有，一局开始时启动，离开游戏时写盘"""
+
+    def __init__(self, directory="replays"):
+        self.directory = directory
+        self.log = None
+        self.last_saved_path = None
+
+    @property
+    def active(self):
+        """是否正在录制"""
+        return self.log is not None
+
+    def start(self, seed, level, start_clock_tick, metadata):
+        """开始录制新的一局"""
+        self.log = ReplayLog(seed, level, start_clock_tick, metadata)
+
+    def record(self, tick, kind, x=0.0, y=0.0):
+        """记录一条输入"""
+        if self.log is not None:
+            self.log.events.append((tick, kind, float(x), float(y)))
+
+    def record_checksum(self, tick, digest):
+        """记录某一帧的状态摘要，写在元数据的 checksums 中"""
+        if self.log is not None:
+            self.log.metadata.setdefault("checksums", {})[str(tick)] = digest
+
+    def finish(self, end_tick):
+        """结束录制并写盘，返回文件路径"""
+        if self.log is None:
+            return None
+
+        log = self.log
+        self.log = None
+        log.end_tick = end_tick
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            filename = f"level{log.level}_{time.strftime('%Y%m%d_%H%M%S')}{REPLAY_EXTENSION}"
+            path = os.path.join(self.directory, filename)
+            log.write(path)
+            self.last_saved_path = path
+            self._prune_old_replays()
+            return path
+        except Exception as e:
+            print(f"保存回放失败: {e}")
+            return None
+
+    def cancel(self):
+        """放弃当前录制"""
+        self.log = None
+
+    def _prune_old_replays(self):
+        """只保留最近的若干个回放文件"""
+        files = [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                 if name.endswith(REPLAY_EXTENSION)]
+        files.sort(key=os.path.getmtime)
+        for path in files[:-MAX_REPLAY_FILES]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
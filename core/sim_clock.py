@@ -0,0 +1,31 @@
+"""
+模拟时钟 - 以逻辑帧为单位推进的游戏内时间
+冰冻等按时长计算的效果使用它代替 pygame.time.get_ticks()，
+这样加速、回放和无界面模拟时的结果与正常游玩一致
+"""
+
+TICKS_PER_SECOND = 60
+
+_tick = 0
+
+
+def advance(ticks=1):
+    """推进模拟时钟（每个游戏逻辑帧调用一次）"""
+    global _tick
+    _tick += ticks
+
+
+def get_tick():
+    """当前模拟帧数"""
+    return _tick
+
+
+def get_ticks():
+    """当前模拟时间（毫秒），接口与 pygame.time.get_ticks() 保持一致"""
+    return _tick * 1000 // TICKS_PER_SECOND
+
+
+def set_tick(tick):
+    """设置模拟帧数（回放时恢复录制时的时钟）"""
+    global _tick
+    _tick = tick
@@ -0,0 +1,343 @@
+"""
+游戏状态快照 - 把一局游戏的可变状态拍成只读的组件记录，随时可以恢复
+植物、僵尸、子弹、种子按 __slots__ 字段存成 (类名, 字段值, 额外属性) 记录，
+实体之间的引用、弱引用以及按 id(僵尸) 记录的命中集合和计时器都换成实体序号，
+图片、音效、常量、关卡管理器等共享资源只记名字，恢复时重新绑定
+不可变的字段值直接共享，容器只复制一层，拍快照不需要逐个构造对象；
+同一份快照可以反复恢复（练习模式回退），也可以转成 JSON 写进存档，或算摘要做回放一致性校验
+"""
+import collections
+import hashlib
+import importlib
+import json
+import random
+import weakref
+
+from core import sim_clock
+from core.constants import get_constants
+from core.plant_board import PlantBoard
+
+SNAPSHOT_VERSION = 1
+
+# 分配实体序号的分组（game 字典中的键），其他位置对这些对象的引用都记成序号
+ENTITY_GROUPS = ("plants", "zombies", "bullets", "dandelion_seeds")
+# 实体上记录 id(僵尸) 的集合字段
+ID_SET_FIELDS = frozenset(("hit_zombies", "splash_hit_zombies", "freeze_applied_zombies"))
+# game 字典中以 id(僵尸) 为键的计时器
+ID_KEYED_STATE = frozenset(("zombie_stun_timers", "cucumber_spray_timers"))
+# 关卡管理器中随对局变化的字段（关卡配置和特性由关卡号决定，不属于快照）
+LEVEL_MANAGER_FIELDS = (
+    "current_wave", "waves_completed", "zombies_in_wave", "zombies_defeated", "wave_spawned",
+    "all_waves_completed", "wave_mode", "max_waves", "sunflower_count", "trophy",
+)
+# 记录真实时间的字段，不参与一致性摘要
+WALL_CLOCK_KEYS = frozenset(("last_update_time", "last_save_time"))
+# 只展开这些包中定义的对象，其他对象（表面、音效等）按引用保存
+GAME_PACKAGES = frozenset(("plants", "zombies", "bullets", "core", "ui", "shop", "animation"))
+
+# 练习模式回退：每秒保存一份快照，最多回退 30 秒
+REWIND_INTERVAL_TICKS = sim_clock.TICKS_PER_SECOND
+REWIND_CAPACITY = 30
+
+_SCALAR_TYPES = frozenset((type(None), bool, int, float, str))
+_UNSET = ("u",)  # 尚未赋值的槽位
+
+_class_fields = {}  # 类 -> 槽位字段名元组
+_classes = {}  # "模块:类名" -> 类
+
+
+def _class_key(cls):
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def _resolve_class(key):
+    cls = _classes.get(key)
+    if cls is None:
+        module_name, _, qualname = key.partition(":")
+        cls = importlib.import_module(module_name)
+        for part in qualname.split("."):
+            cls = getattr(cls, part)
+        _classes[key] = cls
+    return cls
+
+
+def _fields_of(cls):
+    """类及其基类声明的所有槽位（按继承顺序）"""
+    fields = _class_fields.get(cls)
+    if fields is None:
+        names = []
+        for klass in reversed(cls.__mro__):
+            slots = klass.__dict__.get("__slots__", ())
+            if isinstance(slots, str):
+                slots = (slots,)
+            for name in slots:
+                if name not in ("__weakref__", "__dict__") and name not in names:
+                    names.append(name)
+        fields = _class_fields[cls] = tuple(names)
+    return fields
+
+
+def build_resources(level_manager, images=None, sounds=None):
+    """快照中按名字引用的共享资源，图片和音效同时按键名登记，实体单独持有某张图时也能还原"""
+    resources = {
+        "constants": get_constants(),
+        "level_manager": level_manager,
+        "images": images,
+        "sounds": sounds,
+    }
+    for prefix, group in (("image:", images), ("sound:", sounds)):
+        for key, value in (group or {}).items():
+            if value is not None:
+                resources[prefix + key] = value
+    return resources
+
+
+class _Encoder:
+    """把对象图编码成由元组组成的记录，容器的第一个元素是类型标记"""
+
+    def __init__(self, resources):
+        self.resource_names = {id(obj): name for name, obj in resources.items() if obj is not None}
+        self.entity_index = {}  # id(实体) -> 序号
+        self.entities = []
+
+    def register(self, objects):
+        for obj in objects:
+            if id(obj) not in self.entity_index:
+                self.entity_index[id(obj)] = len(self.entities)
+                self.entities.append(obj)
+
+    def value(self, v):
+        t = type(v)
+        if t in _SCALAR_TYPES:
+            return v
+        index = self.entity_index.get(id(v))
+        if index is not None:
+            return ("e", index)
+        name = self.resource_names.get(id(v))
+        if name is not None:
+            return ("r", name)
+        if t is list:
+            return ("l", tuple([self.value(x) for x in v]))
+        if t is tuple:
+            return ("t", tuple([self.value(x) for x in v]))
+        if t is dict:
+            return ("d", tuple([(self.value(k), self.value(x)) for k, x in v.items()]))
+        if t is set or t is frozenset:
+            return ("s" if t is set else "f", tuple(sorted([self.value(x) for x in v], key=repr)))
+        if t is PlantBoard:
+            return ("b", tuple([self.value(x) for x in v]))
+        if t is weakref.ref:
+            target = v()
+            return ("w", None if target is None else self.entity_index.get(id(target)))
+        if t.__module__.partition(".")[0] in GAME_PACKAGES:
+            return ("o",) + self.record(v)
+        return ("p", v)
+
+    def id_set(self, ids):
+        """id(实体) 集合换成实体序号，已不在场上的实体直接丢弃"""
+        entity_index = self.entity_index
+        return ("s", tuple(sorted(("i", entity_index[i]) for i in ids if i in entity_index)))
+
+    def id_keyed(self, timers):
+        entity_index = self.entity_index
+        return ("d", tuple((("i", entity_index[i]), value) for i, value in timers.items()
+                           if i in entity_index))
+
+    def record(self, obj):
+        """(类名, 槽位值, __dict__ 属性) 记录"""
+        cls = type(obj)
+        values = []
+        for name in _fields_of(cls):
+            try:
+                v = getattr(obj, name)
+            except AttributeError:
+                values.append(_UNSET)
+                continue
+            values.append(self.id_set(v) if name in ID_SET_FIELDS else self.value(v))
+        extra = getattr(obj, "__dict__", None)
+        if extra is not None:
+            extra = tuple((name, self.id_set(v) if name in ID_SET_FIELDS else self.value(v))
+                          for name, v in extra.items())
+        return _class_key(cls), tuple(values), extra
+
+
+class _Decoder:
+    """按记录重建对象，所有实体先创建再填字段，相互引用可以直接连上"""
+
+    def __init__(self, resources, records):
+        self.resources = resources
+        self.entities = [self._new(record[0]) for record in records]
+        for obj, record in zip(self.entities, records):
+            self._fill(obj, record[1], record[2])
+
+    @staticmethod
+    def _new(key):
+        cls = _resolve_class(key)
+        return cls.__new__(cls)
+
+    def _fill(self, obj, values, extra):
+        for name, v in zip(_fields_of(type(obj)), values):
+            if v != _UNSET:
+                setattr(obj, name, self.value(v))
+        if extra is not None:
+            for name, v in extra:
+                setattr(obj, name, self.value(v))
+
+    def value(self, v):
+        if type(v) is not tuple:
+            return v
+        tag = v[0]
+        if tag == "e":
+            return self.entities[v[1]]
+        if tag == "r":
+            return self.resources.get(v[1])
+        if tag == "l":
+            return [self.value(x) for x in v[1]]
+        if tag == "t":
+            return tuple([self.value(x) for x in v[1]])
+        if tag == "d":
+            return {self.value(k): self.value(x) for k, x in v[1]}
+        if tag == "s":
+            return {self.value(x) for x in v[1]}
+        if tag == "f":
+            return frozenset(self.value(x) for x in v[1])
+        if tag == "b":
+            return PlantBoard(self.value(x) for x in v[1])
+        if tag == "i":
+            return id(self.entities[v[1]])
+        if tag == "w":
+            return None if v[1] is None else weakref.ref(self.entities[v[1]])
+        if tag == "o":
+            obj = self._new(v[1])
+            self._fill(obj, v[2], v[3])
+            return obj
+        if tag == "p":
+            return v[1]
+        raise ValueError(f"未知的快照记录类型: {tag}")
+
+
+def _tupled(value):
+    """JSON 读回的列表还原成元组"""
+    if type(value) is list:
+        return tuple([_tupled(x) for x in value])
+    return value
+
+
+class GameSnapshot:
+    """一局游戏在某个逻辑帧的状态，创建后不再修改"""
+
+    __slots__ = ("tick", "clock_tick", "random_state", "entities", "state", "level_state", "carts")
+
+    def __init__(self, tick, clock_tick, random_state, entities, state, level_state, carts=None):
+        self.tick = tick  # 本局逻辑帧号（GameManager.replay_tick），存档快照为 None
+        self.clock_tick = clock_tick
+        self.random_state = random_state
+        self.entities = entities  # 实体记录元组
+        self.state = state  # game 字典（编码后）
+        self.level_state = level_state  # LEVEL_MANAGER_FIELDS 对应的值（编码后）
+        self.carts = carts  # 小推车（编码后），存档快照为 None
+
+    @classmethod
+    def capture(cls, game, resources, carts=None, tick=None):
+        """拍下 game 字典、关卡管理器和（可选）小推车的状态"""
+        encoder = _Encoder(resources)
+        for group in ENTITY_GROUPS:
+            encoder.register(game.get(group, ()))
+        entities = tuple([encoder.record(obj) for obj in encoder.entities])
+
+        state = []
+        for key, value in game.items():
+            if key in ID_KEYED_STATE:
+                state.append((key, encoder.id_keyed(value)))
+            else:
+                state.append((key, encoder.value(value)))
+
+        level_manager = resources["level_manager"]
+        level_state = tuple(encoder.value(getattr(level_manager, name, None)) for name in LEVEL_MANAGER_FIELDS)
+        return cls(tick, sim_clock.get_tick(), random.getstate(), entities, tuple(state), level_state,
+                   None if carts is None else encoder.value(carts))
+
+    def decode(self, resources):
+        """按快照重建 game 字典和小推车，并恢复关卡管理器字段
+        不碰模拟时钟和全局随机数，可以在后台线程调用（关卡管理器需是尚未投入使用的新实例）
+        返回 (game, carts)，没有记录小推车时 carts 为 None"""
+        decoder = _Decoder(resources, self.entities)
+        game = {key: decoder.value(value) for key, value in self.state}
+
+        level_manager = resources["level_manager"]
+        for name, value in zip(LEVEL_MANAGER_FIELDS, self.level_state):
+            setattr(level_manager, name, decoder.value(value))
+        game["level_manager"] = level_manager
+        return game, (None if self.carts is None else decoder.value(self.carts))
+
+    def restore_clock(self):
+        """恢复模拟时钟和随机数状态（只能在主线程、换入对局时调用）"""
+        sim_clock.set_tick(self.clock_tick)
+        random.setstate(self.random_state)
+
+    def restore_state(self, resources):
+        """decode 之后再恢复模拟时钟和随机数状态，返回 (game, carts)"""
+        result = self.decode(resources)
+        self.restore_clock()
+        return result
+
+    @property
+    def entity_count(self):
+        return len(self.entities)
+
+    def to_dict(self):
+        """可写入 JSON 的形式（存档用），按引用保存的对象无法序列化时抛出 TypeError"""
+        return {
+            "version": SNAPSHOT_VERSION,
+            "tick": self.tick,
+            "clock_tick": self.clock_tick,
+            "random_state": self.random_state,
+            "entities": self.entities,
+            "state": self.state,
+            "level_state": self.level_state,
+            "carts": self.carts,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """从 to_dict 的结果（可以是 JSON 读回的数据）重建快照"""
+        if data.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"不支持的快照版本: {data.get('version')}")
+        return cls(data.get("tick"), data["clock_tick"], _tupled(data["random_state"]),
+                   _tupled(data["entities"]), _tupled(data["state"]), _tupled(data["level_state"]),
+                   _tupled(data.get("carts")))
+
+    def digest(self):
+        """状态摘要，两次运行在同一帧的摘要不同说明发生了不同步（不含真实时间字段）"""
+        payload = [self.clock_tick, self.random_state, self.entities, self.level_state, self.carts,
+                   [item for item in self.state if item[0] not in WALL_CLOCK_KEYS]]
+        data = json.dumps(payload, separators=(",", ":"), default=lambda obj: type(obj).__name__)
+        return hashlib.blake2b(data.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class SnapshotHistory:
+    """练习模式的回退缓冲：每隔 interval 帧保存一份快照，只保留最近 capacity 份"""
+
+    def __init__(self, interval=REWIND_INTERVAL_TICKS, capacity=REWIND_CAPACITY):
+        self.interval = interval
+        self.snapshots = collections.deque(maxlen=capacity)
+
+    def __len__(self):
+        return len(self.snapshots)
+
+    def record(self, tick, take_snapshot):
+        """到了保存间隔时调用 take_snapshot() 保存一份"""
+        if tick % self.interval == 0:
+            self.snapshots.append(take_snapshot())
+
+    def rewind(self, tick, ticks):
+        """取出不晚于 tick - ticks 的最近一份快照，并丢弃它之后的快照；没有时返回 None"""
+        target = tick - ticks
+        while self.snapshots and self.snapshots[-1].tick > target:
+            if len(self.snapshots) == 1:
+                break  # 至少回退到最早的一份
+            self.snapshots.pop()
+        return self.snapshots[-1] if self.snapshots else None
+
+    def clear(self):
+        self.snapshots.clear()
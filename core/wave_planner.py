@@ -0,0 +1,138 @@
+"""
+波次规划模块 - 每一波开始时就把下一波编成出怪表（出场帧、行、类型、铁甲、快速），
+僵尸到了出场帧才创建（优先复用对象池中回收的僵尸）放进场地，不再在波次开始的那一帧一次性创建整波僵尸，
+还没出场的僵尸也不参与每帧的僵尸循环
+出场帧按原来错开摆放的距离推算，僵尸走到场地边缘的时间与一次性生成时相同
+"""
+import random
+
+from core.constants import GRID_HEIGHT, GRID_WIDTH, get_constants
+from zombies import create_zombie, zombie_class
+
+# 同一行相邻僵尸之间错开的距离（格）
+ZOMBIE_SPACING = 0.3
+# 第13关及以后有概率生成巨人僵尸
+GIANT_ZOMBIE_MIN_LEVEL = 13
+GIANT_ZOMBIE_PROB = 0.1
+
+
+class WavePlan:
+    """编好的一波：各行僵尸数量和出怪表
+    出怪表的每项为 (出场延迟帧数, 行, 僵尸类型, 是否铁甲, 是否快速, 快速倍数, 出场列)"""
+
+    __slots__ = ("zombies_per_row", "entries")
+
+    def __init__(self, zombies_per_row, entries):
+        self.zombies_per_row = zombies_per_row
+        self.entries = entries
+
+    @property
+    def total(self):
+        return sum(self.zombies_per_row)
+
+
+def compile_wave(level_manager, zombies_per_row=None):
+    """按关卡配置编一波僵尸的出怪表（铁甲、快速、巨人的随机判定都在这里完成）"""
+    if zombies_per_row is None:
+        zombies_per_row = [random.randint(3, 4) for _ in range(GRID_HEIGHT)]
+
+    if not level_manager:
+        # 如果没有关卡管理器，使用默认值
+        armor_prob = 0.5
+        fast_multiplier = 2.5
+        all_fast = False
+        giant_allowed = False
+    else:
+        armor_prob = level_manager.get_zombie_armor_prob()
+        fast_multiplier = level_manager.get_fast_zombie_multiplier()
+        all_fast = level_manager.has_all_fast_zombies()  # 检查是否全员快速
+        giant_allowed = level_manager.current_level >= GIANT_ZOMBIE_MIN_LEVEL
+
+    entries = []
+    for row in range(GRID_HEIGHT):
+        zombie_count = zombies_per_row[row]
+        # 全员快速模式下所有僵尸都是快速的；否则随机选一个位置作为快速僵尸
+        if all_fast:
+            fast_zombie_indices = list(range(zombie_count))
+        else:
+            fast_zombie_indices = [random.randint(0, zombie_count - 1)] if zombie_count > 0 else []
+
+        for i in range(zombie_count):
+            has_armor = random.random() < armor_prob
+            is_fast = i in fast_zombie_indices
+            zombie_type = "giant" if giant_allowed and random.random() < GIANT_ZOMBIE_PROB else "normal"
+
+            # 原来第 i 个僵尸摆在边缘右侧 i * 0.3 格处，这里改为等它走到边缘附近时再出场
+            distance = i * ZOMBIE_SPACING
+            speed = zombie_class(zombie_type).wave_walk_speed(is_fast)
+            delay = int(distance / speed)
+            entries.append((delay, row, zombie_type, has_armor, is_fast, fast_multiplier,
+                            GRID_WIDTH + distance - delay * speed))
+
+    entries.sort(key=lambda entry: entry[0])
+    return WavePlan(zombies_per_row, entries)
+
+
+class WavePlanner:
+    """波次规划器，保存在 game 字典中随快照和存档一起保存"""
+
+    __slots__ = ("tick", "schedule", "next_wave")
+
+    def __init__(self):
+        self.tick = 0  # 规划器自己的帧计数
+        self.schedule = []  # 按出场帧排好的 (出场帧, 行, 僵尸类型, 是否铁甲, 是否快速, 快速倍数, 出场列)
+        self.next_wave = None  # 已编好、尚未开始的下一波
+
+    @property
+    def pending_count(self):
+        """已经排进出怪表、还没出场的僵尸数量"""
+        return len(self.schedule)
+
+    def start_wave(self, level_manager):
+        """开始下一波：取出编好的出怪表排进日程，并马上编好再下一波"""
+        plan = self.next_wave or compile_wave(level_manager)
+        self.next_wave = None
+        level_manager.start_wave(plan.total)
+
+        self.schedule.extend((self.tick + entry[0],) + entry[1:] for entry in plan.entries)
+        self.schedule.sort(key=lambda entry: entry[0])
+
+        if level_manager.current_wave < level_manager.max_waves:
+            self.next_wave = compile_wave(level_manager)
+        return plan
+
+    def update(self, game_state, sounds=None):
+        """推进一帧，把到了出场帧的僵尸放进场地"""
+        schedule = self.schedule
+        due = 0
+        while due < len(schedule) and schedule[due][0] <= self.tick:
+            due += 1
+
+        if due:
+            constants = get_constants()
+            zombies = game_state["zombies"]
+            for _, row, zombie_type, has_armor, is_fast, fast_multiplier, col in schedule[:due]:
+                zombie = create_zombie(
+                    row, zombie_type,
+                    has_armor_prob=1.0 if has_armor else 0.0,
+                    is_fast=is_fast,
+                    wave_mode=True,
+                    fast_multiplier=fast_multiplier,
+                    constants=constants,
+                    sounds=sounds,
+                    images=None,
+                    level_settings=None
+                )
+                zombie.col = col
+                zombies.append(zombie)
+            del schedule[:due]
+
+        self.tick += 1
+
+
+def get_wave_planner(game_state):
+    """取得对局的波次规划器（旧存档没有时新建）"""
+    planner = game_state.get("wave_planner")
+    if planner is None:
+        planner = game_state["wave_planner"] = WavePlanner()
+    return planner
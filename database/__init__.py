@@ -3,15 +3,24 @@
 """
 
 from .game_database import GameDatabase
+from .sqlite_database import SQLiteGameDatabase, open_game_database
+from .write_behind import WriteBehindStore, flush_all_stores, flush_due_stores
 from .save_manager import (
     auto_save_game_progress,
     restore_game_from_save,
+    decode_saved_game,
     check_level_has_save
 )
 
 __all__ = [
     'GameDatabase',
+    'SQLiteGameDatabase',
+    'open_game_database',
+    'WriteBehindStore',
+    'flush_all_stores',
+    'flush_due_stores',
     'auto_save_game_progress',
     'restore_game_from_save',
+    'decode_saved_game',
     'check_level_has_save'
 ]
\ No newline at end of file
@@ -15,6 +15,9 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from core.constants import get_constants
+from core import sim_clock
+from core.plant_board import PlantBoard
+from core.snapshot import GameSnapshot, build_resources
 from plants import Plant
 from zombies import Zombie
 # 统一使用 import bullets 方式
@@ -36,12 +39,59 @@ def auto_save_game_progress(game_db, game_state, music_manager, game_manager=Non
             game_state["last_save_time"] = current_time
 
 
-def restore_game_from_save(saved_data, level_manager, game_manager=None):
-    """从保存的数据恢复游戏状态，修复樱桃炸弹等爆炸植物的恢复问题"""
+def decode_saved_game(saved_data, level_manager, images=None, sounds=None):
+    """解析存档中的快照并重建对局，返回 (snapshot, game)
+    不碰模拟时钟和随机数，关卡预加载在后台线程调用"""
+    snapshot = GameSnapshot.from_dict(saved_data["snapshot"])
+    game, _ = snapshot.decode(build_resources(level_manager, images, sounds))
+    return snapshot, game
+
+
+def restore_game_from_snapshot(saved_data, level_manager, game_manager=None, decoded=None):
+    """从存档中的快照恢复游戏状态（同时恢复模拟时钟和随机数状态）
+    decoded 为预先解析好的 (snapshot, game)，为空时在这里解析"""
+    if decoded is None:
+        images = game_manager.images if game_manager else None
+        sounds = game_manager.sounds if game_manager else None
+        decoded = decode_saved_game(saved_data, level_manager, images, sounds)
+    snapshot, game = decoded
+    snapshot.restore_clock()
+
+    # 真实时间相关的字段和手上的工具不随存档恢复
+    game["last_update_time"] = pygame.time.get_ticks()
+    game["last_save_time"] = 0
+    game["selected"] = None
+    return game
+
+
+def restore_plant_select_state(saved_data, game_manager):
+    """恢复存档时的植物选择界面状态和小推车"""
+    if "plant_select_state" in saved_data:
+        plant_select_state = saved_data["plant_select_state"]
+        game_manager.plant_selection_manager.show_plant_select = plant_select_state.get("show_plant_select", False)
+        game_manager.plant_selection_manager.selected_plants_for_game = plant_select_state.get(
+            "selected_plants_for_game", [])
+        game_manager.animation_manager.plant_select_animation_complete = plant_select_state.get(
+            "plant_select_animation_complete", False)
+
+    if "cart_data" in saved_data:
+        cart_data = saved_data["cart_data"]
+        if cart_data:
+            game_manager.cart_manager.load_save_data(cart_data)
+
+
+def restore_game_from_save(saved_data, level_manager, game_manager=None, decoded=None):
+    """从保存的数据恢复游戏状态：新存档直接恢复快照，旧存档逐个重建植物、僵尸和子弹"""
     try:
+        if "snapshot" in saved_data:
+            game = restore_game_from_snapshot(saved_data, level_manager, game_manager, decoded)
+            if game_manager:
+                restore_plant_select_state(saved_data, game_manager)
+            return game
+
         # 创建基础游戏状态
         game = {
-            "plants": [], "zombies": [], "bullets": [],
+            "plants": PlantBoard(), "zombies": [], "bullets": [],
             "zombie_timer": saved_data.get("zombie_timer", 0),
             "sun": saved_data["sun"],
             "game_over": False,
@@ -64,7 +114,10 @@ def restore_game_from_save(saved_data, level_manager, game_manager=None):
             # 黄瓜效果状态
             "zombie_stun_timers": saved_data.get("cucumber_effects", {}).get("zombie_stun_timers", {}),
             "cucumber_spray_timers": saved_data.get("cucumber_effects", {}).get("cucumber_spray_timers", {}),
-            "cucumber_plant_healing": saved_data.get("cucumber_effects", {}).get("cucumber_plant_healing", {}),
+            "cucumber_plant_healing": {
+                tuple(int(v) for v in key.split('_')): timer
+                for key, timer in saved_data.get("cucumber_effects", {}).get("cucumber_plant_healing", {}).items()
+            },
             # 新增：爆炸效果列表
             "explosion_effects": []
         }
@@ -101,9 +154,10 @@ def restore_game_from_save(saved_data, level_manager, game_manager=None):
             if "explosion_state" in plant_data:
                 explosion_state = plant_data["explosion_state"]
 
-                # 恢复爆炸状态属性
+                # 恢复爆炸状态属性（只恢复植物声明过的字段，旧存档中的废弃字段忽略）
                 for attr_name, attr_value in explosion_state.items():
-                    setattr(plant, attr_name, attr_value)
+                    if hasattr(plant, attr_name):
+                        setattr(plant, attr_name, attr_value)
 
                 # 特殊处理：如果植物已经爆炸，不应该添加到植物列表中
                 if explosion_state.get("has_exploded", False):
@@ -124,8 +178,8 @@ def restore_game_from_save(saved_data, level_manager, game_manager=None):
                 # 因为大多数情况下，玩家不会在意爆炸动画的恢复
                 print(f"跳过爆炸效果恢复: {effect_data.get('effect_type', 'unknown')}")
 
-        # 恢复僵尸 - 保持原有逻辑
-        current_time = pygame.time.get_ticks()
+        # 恢复僵尸 - 保持原有逻辑（冰冻计时使用模拟时钟）
+        current_time = sim_clock.get_ticks()
         for zombie_data in saved_data.get("zombies", []):
             zombie_type = zombie_data.get("zombie_type", "normal")
 
@@ -220,18 +274,8 @@ def restore_game_from_save(saved_data, level_manager, game_manager=None):
             game["bullets"].append(bullet)
 
         # 恢复其他状态...（保持原有逻辑）
-        if game_manager and "plant_select_state" in saved_data:
-            plant_select_state = saved_data["plant_select_state"]
-            game_manager.plant_selection_manager.show_plant_select = plant_select_state.get("show_plant_select", False)
-            game_manager.plant_selection_manager.selected_plants_for_game = plant_select_state.get(
-                "selected_plants_for_game", [])
-            game_manager.animation_manager.plant_select_animation_complete = plant_select_state.get(
-                "plant_select_animation_complete", False)
-
-        if game_manager and "cart_data" in saved_data:
-            cart_data = saved_data["cart_data"]
-            if cart_data:
-                game_manager.cart_manager.load_save_data(cart_data)
+        if game_manager:
+            restore_plant_select_state(saved_data, game_manager)
 
         # 恢复蒲公英种子
         game["dandelion_seeds"] = []
@@ -0,0 +1,272 @@
+"""
+SQLite 存档后端 - 进度、设置、金币、购买记录和每关存档分表保存（WAL 模式）
+每次修改都是单行事务，不会重写其他关卡的存档；启动时只读取主菜单需要的小表，
+关卡存档的大块数据在继续游戏时才按关卡读取
+首次打开时自动从旧的 JSON 存档迁移数据，原 JSON 文件保留作为备份
+"""
+import json
+import os
+
+try:
+    import sqlite3
+except ImportError:  # 部分精简版 Python 没有编译 sqlite3
+    sqlite3 = None
+
+from .game_database import (GameDatabase, PURCHASED_ITEMS_FILE, VALID_LEVEL_SETTINGS,
+                            read_progress_json, read_purchased_items_json, normalize_level_settings,
+                            summarize_saved_game, format_saved_game_info)
+
+DEFAULT_DB_FILE = "database/game_progress.db"
+LEGACY_PROGRESS_FILE = "database/game_progress.json"
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS completed_levels (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    level INTEGER NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS coins (id INTEGER PRIMARY KEY CHECK (id = 0), amount INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS purchases (item_id TEXT PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS saved_games (
+    level INTEGER PRIMARY KEY,
+    save_time REAL NOT NULL,
+    summary TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+"""
+
+
+class SQLiteGameDatabase(GameDatabase):
+    """SQLite 存档，与 GameDatabase 接口一致；小表常驻内存供每帧查询，写入直接提交"""
+
+    def __init__(self, filename=DEFAULT_DB_FILE, legacy_filename=LEGACY_PROGRESS_FILE,
+                 legacy_purchases_filename=PURCHASED_ITEMS_FILE):
+        self.filename = filename
+        self.conn = sqlite3.connect(filename)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # WAL 下 NORMAL 不会损坏数据库，只可能丢失断电前最后一次提交
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+        if self._get_meta("schema_version") is None:
+            self._migrate_from_json(legacy_filename, legacy_purchases_filename)
+
+        self._load_menu_data()
+
+    # ---- 打开与迁移 ----
+
+    def _get_meta(self, key):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _migrate_from_json(self, legacy_filename, legacy_purchases_filename):
+        """新建数据库时导入旧 JSON 存档，整个导入在一个事务里完成"""
+        data = None
+        try:
+            data = read_progress_json(legacy_filename) if legacy_filename else None
+        except Exception as e:
+            print(f"读取旧存档失败: {e}")
+        purchases = read_purchased_items_json(legacy_purchases_filename) if legacy_purchases_filename else set()
+        data = data or {}
+
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO completed_levels (level) VALUES (?)",
+                [(level,) for level in data.get("completed_levels", [])])
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+                [(key, json.dumps(value)) for key, value in
+                 normalize_level_settings(data.get("level_settings")).items()])
+            self.conn.execute("INSERT OR REPLACE INTO coins (id, amount) VALUES (0, ?)",
+                              (max(0, data.get("coins", 0)),))
+            self.conn.executemany("INSERT OR IGNORE INTO purchases (item_id) VALUES (?)",
+                                  [(item_id,) for item_id in sorted(purchases)])
+            for level_key, saved_game in (data.get("saved_games") or {}).items():
+                try:
+                    self._write_saved_game(int(level_key), saved_game)
+                except Exception as e:
+                    print(f"迁移第{level_key}关存档失败: {e}")
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)",
+                              (str(SCHEMA_VERSION),))
+            if data:
+                self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_from', ?)",
+                                  (os.path.basename(legacy_filename),))
+
+    def _load_menu_data(self):
+        """读取主菜单和每帧查询需要的小表；关卡存档只读摘要，不读完整数据"""
+        self._completed_levels = [row[0] for row in self.conn.execute(
+            "SELECT level FROM completed_levels ORDER BY seq")]
+        self._completed_set = set(self._completed_levels)
+
+        stored_settings = {key: json.loads(value) for key, value in
+                           self.conn.execute("SELECT key, value FROM settings")}
+        self._settings = normalize_level_settings(stored_settings)
+        if self._settings != stored_settings:
+            with self.conn:
+                self.conn.execute("DELETE FROM settings")
+                self.conn.executemany("INSERT INTO settings (key, value) VALUES (?, ?)",
+                                      [(key, json.dumps(value)) for key, value in self._settings.items()])
+
+        row = self.conn.execute("SELECT amount FROM coins WHERE id = 0").fetchone()
+        self._coins = row[0] if row else 0
+        self._purchased_items = {row[0] for row in self.conn.execute("SELECT item_id FROM purchases")}
+        self._saved_summaries = {level: json.loads(summary) for level, summary in self.conn.execute(
+            "SELECT level, summary FROM saved_games ORDER BY level")}
+
+    # ---- 生命周期 ----
+
+    def load_data(self):
+        """重新读取小表（兼容 GameDatabase 接口）"""
+        self._load_menu_data()
+
+    def save_data(self, key="*"):
+        """每次修改都已提交，无需额外保存"""
+
+    def flush(self):
+        """所有修改都已在各自的事务中提交，没有待写入的数据"""
+        return False
+
+    def close(self, flush=True):
+        """关闭数据库连接（关闭时 SQLite 会自动做 WAL 检查点）"""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    # ---- 购买记录 ----
+
+    def add_purchased_item(self, item_id):
+        """记录购买的商品"""
+        if item_id not in self._purchased_items:
+            with self.conn:
+                self.conn.execute("INSERT OR IGNORE INTO purchases (item_id) VALUES (?)", (item_id,))
+            self._purchased_items.add(item_id)
+
+    # ---- 通关进度 ----
+
+    def mark_level_completed(self, level_num):
+        """标记关卡完成"""
+        if level_num not in self._completed_set:
+            with self.conn:
+                self.conn.execute("INSERT OR IGNORE INTO completed_levels (level) VALUES (?)", (level_num,))
+            self._completed_levels.append(level_num)
+            self._completed_set.add(level_num)
+
+    def is_level_completed(self, level_num):
+        """检查关卡是否已完成"""
+        return level_num in self._completed_set
+
+    def get_completed_levels(self):
+        """获取已完成的关卡列表"""
+        return list(self._completed_levels)
+
+    def get_completion_count(self):
+        """获取完成关卡数量"""
+        return len(self._completed_levels)
+
+    # ---- 关卡设置 ----
+
+    def get_level_settings(self):
+        """获取关卡设置"""
+        return self._settings.copy()
+
+    def update_level_setting(self, setting_key, value):
+        """更新单个关卡设置"""
+        if setting_key in VALID_LEVEL_SETTINGS:
+            with self.conn:
+                self.conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+                                  (setting_key, json.dumps(value)))
+            self._settings[setting_key] = value
+        else:
+            print(f"警告：尝试设置无效的配置项 {setting_key}")
+
+    def reset_progress(self):
+        """重置游戏进度（保留设置和购买记录，与 JSON 存档一致清空金币）"""
+        with self.conn:
+            self.conn.execute("DELETE FROM completed_levels")
+            self.conn.execute("DELETE FROM saved_games")
+            self.conn.execute("INSERT OR REPLACE INTO coins (id, amount) VALUES (0, 0)")
+        self._completed_levels = []
+        self._completed_set = set()
+        self._saved_summaries = {}
+        self._coins = 0
+
+    # ---- 关卡存档 ----
+
+    def _write_saved_game(self, level_num, saved_game):
+        """写入一行关卡存档（调用方负责事务）"""
+        summary = summarize_saved_game(saved_game)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO saved_games (level, save_time, summary, data) VALUES (?, ?, ?, ?)",
+            (level_num, saved_game.get("save_time", 0), json.dumps(summary),
+             json.dumps(saved_game, ensure_ascii=False)))
+        return summary
+
+    def _store_saved_game(self, level_num, saved_game):
+        """只替换该关卡的一行，其他关卡的存档不受影响"""
+        with self.conn:
+            summary = self._write_saved_game(level_num, saved_game)
+        self._saved_summaries[level_num] = summary
+
+    def has_saved_game(self, level_num=None):
+        """检查是否有保存的游戏（可指定关卡）"""
+        if level_num is None:
+            return bool(self._saved_summaries)
+        return level_num in self._saved_summaries
+
+    def get_saved_game(self, level_num=None):
+        """获取保存的游戏数据（可指定关卡），只读取这一关的数据"""
+        if level_num is None:
+            if not self._saved_summaries:
+                return None
+            level_num = next(iter(self._saved_summaries))
+        if level_num not in self._saved_summaries:
+            return None
+        row = self.conn.execute("SELECT data FROM saved_games WHERE level = ?", (level_num,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def clear_saved_game(self, level_num=None):
+        """清除保存的游戏（可指定关卡）"""
+        with self.conn:
+            if level_num is None:
+                self.conn.execute("DELETE FROM saved_games")
+            else:
+                self.conn.execute("DELETE FROM saved_games WHERE level = ?", (level_num,))
+        if level_num is None:
+            self._saved_summaries = {}
+        else:
+            self._saved_summaries.pop(level_num, None)
+
+    def get_saved_game_info(self, level_num=None):
+        """获取保存游戏的基本信息（可指定关卡），直接使用保存时写入的摘要"""
+        if level_num is None:
+            summary = next(iter(self._saved_summaries.values()), None)
+        else:
+            summary = self._saved_summaries.get(level_num)
+        return format_saved_game_info(summary) if summary else None
+
+    # ---- 金币 ----
+
+    def get_coins(self):
+        """获取当前金币数量"""
+        return self._coins
+
+    def set_coins(self, amount):
+        """设置金币数量"""
+        amount = max(0, amount)  # 确保金币不为负数
+        if amount != self._coins:
+            with self.conn:
+                self.conn.execute("INSERT OR REPLACE INTO coins (id, amount) VALUES (0, ?)", (amount,))
+            self._coins = amount
+
+
+def open_game_database(filename=DEFAULT_DB_FILE):
+    """打开默认存档：优先使用 SQLite 后端，当前 Python 没有 sqlite3 时退回 JSON 存档"""
+    if sqlite3 is None:
+        return GameDatabase()
+    try:
+        return SQLiteGameDatabase(filename)
+    except Exception as e:
+        print(f"打开 SQLite 存档失败，改用 JSON 存档: {e}")
+        return GameDatabase()
@@ -0,0 +1,110 @@
+"""
+写回式持久化 - 数据常驻内存，修改时只标记脏键，
+按定时器、状态切换和程序退出时统一落盘，不再每次改动都重写整个文件
+落盘先写同目录的临时文件并 fsync，再原子替换原文件，写到一半崩溃也不会损坏存档
+"""
+import atexit
+import json
+import os
+import time
+
+# 定时落盘间隔（秒）
+FLUSH_INTERVAL_SECONDS = 5.0
+
+
+def write_json_atomic(filename, data):
+    """原子写入 JSON：临时文件 + fsync + os.replace，再 fsync 所在目录"""
+    directory = os.path.dirname(os.path.abspath(filename))
+    temp_filename = filename + ".tmp"
+    with open(temp_filename, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_filename, filename)
+
+    # 目录项也要落盘，否则断电后可能仍指向旧文件（Windows 不支持打开目录，跳过）
+    if hasattr(os, 'O_DIRECTORY'):
+        try:
+            dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        except OSError:
+            return
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
+
+
+class WriteBehindStore:
+    """单个 JSON 文件的写回缓存，snapshot() 返回落盘时要写入的数据"""
+
+    def __init__(self, filename, snapshot, interval=FLUSH_INTERVAL_SECONDS):
+        self.filename = filename
+        self.snapshot = snapshot
+        self.interval = interval
+        self.dirty_keys = set()
+        self.last_flush_time = time.monotonic()
+        self.write_count = 0
+        _stores.add(self)
+
+    @property
+    def is_dirty(self):
+        return bool(self.dirty_keys)
+
+    def mark_dirty(self, key="*"):
+        """标记数据已修改，key 只用于记录哪些部分待保存"""
+        self.dirty_keys.add(key)
+
+    def flush_if_due(self, now=None):
+        """距上次落盘超过定时间隔且有修改时落盘"""
+        if not self.dirty_keys:
+            return False
+        if now is None:
+            now = time.monotonic()
+        if now - self.last_flush_time < self.interval:
+            return False
+        return self.flush()
+
+    def flush(self):
+        """有修改时立即落盘，失败时保留脏标记等待下次重试"""
+        if not self.dirty_keys:
+            return False
+        try:
+            write_json_atomic(self.filename, self.snapshot())
+        except Exception as e:
+            print(f"保存 {self.filename} 失败: {e}")
+            return False
+        finally:
+            self.last_flush_time = time.monotonic()
+        self.dirty_keys.clear()
+        self.write_count += 1
+        return True
+
+    def close(self, flush=True):
+        """停止管理该文件；flush=False 时丢弃未保存的修改（如临时存档）"""
+        if flush:
+            self.flush()
+        else:
+            self.dirty_keys.clear()
+        _stores.discard(self)
+
+
+_stores = set()
+
+
+def flush_all_stores():
+    """立即落盘所有有修改的文件（状态切换、退出时调用）"""
+    for store in list(_stores):
+        store.flush()
+
+
+def flush_due_stores():
+    """落盘所有到了定时间隔的文件（每帧调用）"""
+    now = time.monotonic()
+    for store in list(_stores):
+        store.flush_if_due(now)
+
+
+# 正常退出（包括 sys.exit）时兜底保存
+atexit.register(flush_all_stores)
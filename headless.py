@@ -0,0 +1,169 @@
+"""
+无界面游戏核心 - 不打开窗口、不渲染，直接按逻辑帧驱动 GameManager
+供关卡平衡批量模拟、机器人对战等离线工具使用
+运行时使用独立的临时存档，不会改动玩家的 game_progress.json
+"""
+import os
+import random
+import tempfile
+import time
+
+# 必须在导入 pygame 之前设置，使用虚拟显示和音频设备
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from core.constants import (
+    BATTLEFIELD_LEFT, BATTLEFIELD_TOP, GRID_SIZE, GRID_GAP, GRID_WIDTH, GRID_HEIGHT
+)
+from core.game_logic import handle_plant_placement, hammer_hits_zombie
+from database import GameDatabase
+
+
+class HeadlessSession:
+    """无界面游戏会话，一个进程内可以复用来连续模拟多局"""
+
+    def __init__(self, db_path=None):
+        # 延迟导入，保证环境变量先于 pygame 初始化生效
+        from main import GameManager
+
+        # 使用临时存档，避免污染玩家数据（多进程并行时各自独立）
+        if db_path is None:
+            fd, db_path = tempfile.mkstemp(prefix="pvz_headless_", suffix=".json")
+            os.close(fd)
+            os.remove(db_path)
+        self.db_path = db_path
+        self.gm = GameManager(game_db=GameDatabase(db_path))
+        # 模拟对局不需要录制回放
+        self.gm.replay_recording_enabled = False
+
+        self.tick = 0
+        self.seed = None
+
+    @property
+    def game(self):
+        """当前局的游戏状态字典"""
+        return self.gm.game
+
+    def start_level(self, level_num, seed=None, selected_plants=None):
+        """开始一局新游戏，第9关及以上跳过选植物界面"""
+        self.seed = seed
+        if seed is not None:
+            random.seed(seed)
+
+        gm = self.gm
+        gm.state_manager.set_pending_game_data(None, level_num)
+        gm.load_pending_game_data()
+        gm.state_manager.game_state = "playing"
+
+        if gm.plant_selection_manager.show_plant_select:
+            if selected_plants is None:
+                selected_plants = self._default_plant_selection()
+            gm.plant_selection_manager.selected_plants_for_game = list(selected_plants)
+            gm.plant_selection_manager.hide_plant_selection()
+
+        gm.state_manager.game_paused = False
+        self.tick = 0
+
+    def _default_plant_selection(self):
+        """从选植物网格中按顺序选满卡槽"""
+        manager = self.gm.plant_selection_manager
+        plants = []
+        for grid_row in manager.plant_select_grid:
+            for plant_data in grid_row:
+                if plant_data and len(plants) < manager.get_max_plant_slots():
+                    plants.append(plant_data["type"])
+        return plants
+
+    def step(self):
+        """推进一个逻辑帧，返回本帧耗时（秒）"""
+        start = time.perf_counter()
+        self.gm.update_game_logic()
+        self.tick += 1
+        return time.perf_counter() - start
+
+    def snapshot(self):
+        """当前对局的快照（见 core/snapshot.py），可用于回退重试或对比两次模拟的状态"""
+        return self.gm.snapshot()
+
+    def restore(self, snapshot):
+        """恢复到快照时的对局状态，逻辑帧计数一并恢复"""
+        self.gm.restore(snapshot)
+        self.tick = snapshot.tick
+
+    def get_outcome(self):
+        """返回 "won"、"lost"，未结束时返回 None"""
+        if self.game.get("level_completed", False):
+            return "won"
+        if self.game["game_over"]:
+            return "lost"
+        return None
+
+    def get_cards(self):
+        """当前可用的卡片列表"""
+        return self.gm.get_available_cards_for_current_state()
+
+    @staticmethod
+    def cell_center(row, col):
+        """网格坐标转换为格子中心的像素坐标"""
+        x = BATTLEFIELD_LEFT + col * (GRID_SIZE + GRID_GAP) + GRID_SIZE // 2
+        y = BATTLEFIELD_TOP + row * (GRID_SIZE + GRID_GAP) + GRID_SIZE // 2
+        return x, y
+
+    def _use_tool_at(self, selected, row, col):
+        """以指定选择状态点击格子，走与玩家点击相同的种植逻辑"""
+        if not (0 <= row < GRID_HEIGHT and 0 <= col < GRID_WIDTH):
+            return False
+
+        game = self.game
+        previous = game["selected"]
+        game["selected"] = selected
+        x, y = self.cell_center(row, col)
+        result = handle_plant_placement(
+            game, self.get_cards(), x, y,
+            game["level_manager"],
+            self.gm.level_settings,
+            self.gm.sounds,
+            self.gm.state_manager
+        )
+        game["selected"] = previous
+        return bool(result)
+
+    def plant(self, plant_type, row, col):
+        """种植植物，卡片不可用或阳光不足时返回 False"""
+        card = next((c for c in self.get_cards() if c["type"] == plant_type), None)
+        if not card or not self.gm.event_handler._can_select_card(card):
+            return False
+        return self._use_tool_at(plant_type, row, col)
+
+    def shovel(self, row, col):
+        """铲除指定格子的植物"""
+        return self._use_tool_at("shovel", row, col)
+
+    def can_hammer(self, row, col):
+        """现在敲击指定格子能否打中存活的僵尸（已购买锤子、不在冷却中且格子里有僵尸）"""
+        if not self.gm.shop_manager.has_hammer() or self.game.get("hammer_cooldown", 0) > 0:
+            return False
+        if not (0 <= row < GRID_HEIGHT and 0 <= col < GRID_WIDTH):
+            return False
+        return any(int(zombie.row) == row and not zombie.is_dying and hammer_hits_zombie(zombie, col)
+                   for zombie in self.game["zombies"])
+
+    def hammer(self, row, col):
+        """用锤子敲击指定格子，需要已购买锤子且不在冷却中"""
+        if not self.gm.shop_manager.has_hammer() or self.game.get("hammer_cooldown", 0) > 0:
+            return False
+        return self._use_tool_at("hammer", row, col)
+
+    def trigger_cart(self, row):
+        """手动触发指定行的小推车"""
+        return self.gm.cart_manager.trigger_cart_in_row(row)
+
+    def close(self):
+        """注销回收统计回调，丢弃并删除临时存档"""
+        self.gm.gc_manager.close()
+        self.gm.game_db.close(flush=False)
+        try:
+            if os.path.exists(self.db_path):
+                os.remove(self.db_path)
+        except OSError as e:
+            print(f"删除临时存档失败: {e}")
@@ -7,26 +7,38 @@ import pygame
 import random
 import sys
 import os
+import time
 from animation import AnimationManager, PlantFlyingAnimation, Trophy
 from core.constants import *
 from rsc_mng.audio_manager import BackgroundMusicManager, initialize_sounds, play_sound_with_music_pause, set_sounds_volume
-from performance import PerformanceMonitor
-from rsc_mng.resource_loader import load_all_images, preload_scaled_images, initialize_fonts, get_images
-from database import GameDatabase, auto_save_game_progress, restore_game_from_save, check_level_has_save
+from performance import (PerformanceMonitor, GCManager, POOL_DEBUG, POOL_CHECK_INTERVAL_TICKS,
+                         check_object_pool_leaks, forget_active_pool_objects)
+from rsc_mng.resource_loader import (load_all_images, preload_scaled_images, prewarm_rotations,
+                                     initialize_fonts, get_images)
+from database import (open_game_database, auto_save_game_progress, restore_game_from_save, check_level_has_save,
+                      flush_all_stores, flush_due_stores)
 from core.game_logic import (
     create_zombie_for_level, update_bullets, update_plant_shooting,
     update_dandelion_seeds, update_hammer_cooldown, handle_plant_placement,
-    spawn_zombie_wave_fixed, update_card_cooldowns,
+    update_card_cooldowns, forget_zombie,
     handle_cucumber_fullscreen_explosion, update_cucumber_effects,
     update_freeze_effects, is_zombie_stunned, is_zombie_spraying,
     add_sun_safely,initialize_portal_system, update_portal_system, update_zombie_portal_interaction
 )
-from core.level_manager import LevelManager
+from core.area_query import ZombieAreaIndex
+from core.config_watcher import stop_all_config_watchers
+from core import sim_clock
+from core.replay import ReplayRecorder, CHECKSUM_INTERVAL_TICKS
+from core.snapshot import GameSnapshot, SnapshotHistory, build_resources
+from core.level_preparer import LevelPreparer, prepare_level
+from core.wave_planner import get_wave_planner
+from zombies import release_zombie
 from core.cards_manager import get_plant_select_grid_new, cards_manager, get_available_cards_new
 from shop import ShopManager, CartManager
 from core.game_state_manager import GameStateManager
 from core.event_handler import EventHandler
 from ui import PlantSelectionManager,RendererManager,PortalManager
+from ui.page_cache import page_cache
 
 
 
@@ -34,7 +46,7 @@ from ui import PlantSelectionManager,RendererManager,PortalManager
 class GameManager:
     """简化后的游戏管理器 - 协调各种专职管理器 levels"""
 
-    def __init__(self):
+    def __init__(self, game_db=None):
         # 初始化Pygame
 
         pygame.init()
@@ -54,17 +66,43 @@ class GameManager:
         # 热重载相关设置
         self.hot_reload_enabled = True  # 默认启用热重载
 
+        # 回放录制：每局新游戏自动录制，离开游戏时写入 replays 目录
+        self.replay_recorder = ReplayRecorder()
+        self.replay_recording_enabled = True
+        self.replay_playback = None  # 回放时由回放器设置
+        self.replay_tick = 0  # 本局开始后的逻辑帧计数，作为输入的时间戳
+
+        # 练习模式回退（F10 开关，Backspace 回退），关闭时为 None
+        self.practice_history = None
+
+        # 过渡动画期间在后台准备下一关
+        self.level_preparer = LevelPreparer()
+
+        # 上次落盘时所在的界面（见 update_game_logic）
+        self._persist_state = None
+
+        # 卡槽模型缓存（见 get_card_bar）
+        self._card_bar = None
+        self._card_bar_owner = None
+
+        # 固定步长主循环：逻辑帧与渲染帧分离
+        self.game_speed = 1  # 游戏倍速（F9 切换）
+        self.render_alpha = 1.0  # 渲染插值系数：距上一个逻辑帧已过去的比例
+
         # 初始化资源
         self.fonts = initialize_fonts()
         self.font_small, self.font_medium, self.font_large, self.font_tiny = self.fonts
         self.images = load_all_images()
         self.scaled_images = preload_scaled_images()
+        prewarm_rotations(self.images)
         self.sounds = initialize_sounds()
 
         # 初始化各种管理器
         self.music_manager = BackgroundMusicManager()
         self.performance_monitor = PerformanceMonitor()
-        self.game_db = GameDatabase()
+        self.gc_manager = GCManager()
+        # 允许外部传入数据库（无界面模拟时使用临时存档），默认使用 SQLite 存档
+        self.game_db = game_db if game_db is not None else open_game_database()
         # 为状态管理器设置数据库引用
         self.state_manager = GameStateManager()
         self.state_manager.game_db = self.game_db  # 传递数据库引用
@@ -97,7 +135,7 @@ class GameManager:
 
         # 游戏表面
         self.game_surface = pygame.Surface((BASE_WIDTH, BASE_HEIGHT))
-        self.shop_manager = ShopManager()
+        self.shop_manager = ShopManager(self.game_db)
         self.coins = self.game_db.get_coins()
 
         # 初始化小推车管理器
@@ -118,6 +156,9 @@ class GameManager:
 
             self.shop_manager.has_hammer = has_hammer
 
+        # 图片、音效、配置等常驻资源已加载完毕，移出分代回收
+        self.gc_manager.freeze_startup()
+
 
 
     def reset_carts(self):
@@ -187,6 +228,22 @@ class GameManager:
 
     def update_game_logic(self):
         """更新游戏逻辑"""
+        self.replay_tick += 1
+
+        # 自然停顿（过渡、选植物、暂停菜单、奖杯淡出等）时做完整回收
+        entered_pause = self.gc_manager.update_pause(self._natural_pause_reason())
+
+        # 写回式存档：切换界面或进入停顿时立即落盘，其余时间按定时器
+        if entered_pause or self.state_manager.game_state != self._persist_state:
+            self._persist_state = self.state_manager.game_state
+            flush_all_stores()
+        else:
+            flush_due_stores()
+
+        # 离开游戏界面时结束本局回放录制
+        if self.replay_recorder.active and self.state_manager.game_state != "playing":
+            self._finish_replay_recording()
+
         # 更新过渡动画
         should_load_game = self.state_manager.update_transition_animation()
         if should_load_game:
@@ -228,6 +285,9 @@ class GameManager:
 
             # 检查配置文件是否更新
             if self.hot_reload_enabled and self.game["level_manager"].check_hot_reload():
+                self.invalidate_card_bar()
+                # 选关提示框等页面缓存了关卡名，配置变化后重建
+                page_cache.invalidate()
                 self.animation_manager.show_config_reload_notification()
 
             # 更新卡片冷却时间
@@ -241,7 +301,35 @@ class GameManager:
             self._set_object_references()
 
             # 执行主游戏逻辑更新
+            sim_clock.advance()
+            self.gc_manager.begin_frame()
             self._update_main_game_logic()
+            self.gc_manager.end_frame()
+
+            # 练习模式定期保存快照；录制回放时定期记录状态摘要，回放时用来检查是否不同步
+            if self.practice_history is not None:
+                self.practice_history.record(self.replay_tick, self.snapshot)
+            if self.replay_recorder.active and self.replay_tick % CHECKSUM_INTERVAL_TICKS == 0:
+                self.replay_recorder.record_checksum(self.replay_tick, self.snapshot().digest())
+            # 调试模式下定期对照场上实体检查对象池的回收
+            if POOL_DEBUG and self.replay_tick % POOL_CHECK_INTERVAL_TICKS == 0:
+                check_object_pool_leaks(self._pooled_entities())
+
+    def _natural_pause_reason(self):
+        """当前的自然停顿原因，正常对局中返回 None"""
+        if self.state_manager.game_state != "playing":
+            return "menu"
+        if self.state_manager.is_in_transition():
+            return "transition"
+        if self.plant_selection_manager.show_plant_select:
+            return "plant_select"
+        if self.state_manager.should_pause_game_logic():
+            return "pause_menu"
+        if self.game["game_over"]:
+            return "game_over"
+        if self.game.get("fade_state", "none") != "none":
+            return "trophy_fade"
+        return None
 
     def _set_object_references(self):
         """设置游戏对象的图片和音效引用"""
@@ -286,24 +374,9 @@ class GameManager:
 
     def _update_main_game_logic(self):
         """更新主要游戏逻辑"""
-        # 1. 更新植物（向日葵产阳光）- 只调用一次
+        # 1. 更新植物（向日葵产阳光、射击、爆炸音效）- 只调用一次
         update_plant_shooting(self.game, self.game["level_manager"], sounds=self.sounds)
 
-        # 检查樱桃炸弹音效触发（直接检查植物状态）
-        for plant in self.game["plants"]:
-            if plant.plant_type == "cherry_bomb":
-                # 检查是否需要播放爆炸音效
-                if plant.should_play_explosion_sound():
-                    if self.sounds.get("cherry_explosion"):
-                        self.sounds["cherry_explosion"].play()
-                    plant.mark_sound_played()
-            elif plant.plant_type == "cucumber":
-                # 检查黄瓜是否需要播放爆炸音效
-                if plant.should_play_explosion_sound():
-                    if self.sounds.get("cherry_explosion"):
-                        self.sounds["cherry_explosion"].play()
-                    plant.mark_sound_played()
-
         # 2. 更新僵尸（移动/攻击）- 这里僵尸可能会攻击植物
         self._update_zombies()
 
@@ -402,6 +475,8 @@ class GameManager:
         新增方法：确保樱桃炸弹和黄瓜在被啃咬死亡时也能正确爆炸
         """
         plants_to_remove = []
+        # 爆炸范围查询共用的僵尸索引，首次查询时构建
+        area_index = ZombieAreaIndex(self.game["zombies"])
 
         for plant in self.game["plants"]:
             if plant.plant_type in ["cherry_bomb", "cucumber"]:
@@ -414,24 +489,21 @@ class GameManager:
                         plant.explode_cucumber()
 
                 # 检查是否刚刚爆炸（立即处理伤害）
-                if plant.has_exploded and not hasattr(plant, '_damage_applied'):
+                if plant.has_exploded and not plant.explosion_damage_applied:
                     if plant.plant_type == "cherry_bomb":
                         # 樱桃炸弹：处理3x3范围伤害
-                        explosion_area = plant.get_explosion_area()
-                        for zombie in self.game["zombies"]:
-                            zombie_grid_row = zombie.row
-                            zombie_grid_col = int(round(zombie.col))
-                            if (zombie_grid_row, zombie_grid_col) in explosion_area:
-                                self._apply_damage_to_zombie(zombie, plant.explosion_damage)
+                        for zombie in area_index.query_cells(plant.get_explosion_area()):
+                            self._apply_damage_to_zombie(zombie, plant.explosion_damage)
 
                     elif plant.plant_type == "cucumber":
                         # 黄瓜：处理全屏效果
                         cucumber_explosion_data = plant.get_fullscreen_explosion_data()
                         if cucumber_explosion_data:
                             handle_cucumber_fullscreen_explosion(self.game, cucumber_explosion_data, self.sounds)
+                            area_index.invalidate()
 
                     # 标记伤害已应用，避免重复伤害
-                    plant._damage_applied = True
+                    plant.explosion_damage_applied = True
 
                 # 检查爆炸植物是否应该被移除（爆炸动画完成）
                 if plant.should_be_removed:
@@ -456,19 +528,21 @@ class GameManager:
         if not level_mgr.wave_mode:
             level_mgr.start_wave_mode()
 
+        planner = get_wave_planner(self.game)
         self.game["wave_timer"] += 1
         if self.game["wave_timer"] >= WAVE_INTERVAL and level_mgr.current_wave < level_mgr.max_waves:
-            zombies_per_row = [random.randint(3, 4) for _ in range(GRID_HEIGHT)]
-            total_zombie_count = sum(zombies_per_row)
-
-            #  修复：先正式开始波次
-            level_mgr.start_wave(total_zombie_count)
+            # 开始波次，本波僵尸按出怪表陆续出场
+            planner.start_wave(level_mgr)
 
-            #  修复：再生成僵尸
-            spawn_zombie_wave_fixed(self.game, level_mgr.current_wave == 1, zombies_per_row, self.sounds)
+            # 第一波僵尸播放预警音效
+            if level_mgr.current_wave == 1 and self.sounds and self.sounds.get("wave_warning"):
+                self.sounds["wave_warning"].play()  # 普通播放，不暂停背景音乐
 
             self.game["wave_timer"] = 0
 
+        # 到了出场帧的僵尸进场
+        planner.update(self.game, self.sounds)
+
     def _update_normal_mode_spawning(self):
         """更新普通模式下的僵尸生成"""
         self.game["zombie_timer"] += 1
@@ -497,6 +571,8 @@ class GameManager:
                 # 检查死亡动画是否结束
                 if zombie.death_animation_timer <= 0:
                     self.game["zombies"].remove(zombie)
+                    forget_zombie(self.game, zombie)
+                    release_zombie(zombie)
 
                     # 更新击杀计数器（只在非波次模式下计算）
                     if not self.game["wave_mode"]:
@@ -531,10 +607,7 @@ class GameManager:
             # 检查僵尸是否正在喷射，如果是则创建喷射粒子
             # 修改：降低粒子创建频率，每10帧创建一次，而不是每帧都创建
             if is_zombie_spraying(self.game, zombie):
-                # 添加一个计数器，每10帧创建一次粒子
-                if not hasattr(zombie, 'spray_particle_timer'):
-                    zombie.spray_particle_timer = 0
-
+                # 每个僵尸的计数器，每10帧创建一次粒子
                 zombie.spray_particle_timer += 1
 
                 # 每10帧创建一次粒子，而且数量固定为1-2个
@@ -654,10 +727,30 @@ class GameManager:
 
     def get_available_cards_for_current_state(self):
         """获取当前状态下的可用卡片 - 修复：支持第七卡槽，解决空选择状态bug"""
+        return self.get_card_bar()
+
+    def get_card_bar(self):
+        """
+        获取缓存的卡槽卡片列表（卡片的点击区域由 ui.hit_test.build_playing_layout 按数量生成）
+        每帧渲染和每次鼠标事件都会读取，只在关卡开始、选卡完成、商店购买和配置重载时重建
+        """
         if self.plant_selection_manager.show_plant_select:
-            # 植物选择期间：只显示已完成选择的植物卡片（不包含飞行中的）
+            # 植物选择期间：只显示已完成选择的植物卡片（不包含飞行中的），随选择变化不缓存
             return self.plant_selection_manager.get_selected_plant_cards()
-        elif (self.game["level_manager"].current_level >= 9 and
+
+        level_manager = self.game["level_manager"]
+        if self._card_bar is None or self._card_bar_owner is not level_manager:
+            self._card_bar = self._build_card_bar_cards()
+            self._card_bar_owner = level_manager
+        return self._card_bar
+
+    def invalidate_card_bar(self):
+        """卡槽内容可能变化时调用，下次读取时重建"""
+        self._card_bar = None
+
+    def _build_card_bar_cards(self):
+        """根据关卡、选卡结果和商店购买情况生成卡槽卡片"""
+        if (self.game["level_manager"].current_level >= 9 and
               self.plant_selection_manager.has_selected_plants()):
             # 已选择植物，显示选中的植物卡片
             base_cards = get_available_cards_new(self.game["level_manager"], self.level_settings,
@@ -723,19 +816,30 @@ class GameManager:
         # 第8关及以下的关卡，只有不在植物选择界面时才保存
         return not self.plant_selection_manager.show_plant_select
 
+    def begin_level_transition(self):
+        """开始进入关卡的过渡动画，同时在后台准备待加载的关卡（需先 set_pending_game_data）"""
+        pending_data, pending_level = self.state_manager.get_pending_game_data()
+        self.level_preparer.start(pending_level, pending_data, self.images, self.sounds)
+        self.state_manager.start_level_transition_animation()
+
     def load_pending_game_data(self):
         """
         加载待处理的游戏数据
         修复：改进植物选择状态的恢复逻辑
+        过渡动画期间已在后台准备好的关卡直接换入，没有时（如无头模式直接加载）当场准备
         """
         pending_data, pending_level = self.state_manager.get_pending_game_data()
+        prepared = self.level_preparer.take(pending_level, pending_data)
+        if prepared is None:
+            prepared = prepare_level(pending_level, pending_data, self.images, self.sounds)
+        replay_seed = self._seed_level_session(pending_data)
+        self.invalidate_card_bar()
 
         if pending_data:
             # 加载保存的游戏
-            level_manager = LevelManager("database/levels.json")
-            level_manager.start_level(pending_level)
+            level_manager = prepared.level_manager
             # 修改：传入 game_manager 参数以恢复植物选择状态
-            restored_game = restore_game_from_save(pending_data, level_manager, self)
+            restored_game = restore_game_from_save(pending_data, level_manager, self, prepared.decoded)
             if restored_game:
                 self.game = restored_game
                 music_state = pending_data.get("music_state", {})
@@ -755,7 +859,7 @@ class GameManager:
                 self.reset_carts()
         else:
             # 开始新游戏
-            self.game = self.state_manager.reset_game(pending_level)
+            self.game = self.state_manager.reset_game(pending_level, prepared.level_manager)
             # 新游戏时重置小推车
             self.reset_carts()
 
@@ -792,9 +896,7 @@ class GameManager:
                 self.plant_selection_manager.show_plant_selection()
                 self.animation_manager.reset_plant_select_animation()
                 # 第9关及以上：根据关卡特性显示植物选择界面
-                level_manager = LevelManager("database/levels.json")
-                level_manager.start_level(pending_level)
-                self.plant_selection_manager.init_plant_select_grid(level_manager)
+                self.plant_selection_manager.init_plant_select_grid(prepared.level_manager)
                 # 修复：只有在新游戏时才清空选中植物列表
                 if not hasattr(self, '_returning_to_plant_select'):
                     self.plant_selection_manager.selected_plants_for_game = []
@@ -813,9 +915,7 @@ class GameManager:
                     print("检测到空的植物选择状态，重新初始化植物选择界面")
                     self.plant_selection_manager.show_plant_selection()
                     self.animation_manager.reset_plant_select_animation()
-                    level_manager = LevelManager("database/levels.json")
-                    level_manager.start_level(pending_level)
-                    self.plant_selection_manager.init_plant_select_grid(level_manager)
+                    self.plant_selection_manager.init_plant_select_grid(prepared.level_manager)
                     self.plant_selection_manager.selected_plants_for_game = []
                     self.plant_selection_manager.flying_plants = []
 
@@ -843,6 +943,128 @@ class GameManager:
             if "hammer_cooldown" not in self.game:
                 self.game["hammer_cooldown"] = 0
 
+        self._start_replay_recording(replay_seed, pending_level)
+
+    def _seed_level_session(self, pending_data):
+        """为新的一局设定随机种子，返回种子（不录制时返回 None）"""
+        if self.replay_recorder.active:
+            self._finish_replay_recording()
+        self.replay_tick = 0
+        if self.practice_history is not None:
+            self.practice_history.clear()
+        # 上一局留在场上的实体随旧对局丢弃，对象池不再追踪
+        forget_active_pool_objects()
+
+        if self.replay_playback is not None:
+            return self.replay_playback.seed_session()
+
+        # 从存档继续的对局无法从头重现，不录制
+        if pending_data or not self.replay_recording_enabled:
+            return None
+
+        seed = random.randrange(1 << 63)
+        random.seed(seed)
+        return seed
+
+    def _start_replay_recording(self, seed, level_num):
+        """关卡加载完成后开始录制（回放时改为应用录制时的配置）"""
+        if self.replay_playback is not None:
+            self.replay_playback.on_level_loaded(self)
+            return
+        if seed is None:
+            return
+
+        metadata = {
+            "level_config": self.game["level_manager"].level_config,
+            "level_settings": self.level_settings,
+            "purchased_items": sorted(self.shop_manager.purchased_items),
+            "initial_sun": self.game["sun"],
+            "recorded_at": time.strftime("%Y-%m-%d %H:%M:%S")
+        }
+        self.replay_recorder.start(seed, level_num, sim_clock.get_tick(), metadata)
+
+    def _finish_replay_recording(self):
+        """结束录制并写盘"""
+        path = self.replay_recorder.finish(self.replay_tick)
+        if path:
+            print(f"回放已保存: {path}")
+
+    def record_replay_input(self, kind, pos=(0.0, 0.0)):
+        """记录一条游戏内输入（由事件处理器调用）"""
+        if self.replay_recorder.active and self.state_manager.game_state == "playing":
+            self.replay_recorder.record(self.replay_tick, kind, pos[0], pos[1])
+
+    def get_effective_game_speed(self):
+        """当前实际生效的倍速：只在战斗进行中加速，菜单、暂停和选卡界面保持原速"""
+        if (self.game_speed > 1 and
+                self.state_manager.game_state == "playing" and
+                not self.game["game_over"] and
+                not self.state_manager.should_pause_game_logic() and
+                not self.plant_selection_manager.show_plant_select):
+            return self.game_speed
+        return 1
+
+    def cycle_game_speed(self):
+        """切换游戏倍速（1x -> 2x -> 4x -> 1x）"""
+        index = GAME_SPEEDS.index(self.game_speed) if self.game_speed in GAME_SPEEDS else -1
+        self.game_speed = GAME_SPEEDS[(index + 1) % len(GAME_SPEEDS)]
+        print(f"游戏倍速: {self.game_speed}x")
+
+    def _snapshot_resources(self):
+        return build_resources(self.game["level_manager"], self.images, self.sounds)
+
+    def snapshot(self):
+        """当前对局的快照（包括小推车），用于练习模式回退和回放一致性校验"""
+        return GameSnapshot.capture(self.game, self._snapshot_resources(),
+                                    carts=self.cart_manager.carts, tick=self.replay_tick)
+
+    def _pooled_entities(self):
+        """场上来自对象池的实体（僵尸、子弹、蒲公英种子）"""
+        game = self.game
+        return game["zombies"] + game["bullets"] + game.get("dandelion_seeds", [])
+
+    def restore(self, snapshot):
+        """恢复到快照时的对局状态（同一关卡内），快照本身不受影响，可以反复恢复"""
+        game, carts = snapshot.restore_state(self._snapshot_resources())
+        self.game = game
+        # 快照恢复出的是新对象，被替换的实体不再回收
+        forget_active_pool_objects()
+        if carts is not None:
+            self.cart_manager.carts = carts
+        if snapshot.tick is not None:
+            self.replay_tick = snapshot.tick
+        self._set_object_references()
+        self.invalidate_card_bar()
+
+    def toggle_practice_rewind(self):
+        """切换练习模式回退（开启后每秒保存一份快照）"""
+        if self.practice_history is None:
+            self.practice_history = SnapshotHistory()
+            print("练习模式回退已启用")
+        else:
+            self.practice_history = None
+            print("练习模式回退已禁用")
+
+    def rewind_practice(self, seconds=5):
+        """练习模式下回退若干秒，返回是否回退成功"""
+        if self.practice_history is None or self.state_manager.game_state != "playing":
+            return False
+        snapshot = self.practice_history.rewind(self.replay_tick, seconds * sim_clock.TICKS_PER_SECOND)
+        if snapshot is None:
+            return False
+        # 回退后的对局无法按录制的输入重现，放弃本局录制
+        if self.replay_recorder.active:
+            self.replay_recorder.cancel()
+            print("已回退，本局回放录制取消")
+        self.restore(snapshot)
+        return True
+
+    def toggle_replay_recording(self):
+        """切换回放录制功能（从下一局开始生效）"""
+        self.replay_recording_enabled = not self.replay_recording_enabled
+        status = "已启用" if self.replay_recording_enabled else "已禁用"
+        print(f"回放录制{status}")
+
     def manual_reload_config(self):
         """手动重新加载配置"""
         if self.state_manager.game_state == "playing":
@@ -851,6 +1073,8 @@ class GameManager:
             new_name = self.game["level_manager"].get_level_name()
 
             if old_name != new_name or reloaded:
+                self.invalidate_card_bar()
+                page_cache.invalidate()
                 self.animation_manager.show_config_reload_notification()
                 print(f"配置已重新加载：{new_name}")
 
@@ -877,6 +1101,7 @@ class GameManager:
                 print(f"版本: {config_info['version']}")
                 print(f"总关卡数: {config_info['total_levels']}")
                 print(f"热重载: {'启用' if config_info['hot_reload'] else '禁用'}")
+                print(f"监听方式: {config_info['watch_backend']}")
                 if features_info:
                     print(features_info)
                 print("===================")
@@ -967,6 +1192,8 @@ class GameManager:
 
     def run(self):
         running = True
+        accumulator = 0.0
+        last_time = time.perf_counter()
         while running:
             # 检查游戏状态是否改变，如果改变则切换音乐
             self.state_manager.update_game_state_music(self.music_manager)
@@ -983,8 +1210,23 @@ class GameManager:
             if not running:
                 break
 
-            # 更新游戏逻辑
-            self.update_game_logic()
+            # 按实际经过的时间推进固定步长的逻辑帧
+            now = time.perf_counter()
+            frame_time = min(now - last_time, MAX_FRAME_SECONDS)
+            last_time = now
+            accumulator += frame_time * self.get_effective_game_speed()
+
+            substeps = 0
+            while accumulator >= LOGIC_TICK_SECONDS and substeps < MAX_SUBSTEPS:
+                self.renderer_manager.capture_previous_positions()
+                self.update_game_logic()
+                accumulator -= LOGIC_TICK_SECONDS
+                substeps += 1
+
+            # 达到补帧上限仍未追上时丢弃积压的时间，宁可变慢也不卡死
+            if substeps >= MAX_SUBSTEPS:
+                accumulator = min(accumulator, LOGIC_TICK_SECONDS)
+            self.render_alpha = min(accumulator / LOGIC_TICK_SECONDS, 1.0)
 
             # 渲染游戏
             self.renderer_manager.render_game()
@@ -996,6 +1238,17 @@ class GameManager:
         if self.state_manager.game_state == "playing" and not self.game["game_over"]:
             self.game_db.save_game_progress(self.game, self.music_manager, self)
 
+        # 写出未完成的回放
+        if self.replay_recorder.active:
+            self._finish_replay_recording()
+
+        # 写出所有未保存的进度和购买记录，并关闭存档
+        flush_all_stores()
+        self.game_db.close()
+
+        # 停止配置文件监听线程
+        stop_all_config_watchers()
+
         pygame.mixer.music.stop()
         pygame.quit()
         sys.exit()
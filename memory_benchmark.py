@@ -0,0 +1,231 @@
+"""
+实体内存基准 - 统计僵尸、植物、子弹、种子、粒子每个实例占用的字节数，
+以及满屏实体（默认 2000 个）运行若干逻辑帧时的峰值内存和每帧临时内存
+运行方式：
+    python memory_benchmark.py
+    python memory_benchmark.py --entities 2000 --ticks 120 --out memory.json
+    python memory_benchmark.py --transient-budget 256   # 每帧平均临时内存（KB）超出预算时返回非0
+
+每实例字节数用 tracemalloc 统计，包含实例本身和 __init__ 中创建的列表、集合等；
+峰值 RSS 依赖 resource 模块（Linux/macOS），其他平台只报告 Python 堆峰值；
+每帧临时内存 = 该帧内 Python 堆的最高点减去帧开始时的占用（tracemalloc 每帧重置峰值），
+热点路径上新增的临时列表、字典等会直接反映在这里；
+每帧净增对象数来自 GCManager（gc 跟踪的容器对象分配减释放），只反映留存下来的对象
+"""
+import argparse
+import gc
+import json
+import random
+import sys
+import tracemalloc
+
+# 导入 headless 会先设置虚拟显示和音频设备
+from headless import HeadlessSession
+from core.constants import GRID_WIDTH, GRID_HEIGHT, get_constants
+from performance import get_object_pool_stats
+
+# 每种实体采样的实例数
+SAMPLE_COUNT = 2000
+# 满屏基准中僵尸、子弹、种子的数量比例（植物固定铺满战场）
+BOARD_MIX = (("zombie", 0.45), ("bullet", 0.4), ("seed", 0.15))
+BULLET_TYPES = ("pea", "melon", "spike", "ice")
+PLANT_TYPES = ("sunflower", "shooter", "melon_pult", "cattail", "ice_cactus",
+               "lightning_flower", "dandelion", "wall_nut", "cherry_bomb", "cucumber")
+
+
+def _entity_factories():
+    """实体名 -> 创建单个实例的函数(序号)"""
+    import bullets
+    from plants import Plant, ExplosionParticle, CucumberSprayParticle
+    from zombies import create_zombie
+
+    constants = get_constants()
+
+    def zombie(i, zombie_type="normal"):
+        return create_zombie(i % GRID_HEIGHT, zombie_type, constants=constants)
+
+    factories = {
+        "normal_zombie": zombie,
+        "giant_zombie": lambda i: zombie(i, "giant"),
+        "dandelion_seed": lambda i: bullets.create_seed(i % GRID_WIDTH, i % GRID_HEIGHT, None, constants),
+        "explosion_particle": lambda i: ExplosionParticle(0, 0),
+        "spray_particle": lambda i: CucumberSprayParticle(0, 0),
+    }
+    for bullet_type in BULLET_TYPES:
+        factories[f"{bullet_type}_bullet"] = (
+            lambda i, t=bullet_type: bullets.create_bullet(t, i % GRID_HEIGHT, 0, constants=constants))
+    for plant_type in PLANT_TYPES:
+        factories[plant_type] = (
+            lambda i, t=plant_type: Plant(i % GRID_HEIGHT, i % GRID_WIDTH, t, constants, None, None))
+    return factories
+
+
+def measure_entity_bytes(factory, count=SAMPLE_COUNT):
+    """创建 count 个实例，返回平均每个实例新增的字节数"""
+    gc.collect()
+    holder = [None] * count
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for i in range(count):
+            holder[i] = factory(i)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return (after - before) / count
+
+
+def _peak_rss_bytes():
+    """进程峰值常驻内存（字节），平台不支持时返回 None"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 单位为 KB，macOS 为字节
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_board(entity_count, ticks, level=12, seed=0):
+    """铺满植物并放入 entity_count 个实体，运行 ticks 个逻辑帧，返回内存统计"""
+    import bullets
+    from plants import Plant
+    from zombies import create_zombie
+
+    session = HeadlessSession()
+    try:
+        session.start_level(level, seed=seed)
+        game = session.game
+        constants = get_constants()
+        rng = random.Random(seed)
+
+        gc.collect()
+        tracemalloc.start()
+        for row in range(GRID_HEIGHT):
+            for col in range(GRID_WIDTH):
+                if game["plants"].get(row, col) is None:
+                    plant_type = PLANT_TYPES[(row * GRID_WIDTH + col) % len(PLANT_TYPES)]
+                    game["plants"].append(Plant(row, col, plant_type, constants, None, game["level_manager"]))
+
+        plant_count = len(game["plants"])
+        remaining = max(0, entity_count - plant_count)
+        counts = {name: int(remaining * share) for name, share in BOARD_MIX}
+        counts["zombie"] += remaining - sum(counts.values())
+
+        for i in range(counts["zombie"]):
+            zombie = create_zombie(rng.randrange(GRID_HEIGHT), "giant" if i % 10 == 0 else "normal",
+                                   constants=constants)
+            zombie.col = rng.uniform(GRID_WIDTH - 3, GRID_WIDTH)
+            game["zombies"].append(zombie)
+        for i in range(counts["bullet"]):
+            game["bullets"].append(bullets.create_bullet(
+                BULLET_TYPES[i % len(BULLET_TYPES)], rng.randrange(GRID_HEIGHT),
+                rng.uniform(0, GRID_WIDTH - 3), constants=constants))
+        game.setdefault("dandelion_seeds", [])
+        for _ in range(counts["seed"]):
+            game["dandelion_seeds"].append(bullets.create_seed(
+                rng.uniform(0, GRID_WIDTH), rng.randrange(GRID_HEIGHT), None, constants))
+
+        board_bytes = tracemalloc.get_traced_memory()[0]
+        heap_peak = tracemalloc.get_traced_memory()[1]
+        session.gm.gc_manager.frame_retained.clear()
+        transient = []
+        for _ in range(ticks):
+            start = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            session.step()
+            peak = tracemalloc.get_traced_memory()[1]
+            transient.append(peak - start)
+            heap_peak = max(heap_peak, peak)
+        tracemalloc.stop()
+
+        return {
+            "entities": plant_count + sum(counts.values()),
+            "plants": plant_count,
+            "zombies": counts["zombie"],
+            "bullets": counts["bullet"],
+            "seeds": counts["seed"],
+            "ticks": ticks,
+            "board_bytes": board_bytes,
+            "heap_peak_bytes": heap_peak,
+            "peak_rss_bytes": _peak_rss_bytes(),
+            "transient_bytes": _frame_stats(transient),
+            "retained_objects": session.gm.gc_manager.get_retention_stats(),
+            "object_pools": get_object_pool_stats(),
+        }
+    finally:
+        session.close()
+
+
+def _frame_stats(values):
+    """每帧数值的平均、P95 和最大值"""
+    frames = sorted(values)
+    if not frames:
+        return {}
+    return {
+        "frames": len(frames),
+        "mean": sum(frames) / len(frames),
+        "p95": frames[min(len(frames) - 1, int(len(frames) * 0.95))],
+        "max": frames[-1],
+    }
+
+
+def main():
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="实体内存基准")
+    parser.add_argument("--entities", type=int, default=2000, help="满屏基准的实体总数")
+    parser.add_argument("--ticks", type=int, default=120, help="满屏基准运行的逻辑帧数")
+    parser.add_argument("--samples", type=int, default=SAMPLE_COUNT, help="每种实体的采样实例数")
+    parser.add_argument("--transient-budget", type=float, default=None,
+                        help="每帧平均临时内存上限（KB），超出时返回非0")
+    parser.add_argument("--out", default=None, help="JSON 输出路径")
+    args = parser.parse_args()
+
+    random.seed(0)
+    per_entity = {name: measure_entity_bytes(factory, args.samples)
+                  for name, factory in _entity_factories().items()}
+
+    # 基准过程中的调试输出没有意义，直接丢弃
+    stdout = sys.stdout
+    with open(__import__("os").devnull, 'w', encoding='utf-8') as devnull:
+        sys.stdout = devnull
+        try:
+            board = run_board(args.entities, args.ticks)
+        finally:
+            sys.stdout = stdout
+
+    print("每个实例占用（字节，含 __init__ 中创建的容器）：")
+    for name, size in per_entity.items():
+        print(f"  {name:<20}{size:>10.0f}")
+    print(f"满屏基准：{board['entities']} 个实体（植物 {board['plants']}，僵尸 {board['zombies']}，"
+          f"子弹 {board['bullets']}，种子 {board['seeds']}），运行 {board['ticks']} 帧")
+    print(f"  实体占用 {board['board_bytes'] / 1024:.1f} KB，Python 堆峰值 {board['heap_peak_bytes'] / 1024:.1f} KB")
+    if board["peak_rss_bytes"] is not None:
+        print(f"  进程峰值 RSS {board['peak_rss_bytes'] / 1024 / 1024:.1f} MB")
+    else:
+        print("  当前平台不支持统计峰值 RSS")
+    transient = board["transient_bytes"]
+    if transient:
+        print(f"  每帧临时内存：平均 {transient['mean'] / 1024:.1f} KB，P95 {transient['p95'] / 1024:.1f} KB，"
+              f"最大 {transient['max'] / 1024:.1f} KB")
+    retained = board["retained_objects"]
+    if retained:
+        print(f"  每帧净增对象：平均 {retained['mean']:.0f}，P95 {retained['p95']}，最大 {retained['max']}，"
+              f"帧内自动回收 {retained['frame_collections']}（{retained['frame_collect_ms']:.1f} ms）")
+    for name, stats in board["object_pools"].items():
+        if stats["created"] or stats["reused"]:
+            print(f"  对象池 {name}：新建 {stats['created']}，复用 {stats['reused']}（命中率 {stats['hit_rate']:.0%}），"
+                  f"空闲 {stats['free']}，待回收 {stats['pending']}")
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump({"per_entity_bytes": per_entity, "board": board}, f, ensure_ascii=False, indent=2)
+        print(f"结果已写入 {args.out}")
+
+    if args.transient_budget is not None and transient and transient["mean"] / 1024 > args.transient_budget:
+        print(f"每帧平均临时内存 {transient['mean'] / 1024:.1f} KB 超出预算 {args.transient_budget:.0f} KB")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,23 @@
 性能监控模块
 """
 import pygame
+import os
+import sys
 import time
+import weakref
 from collections import deque
 import gc
 
+# 游戏帧循环使用的分代回收阈值：启动资源冻结后年轻代很小，放宽0代阈值减少回收次数，
+# 老年代阈值设得很高，完整回收基本只在自然停顿时由 GCManager 主动触发
+FRAME_GC_THRESHOLDS = (5000, 20, 1000)
+# 每帧净增对象统计保留的帧数
+RETAINED_HISTORY_FRAMES = 600
+# 对象池泄漏检查（调试用，设置环境变量 PVZ_POOL_DEBUG=1 开启）
+POOL_DEBUG = os.environ.get("PVZ_POOL_DEBUG") == "1"
+# 开启泄漏检查时每隔多少逻辑帧检查一次
+POOL_CHECK_INTERVAL_TICKS = 300
+
 
 class PerformanceMonitor:
     """高级性能监控器，提供多级性能调整和智能优化"""
@@ -30,10 +43,6 @@ class PerformanceMonitor:
         self.consecutive_good_fps = 0
         self.adjustment_threshold = 30  # 30帧连续低性能才调整
 
-        # 内存监控
-        self.last_gc_time = time.perf_counter()
-        self.gc_interval = 5.0  # 5秒强制GC一次
-
         # 性能统计
         self.total_frames = 0
         self.dropped_frames = 0
@@ -70,11 +79,6 @@ class PerformanceMonitor:
         if self.total_frames % self.performance_check_interval == 0:
             self._evaluate_and_adjust_performance()
 
-        # 智能垃圾回收
-        if current_time - self.last_gc_time > self.gc_interval:
-            self._smart_garbage_collection()
-            self.last_gc_time = current_time
-
     def _evaluate_and_adjust_performance(self):
         """评估性能并自动调整"""
         current_fps = self.get_avg_fps()
@@ -99,15 +103,6 @@ class PerformanceMonitor:
             self.performance_level = min(4, self.performance_level + 1)
             self.consecutive_good_fps = 0
 
-    def _smart_garbage_collection(self):
-        """智能垃圾回收，避免卡顿"""
-        # 只在性能充足时进行完整GC
-        if self.get_short_term_fps() > self.fps_thresholds['good']:
-            gc.collect()
-        else:
-            # 性能不足时只进行轻量级清理
-            gc.collect(0)
-
     def get_avg_fps(self):
         """获取长期平均FPS"""
         if not self.frame_times:
@@ -167,6 +162,113 @@ class PerformanceMonitor:
         return intervals.get(self.performance_level, 1)
 
 
+class GCManager:
+    """垃圾回收管理：冻结启动资源、调整分代阈值、只在自然停顿时完整回收，并统计每帧净增的对象数"""
+
+    def __init__(self, thresholds=FRAME_GC_THRESHOLDS):
+        self.thresholds = thresholds
+        self._default_thresholds = gc.get_threshold()
+        self.frozen_count = 0
+
+        # 停顿检测：进入停顿时回收一次，停顿期间不再重复
+        self.in_pause = False
+        self.pause_collections = 0
+        self.last_pause_reason = None
+        self.last_pause_collect_ms = 0.0
+
+        # 每帧净增的 gc 跟踪容器对象数（0代计数在分配时加一、释放时减一，回收时把回收前的计数累加进来）
+        # 帧内创建又释放的临时对象会互相抵消，这里反映的是留存下来的对象，不是分配次数
+        self.frame_retained = deque(maxlen=RETAINED_HISTORY_FRAMES)
+        self._frame_active = False
+        self._frame_retained = 0
+        self._frame_base = 0
+        # 帧内发生的自动回收次数（按代），用于发现帧循环中的回收卡顿
+        self.frame_collections = [0, 0, 0]
+        self.frame_collect_ms = 0.0
+        self._collect_start = 0.0
+
+        gc.callbacks.append(self._on_gc)
+
+    def freeze_startup(self):
+        """启动资源（图片、音效、配置）加载完成后调用，把现存对象移出分代回收"""
+        gc.collect()
+        gc.freeze()
+        self.frozen_count = gc.get_freeze_count()
+        gc.set_threshold(*self.thresholds)
+
+    def restore_defaults(self):
+        """恢复解释器默认的回收阈值并解冻对象"""
+        gc.set_threshold(*self._default_thresholds)
+        gc.unfreeze()
+        self.frozen_count = 0
+
+    def close(self):
+        """注销回调"""
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+
+    # ---------- 停顿时回收 ----------
+
+    def update_pause(self, reason):
+        """每帧调用，reason 为当前的停顿原因（None 表示正在游戏）；刚进入停顿时做一次完整回收"""
+        if reason is None:
+            self.in_pause = False
+            return False
+        if self.in_pause:
+            return False
+
+        self.in_pause = True
+        self.last_pause_reason = reason
+        start = time.perf_counter()
+        gc.collect()
+        self.last_pause_collect_ms = (time.perf_counter() - start) * 1000
+        self.pause_collections += 1
+        return True
+
+    # ---------- 每帧净增对象统计 ----------
+
+    def begin_frame(self):
+        """逻辑帧开始"""
+        self._frame_active = True
+        self._frame_retained = 0
+        self._frame_base = gc.get_count()[0]
+
+    def end_frame(self):
+        """逻辑帧结束，返回本帧净增的对象数"""
+        retained = self._frame_retained + gc.get_count()[0] - self._frame_base
+        self._frame_active = False
+        self.frame_retained.append(retained)
+        return retained
+
+    def _on_gc(self, phase, info):
+        """gc 回调：回收会清零0代计数，先把本帧已有的计数记下来"""
+        if phase == "start":
+            self._collect_start = time.perf_counter()
+            if self._frame_active:
+                self._frame_retained += gc.get_count()[0] - self._frame_base
+                self.frame_collections[info["generation"]] += 1
+        else:
+            if self._frame_active:
+                self._frame_base = gc.get_count()[0]
+                self.frame_collect_ms += (time.perf_counter() - self._collect_start) * 1000
+
+    def get_retention_stats(self):
+        """每帧净增对象数统计"""
+        frames = sorted(self.frame_retained)
+        if not frames:
+            return {}
+        return {
+            'frames': len(frames),
+            'mean': sum(frames) / len(frames),
+            'p95': frames[min(len(frames) - 1, int(len(frames) * 0.95))],
+            'max': frames[-1],
+            'frame_collections': list(self.frame_collections),
+            'frame_collect_ms': self.frame_collect_ms,
+            'pause_collections': self.pause_collections,
+            'frozen_objects': self.frozen_count,
+        }
+
+
 class SpatialGrid:
     """高性能空间分区系统"""
 
@@ -291,40 +393,126 @@ class SpatialGrid:
 
 
 class ObjectPool:
-    """通用对象池，减少对象创建和销毁的开销"""
+    """通用对象池，减少对象创建和销毁的开销
+    回收的对象先放进待回收列表，确认除对象池外没有其他引用（包括弱引用）后才会复用；
+    取出时用 reset_func(obj, *args, **kwargs) 按新参数重新初始化，没有可复用的对象时调用 create_func"""
 
-    def __init__(self, create_func, reset_func=None, max_size=100):
+    def __init__(self, create_func, reset_func=None, max_size=100, name=None):
         self.create_func = create_func
         self.reset_func = reset_func
-        self.pool = deque(maxlen=max_size)
-        self.active_objects = set()
+        self.max_size = max_size
+        self.name = name or getattr(create_func, "__name__", "object")
+        self.pool = deque()  # 可以直接复用的对象
+        self.pending = []  # 刚回收、可能仍被引用的对象
+        self.active_objects = set()  # 从对象池取出、尚未回收的对象 id（只在泄漏检查开启时记录）
+
+        # 统计
+        self.created = 0
+        self.reused = 0
+        self.released = 0
+        self.dropped = 0  # 对象池已满而直接丢弃的回收对象
+
+        _object_pools.append(self)
+
+    def _collect(self):
+        """把已经没有其他引用的对象移到可复用队列"""
+        pending = []
+        for obj in self.pending:
+            # 引用只剩待回收列表、循环变量和 getrefcount 的参数
+            if sys.getrefcount(obj) <= 3 and not weakref.getweakrefcount(obj):
+                self.pool.append(obj)
+            else:
+                pending.append(obj)
+        self.pending = pending
+
+    def get_object(self, *args, **kwargs):
+        """从对象池获取对象，参数原样传给 reset_func 或 create_func"""
+        if not self.pool and self.pending:
+            self._collect()
 
-    def get_object(self):
-        """从对象池获取对象"""
         if self.pool:
             obj = self.pool.popleft()
             if self.reset_func:
-                self.reset_func(obj)
+                self.reset_func(obj, *args, **kwargs)
+            self.reused += 1
         else:
-            obj = self.create_func()
+            obj = self.create_func(*args, **kwargs)
+            self.created += 1
 
-        self.active_objects.add(id(obj))
+        if POOL_DEBUG:
+            self.active_objects.add(id(obj))
         return obj
 
     def return_object(self, obj):
-        """将对象返回到对象池"""
-        obj_id = id(obj)
-        if obj_id in self.active_objects:
-            self.active_objects.remove(obj_id)
-            if len(self.pool) < self.pool.maxlen:
-                self.pool.append(obj)
+        """将对象返回到对象池（不是从对象池取出的对象也可以回收，同一对象不能重复回收）"""
+        self.active_objects.discard(id(obj))
+        if len(self.pool) + len(self.pending) < self.max_size:
+            self.pending.append(obj)
+            self.released += 1
+        else:
+            self.dropped += 1
+
+    def forget_active(self):
+        """不再追踪已取出的对象（换关或回退时旧对局的对象直接丢弃）"""
+        self.active_objects.clear()
+
+    def get_stats(self):
+        """对象池统计信息"""
+        requests = self.created + self.reused
+        return {
+            "free": len(self.pool),
+            "pending": len(self.pending),
+            "active": len(self.active_objects),
+            "created": self.created,
+            "reused": self.reused,
+            "released": self.released,
+            "dropped": self.dropped,
+            "hit_rate": self.reused / requests if requests else 0.0,
+        }
 
     def cleanup(self):
         """清理对象池"""
         self.pool.clear()
+        self.pending = []
         self.active_objects.clear()
 
 
+# 所有对象池，供统计和泄漏检查
+_object_pools = []
+
+
+def get_object_pool_stats():
+    """各对象池的统计信息（按对象池名称）"""
+    return {pool.name: pool.get_stats() for pool in _object_pools}
+
+
+def forget_active_pool_objects():
+    """所有对象池都不再追踪已取出的对象"""
+    for pool in _object_pools:
+        pool.forget_active()
+
+
+def check_object_pool_leaks(live_objects):
+    """调试用：对照场上的实体检查对象池，返回发现的问题数
+    已回收的对象仍在场上说明回收过早；从对象池取出的对象既不在场上又没有回收，说明漏了回收"""
+    live_ids = {id(obj) for obj in live_objects}
+    problems = 0
+    for pool in _object_pools:
+        recycled_live = sum(1 for obj in pool.pool if id(obj) in live_ids)
+        recycled_live += sum(1 for obj in pool.pending if id(obj) in live_ids)
+        if recycled_live:
+            print(f"对象池 {pool.name}: {recycled_live} 个已回收的对象仍在场上")
+            problems += recycled_live
+
+        missing = pool.active_objects - live_ids
+        if missing:
+            print(f"对象池 {pool.name}: {len(missing)} 个对象离场后没有回收")
+            problems += len(missing)
+            # 只报告一次
+            pool.active_objects -= missing
+    return problems
+
+
 class BatchProcessor:
     """批量处理器，减少频繁的单个更新操作"""
 
@@ -8,6 +8,18 @@ import pygame
 class BasePlant:
     """基础植物类，包含所有植物共享的属性和方法"""
 
+    # 行为声明（对应 core.game_logic 中的行为注册表），非射击植物保持 None
+    targeting = None  # 目标检测方式
+    fire_action = None  # 开火动作
+    fire_sound = None  # 开火音效
+    explosion_sound = None  # 爆炸音效
+
+    # 所有字段在这里声明，实例不再带 __dict__；子类只声明自己新增的字段
+    __slots__ = (
+        'row', 'col', 'plant_type', 'health', 'max_health', 'constants', 'images', 'level_manager',
+        'has_exploded', 'should_be_removed', 'explosion_sound_played', 'explosion_damage_applied',
+    )
+
     def __init__(self, row, col, plant_type=None, constants=None, images=None, level_manager=None):
         self.row = row
         self.col = col
@@ -30,6 +42,7 @@ class BasePlant:
         self.has_exploded = False
         self.should_be_removed = False
         self.explosion_sound_played = False
+        self.explosion_damage_applied = False  # 爆炸伤害是否已结算
 
     def take_damage(self, damage):
         """植物受到伤害"""
@@ -52,15 +65,15 @@ class BasePlant:
         if not self.constants:
             return
 
-        x = self.constants['BATTLEFIELD_LEFT'] + self.col * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP'])
-        y = self.constants['BATTLEFIELD_TOP'] + self.row * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP'])
+        x = self.constants.cell_x(self.col)
+        y = self.constants.cell_y(self.row)
 
         # 默认圆形绘制
-        color = self.constants.get('WHITE', (255, 255, 255))
+        color = self.constants.WHITE
         pygame.draw.circle(surface, color,
-                           (x + self.constants['GRID_SIZE'] // 2,
-                            y + self.constants['GRID_SIZE'] // 2),
-                           self.constants['GRID_SIZE'] // 3)
+                           (x + self.constants.GRID_SIZE // 2,
+                            y + self.constants.GRID_SIZE // 2),
+                           self.constants.GRID_SIZE // 3)
 
         # 绘制血条
         self._draw_health_bar(surface, x, y)
@@ -87,13 +100,13 @@ class BasePlant:
                                   self.plant_type not in ["cherry_bomb", "cucumber"])
 
         if should_show_health_bar:
-            health_bar_width = self.constants['GRID_SIZE']
+            health_bar_width = self.constants.GRID_SIZE
             health_bar_height = 6
             health_bar_x = x
-            health_bar_y = y + self.constants['GRID_SIZE'] + 2
+            health_bar_y = y + self.constants.GRID_SIZE + 2
 
             # 血条背景（红色）
-            pygame.draw.rect(surface, self.constants['RED'],
+            pygame.draw.rect(surface, self.constants.RED,
                              (health_bar_x, health_bar_y, health_bar_width, health_bar_height))
 
             # 当前血量条
@@ -102,7 +115,7 @@ class BasePlant:
 
             # 根据血量百分比选择颜色
             if health_percentage > 0.6:
-                health_color = self.constants['GREEN']
+                health_color = self.constants.GREEN
             elif health_percentage > 0.3:
                 health_color = (255, 255, 0)  # 黄色
             else:
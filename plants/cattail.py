@@ -8,6 +8,11 @@ from .shooter_base import ShooterPlant
 class Cattail(ShooterPlant):
     """猫尾草：全地图追踪攻击"""
 
+    targeting = "any_zombie"
+    fire_action = "spike"
+
+    __slots__ = ()
+
     def __init__(self, row, col, constants, images, level_manager):
         super().__init__(row, col, "cattail", constants, images, level_manager, base_shoot_delay=45)
 
@@ -33,17 +38,17 @@ class Cattail(ShooterPlant):
         if not self.constants:
             return
 
-        x = self.constants['BATTLEFIELD_LEFT'] + self.col * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP'])
-        y = self.constants['BATTLEFIELD_TOP'] + self.row * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP'])
+        x = self.constants.cell_x(self.col)
+        y = self.constants.cell_y(self.row)
 
         if self.images and self.images.get('cattail_img'):
             surface.blit(self.images['cattail_img'], (x, y))
         else:
             # 默认紫色圆形
             pygame.draw.circle(surface, (128, 0, 128),
-                               (x + self.constants['GRID_SIZE'] // 2,
-                                y + self.constants['GRID_SIZE'] // 2),
-                               self.constants['GRID_SIZE'] // 3)
+                               (x + self.constants.GRID_SIZE // 2,
+                                y + self.constants.GRID_SIZE // 2),
+                               self.constants.GRID_SIZE // 3)
 
         # 绘制血条
         self._draw_health_bar(surface, x, y)
\ No newline at end of file
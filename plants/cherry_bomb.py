@@ -11,6 +11,14 @@ from .particles import ExplosionParticle
 class CherryBomb(BasePlant):
     """樱桃炸弹：3x3范围爆炸伤害"""
 
+    explosion_sound = "cherry_explosion"
+
+    __slots__ = (
+        'explode_timer', 'explode_delay', 'explosion_damage', 'explosion_range', 'sound_trigger_frame',
+        'explosion_started', 'explosion_particles', 'particles_created', '_needs_explosion_check',
+        'scale', 'max_scale', 'scale_step', 'scale_timer', 'scale_interval', 'pulse_timer',
+    )
+
     def __init__(self, row, col, constants, images, level_manager):
         super().__init__(row, col, "cherry_bomb", constants, images, level_manager)
 
@@ -20,6 +28,7 @@ class CherryBomb(BasePlant):
         self.explosion_damage = 1200
         self.has_exploded = False
         self.should_be_removed = False
+        self._needs_explosion_check = False
 
         # 音效播放控制
         self.explosion_sound_played = False
@@ -118,12 +127,10 @@ class CherryBomb(BasePlant):
             return
 
         # 计算植物的像素位置
-        center_x = (self.constants['BATTLEFIELD_LEFT'] +
-                    self.col * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP']) +
-                    self.constants['GRID_SIZE'] // 2)
-        center_y = (self.constants['BATTLEFIELD_TOP'] +
-                    self.row * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP']) +
-                    self.constants['GRID_SIZE'] // 2)
+        center_x = (self.constants.cell_x(self.col) +
+                    self.constants.GRID_SIZE // 2)
+        center_y = (self.constants.cell_y(self.row) +
+                    self.constants.GRID_SIZE // 2)
 
         # 创建红色粒子
         particle_count = random.randint(30, 50)
@@ -208,17 +215,17 @@ class CherryBomb(BasePlant):
             self.draw_explosion_particles(surface)
             return
 
-        x = self.constants['BATTLEFIELD_LEFT'] + self.col * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP'])
-        y = self.constants['BATTLEFIELD_TOP'] + self.row * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP'])
+        x = self.constants.cell_x(self.col)
+        y = self.constants.cell_y(self.row)
 
         if self.images and self.images.get('cherry_bomb_img'):
             self.draw_cherry_bomb(surface, self.images['cherry_bomb_img'], x, y)
         else:
             # 默认粉红色圆形
             pygame.draw.circle(surface, (255, 0, 100),
-                               (x + self.constants['GRID_SIZE'] // 2,
-                                y + self.constants['GRID_SIZE'] // 2),
-                               self.constants['GRID_SIZE'] // 3)
+                               (x + self.constants.GRID_SIZE // 2,
+                                y + self.constants.GRID_SIZE // 2),
+                               self.constants.GRID_SIZE // 3)
 
     def draw_cherry_bomb(self, surface, img, x, y):
         """绘制樱桃炸弹（带缩放和脉冲效果）"""
@@ -246,8 +253,8 @@ class CherryBomb(BasePlant):
             scaled_img = img
 
         # 计算居中绘制位置
-        center_x = x + self.constants['GRID_SIZE'] // 2
-        center_y = y + self.constants['GRID_SIZE'] // 2
+        center_x = x + self.constants.GRID_SIZE // 2
+        center_y = y + self.constants.GRID_SIZE // 2
         draw_x = center_x - scaled_img.get_width() // 2
         draw_y = center_y - scaled_img.get_height() // 2
 
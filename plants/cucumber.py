@@ -11,6 +11,16 @@ from .particles import CucumberExplosionParticle, CucumberSprayParticle
 class Cucumber(BasePlant):
     """黄瓜：全屏眩晕+喷射效果"""
 
+    explosion_sound = "cherry_explosion"
+
+    __slots__ = (
+        'explode_timer', 'explode_delay', 'explosion_damage', 'explosion_range', 'sound_trigger_frame',
+        'explosion_started', 'explosion_particles', 'particles_created', '_needs_explosion_check',
+        'scale', 'max_scale', 'scale_step', 'scale_timer', 'scale_interval', 'pulse_timer', 'glow_intensity',
+        'stun_duration', 'spray_duration', 'death_probability', 'fullscreen_explosion_data',
+        'spray_created', 'spray_particles',
+    )
+
     def __init__(self, row, col, constants, images, level_manager):
         super().__init__(row, col, "cucumber", constants, images, level_manager)
 
@@ -20,6 +30,7 @@ class Cucumber(BasePlant):
         self.explosion_damage = 1200
         self.has_exploded = False
         self.should_be_removed = False
+        self._needs_explosion_check = False
 
         # 音效播放控制
         self.explosion_sound_played = False
@@ -147,12 +158,10 @@ class Cucumber(BasePlant):
             return
 
         # 计算黄瓜的像素位置
-        center_x = (self.constants['BATTLEFIELD_LEFT'] +
-                    self.col * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP']) +
-                    self.constants['GRID_SIZE'] // 2)
-        center_y = (self.constants['BATTLEFIELD_TOP'] +
-                    self.row * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP']) +
-                    self.constants['GRID_SIZE'] // 2)
+        center_x = (self.constants.cell_x(self.col) +
+                    self.constants.GRID_SIZE // 2)
+        center_y = (self.constants.cell_y(self.row) +
+                    self.constants.GRID_SIZE // 2)
 
         # 创建绿色爆炸粒子
         particle_count = random.randint(40, 60)
@@ -251,17 +260,17 @@ class Cucumber(BasePlant):
             self.draw_spray_particles(surface)
             return
 
-        x = self.constants['BATTLEFIELD_LEFT'] + self.col * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP'])
-        y = self.constants['BATTLEFIELD_TOP'] + self.row * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP'])
+        x = self.constants.cell_x(self.col)
+        y = self.constants.cell_y(self.row)
 
         if self.images and self.images.get('cucumber_img'):
             self.draw_cucumber(surface, self.images['cucumber_img'], x, y)
         else:
             # 默认淡绿色圆形
             pygame.draw.circle(surface, (144, 238, 144),
-                               (x + self.constants['GRID_SIZE'] // 2,
-                                y + self.constants['GRID_SIZE'] // 2),
-                               self.constants['GRID_SIZE'] // 3)
+                               (x + self.constants.GRID_SIZE // 2,
+                                y + self.constants.GRID_SIZE // 2),
+                               self.constants.GRID_SIZE // 3)
 
     def draw_cucumber(self, surface, img, x, y):
         """绘制黄瓜（带缩放和绿色发光效果）"""
@@ -289,8 +298,8 @@ class Cucumber(BasePlant):
             scaled_img = img
 
         # 计算居中绘制位置
-        center_x = x + self.constants['GRID_SIZE'] // 2
-        center_y = y + self.constants['GRID_SIZE'] // 2
+        center_x = x + self.constants.GRID_SIZE // 2
+        center_y = y + self.constants.GRID_SIZE // 2
         draw_x = center_x - scaled_img.get_width() // 2
         draw_y = center_y - scaled_img.get_height() // 2
 
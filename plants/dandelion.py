@@ -9,6 +9,12 @@ from .shooter_base import ShooterPlant
 class Dandelion(ShooterPlant):
     """蒲公英：释放5颗飘散种子"""
 
+    targeting = "any_zombie"
+    fire_action = "dandelion_seeds"
+    fire_sound = "dandelion_shoot"
+
+    __slots__ = ('seeds_per_shot', 'current_seeds_count')
+
     def __init__(self, row, col, constants, images, level_manager):
         super().__init__(row, col, "dandelion", constants, images, level_manager, base_shoot_delay=120)
 
@@ -50,10 +56,10 @@ class Dandelion(ShooterPlant):
             offset_x = random.uniform(-0.2, 0.2)
             offset_y = random.uniform(-0.2, 0.2)
 
-            # 导入蒲公英种子类
-            from bullets import DandelionSeed
+            # 创建蒲公英种子（复用对象池中回收的种子）
+            from bullets import create_seed
 
-            seed = DandelionSeed(
+            seed = create_seed(
                 start_x=plant_x + offset_x,
                 start_y=plant_y + offset_y,
                 target_zombie=target_zombie,
@@ -70,17 +76,17 @@ class Dandelion(ShooterPlant):
         if not self.constants:
             return
 
-        x = self.constants['BATTLEFIELD_LEFT'] + self.col * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP'])
-        y = self.constants['BATTLEFIELD_TOP'] + self.row * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP'])
+        x = self.constants.cell_x(self.col)
+        y = self.constants.cell_y(self.row)
 
         if self.images and self.images.get('dandelion_img'):
             surface.blit(self.images['dandelion_img'], (x, y))
         else:
             # 默认黄色圆形
             pygame.draw.circle(surface, (255, 255, 100),
-                               (x + self.constants['GRID_SIZE'] // 2,
-                                y + self.constants['GRID_SIZE'] // 2),
-                               self.constants['GRID_SIZE'] // 3)
+                               (x + self.constants.GRID_SIZE // 2,
+                                y + self.constants.GRID_SIZE // 2),
+                               self.constants.GRID_SIZE // 3)
 
         # 绘制血条
         self._draw_health_bar(surface, x, y)
\ No newline at end of file
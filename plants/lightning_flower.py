@@ -10,6 +10,15 @@ from .shooter_base import ShooterPlant
 class LightningFlower(ShooterPlant):
     """闪电花：链式闪电攻击"""
 
+    targeting = "any_zombie"
+    fire_action = "lightning_chain"
+    fire_sound = "lightning_flower"
+
+    __slots__ = (
+        'chain_damage', 'chain_range', 'chain_reduction', 'max_chains',
+        'show_lightning', 'lightning_timer', 'lightning_duration', 'lightning_effects',
+    )
+
     def __init__(self, row, col, constants, images, level_manager):
         super().__init__(row, col, "lightning_flower", constants, images, level_manager, base_shoot_delay=120)
 
@@ -40,17 +49,20 @@ class LightningFlower(ShooterPlant):
 
         return 0
 
-    def perform_lightning_attack(self, zombies_list, sounds=None):
-        """执行闪电链式攻击"""
+    def perform_lightning_attack(self, zombies_list, sounds=None, area_index=None):
+        """执行闪电链式攻击，area_index 为本帧共享的僵尸范围查询索引"""
         if not zombies_list:
             return 0
+        if area_index is None:
+            from core.area_query import ZombieAreaIndex
+            area_index = ZombieAreaIndex(zombies_list)
 
         # 找到同行最近的僵尸作为起始目标
         initial_target = None
         min_distance = float('inf')
 
-        for zombie in zombies_list:
-            if zombie.row == self.row and zombie.col > self.col and zombie.health > 0:
+        for zombie in area_index.query_row(self.row):
+            if zombie.col > self.col and zombie.health > 0:
                 distance = zombie.col - self.col
                 if distance < min_distance:
                     min_distance = distance
@@ -100,7 +112,7 @@ class LightningFlower(ShooterPlant):
             self.create_lightning_effect(self.row, self.col, current_target.row, current_target.col)
 
             # 寻找下一个跳跃目标
-            next_target = self.find_next_lightning_target(current_target, zombies_list, chain_targets)
+            next_target = self.find_next_lightning_target(current_target, area_index, chain_targets)
             if not next_target:
                 break
 
@@ -124,28 +136,17 @@ class LightningFlower(ShooterPlant):
 
         return zombies_hit
 
-    def find_next_lightning_target(self, current_zombie, zombies_list, chain_targets):
-        """寻找下一个闪电跳跃目标"""
-        hit_zombies = {target['zombie'] for target in chain_targets}
-        next_target = None
-        min_distance = float('inf')
-
-        for zombie in zombies_list:
-            if (zombie in hit_zombies or zombie.health <= 0 or
-                    zombie.is_dying or zombie == current_zombie):
-                continue
-
-            # 计算距离
-            dx = zombie.col - current_zombie.col
-            dy = zombie.row - current_zombie.row
-            distance = (dx * dx + dy * dy) ** 0.5
+    def find_next_lightning_target(self, current_zombie, area_index, chain_targets):
+        """寻找下一个闪电跳跃目标：跳跃范围内最近的未命中僵尸"""
+        hit_zombies = {id(target['zombie']) for target in chain_targets}
 
-            # 在跳跃范围内且是最近的
-            if distance <= self.chain_range and distance < min_distance:
-                min_distance = distance
-                next_target = zombie
+        def is_candidate(zombie):
+            return not (id(zombie) in hit_zombies or zombie.health <= 0 or
+                        zombie.is_dying or zombie is current_zombie)
 
-        return next_target
+        targets = area_index.nearest(current_zombie.row, current_zombie.col, self.chain_range,
+                                     predicate=is_candidate)
+        return targets[0] if targets else None
 
     def create_lightning_effect(self, start_row, start_col, end_row, end_col):
         """创建闪电视觉效果"""
@@ -212,18 +213,18 @@ class LightningFlower(ShooterPlant):
         if not self.constants:
             return
 
-        x = self.constants['BATTLEFIELD_LEFT'] + self.col * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP'])
-        y = self.constants['BATTLEFIELD_TOP'] + self.row * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP'])
+        x = self.constants.cell_x(self.col)
+        y = self.constants.cell_y(self.row)
 
         # 闪电花可能有充电效果
         if self.show_lightning:
             # 绘制发光效果
-            glow_surface = pygame.Surface((self.constants['GRID_SIZE'] + 20,
-                                           self.constants['GRID_SIZE'] + 20), pygame.SRCALPHA)
+            glow_surface = pygame.Surface((self.constants.GRID_SIZE + 20,
+                                           self.constants.GRID_SIZE + 20), pygame.SRCALPHA)
             glow_color = (255, 255, 0, 100)  # 半透明黄色发光
             pygame.draw.circle(glow_surface, glow_color,
                                (glow_surface.get_width() // 2, glow_surface.get_height() // 2),
-                               self.constants['GRID_SIZE'] // 2 + 10)
+                               self.constants.GRID_SIZE // 2 + 10)
             surface.blit(glow_surface, (x - 10, y - 10))
 
         if self.images and self.images.get('lightning_flower_img'):
@@ -231,9 +232,9 @@ class LightningFlower(ShooterPlant):
         else:
             # 默认黄色圆形
             pygame.draw.circle(surface, (255, 255, 0),
-                               (x + self.constants['GRID_SIZE'] // 2,
-                                y + self.constants['GRID_SIZE'] // 2),
-                               self.constants['GRID_SIZE'] // 3)
+                               (x + self.constants.GRID_SIZE // 2,
+                                y + self.constants.GRID_SIZE // 2),
+                               self.constants.GRID_SIZE // 3)
 
         # 绘制闪电效果
         self.draw_lightning_effects(surface)
@@ -259,12 +260,10 @@ class LightningFlower(ShooterPlant):
             # 转换为屏幕坐标
             screen_points = []
             for row, col in segments:
-                screen_x = (self.constants['BATTLEFIELD_LEFT'] +
-                            col * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP']) +
-                            self.constants['GRID_SIZE'] // 2)
-                screen_y = (self.constants['BATTLEFIELD_TOP'] +
-                            row * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP']) +
-                            self.constants['GRID_SIZE'] // 2)
+                screen_x = (self.constants.cell_x(col) +
+                            self.constants.GRID_SIZE // 2)
+                screen_y = (self.constants.cell_y(row) +
+                            self.constants.GRID_SIZE // 2)
                 screen_points.append((int(screen_x), int(screen_y)))
 
             # 绘制主闪电（黄色）
@@ -9,6 +9,9 @@ import math
 class ExplosionParticle:
     """樱桃炸弹爆炸粒子 - 改进版：扩散效果，无重力"""
 
+    __slots__ = ('x', 'y', 'radius', 'max_radius', 'vx', 'vy', 'friction', 'color',
+                 'life', 'max_life', 'alpha', 'rotation', 'rotation_speed', 'scale_factor', 'pulse_speed')
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
@@ -106,6 +109,9 @@ class ExplosionParticle:
 class CucumberExplosionParticle:
     """黄瓜爆炸粒子 - 绿色系波动"""
 
+    __slots__ = ('x', 'y', 'radius', 'max_radius', 'vx', 'vy', 'friction', 'color',
+                 'life', 'max_life', 'alpha', 'rotation', 'rotation_speed', 'scale_factor', 'pulse_speed')
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
@@ -200,6 +206,9 @@ class CucumberExplosionParticle:
 class CucumberSprayParticle:
     """黄瓜喷射粒子 - 乳白色，向前喷射"""
 
+    __slots__ = ('x', 'y', 'radius', 'max_radius', 'direction', 'vx', 'vy', 'gravity', 'friction', 'color',
+                 'life', 'max_life', 'alpha', 'rotation', 'rotation_speed', 'pulse_speed')
+
     def __init__(self, x, y, direction=1):
         self.x = x
         self.y = y
@@ -8,6 +8,11 @@ from .shooter_base import ShooterPlant
 class Shooter(ShooterPlant):
     """豌豆射手：发射豌豆子弹"""
 
+    targeting = "row_ahead"
+    fire_action = "pea"
+
+    __slots__ = ()
+
     def __init__(self, row, col, constants, images, level_manager):
         super().__init__(row, col, "shooter", constants, images, level_manager, base_shoot_delay=60)
 
@@ -16,17 +21,17 @@ class Shooter(ShooterPlant):
         if not self.constants:
             return
 
-        x = self.constants['BATTLEFIELD_LEFT'] + self.col * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP'])
-        y = self.constants['BATTLEFIELD_TOP'] + self.row * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP'])
+        x = self.constants.cell_x(self.col)
+        y = self.constants.cell_y(self.row)
 
         if self.images and self.images.get('pea_shooter_img'):
             surface.blit(self.images['pea_shooter_img'], (x, y))
         else:
             # 默认绿色圆形
             pygame.draw.circle(surface, (0, 255, 0),
-                               (x + self.constants['GRID_SIZE'] // 2,
-                                y + self.constants['GRID_SIZE'] // 2),
-                               self.constants['GRID_SIZE'] // 3)
+                               (x + self.constants.GRID_SIZE // 2,
+                                y + self.constants.GRID_SIZE // 2),
+                               self.constants.GRID_SIZE // 3)
 
         # 绘制血条
         self._draw_health_bar(surface, x, y)
\ No newline at end of file
@@ -8,6 +8,8 @@ from .base_plant import BasePlant
 class ShooterPlant(BasePlant):
     """射击型植物的基类"""
 
+    __slots__ = ('base_shoot_delay', 'current_shoot_delay', 'shoot_timer', 'had_target_last_frame')
+
     def __init__(self, row, col, plant_type, constants, images, level_manager, base_shoot_delay=60):
         super().__init__(row, col, plant_type, constants, images, level_manager)
 
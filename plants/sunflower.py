@@ -8,6 +8,8 @@ from .base_plant import BasePlant
 class Sunflower(BasePlant):
     """向日葵：产生阳光"""
 
+    __slots__ = ('sun_timer', 'sun_delay', 'sun_amount')
+
     def __init__(self, row, col, constants, images, level_manager):
         super().__init__(row, col, "sunflower", constants, images, level_manager)
 
@@ -55,17 +57,17 @@ class Sunflower(BasePlant):
         if not self.constants:
             return
 
-        x = self.constants['BATTLEFIELD_LEFT'] + self.col * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP'])
-        y = self.constants['BATTLEFIELD_TOP'] + self.row * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP'])
+        x = self.constants.cell_x(self.col)
+        y = self.constants.cell_y(self.row)
 
         if self.images and self.images.get('sunflower_img'):
             surface.blit(self.images['sunflower_img'], (x, y))
         else:
             # 默认黄色圆形
             pygame.draw.circle(surface, (255, 255, 0),
-                               (x + self.constants['GRID_SIZE'] // 2,
-                                y + self.constants['GRID_SIZE'] // 2),
-                               self.constants['GRID_SIZE'] // 3)
+                               (x + self.constants.GRID_SIZE // 2,
+                                y + self.constants.GRID_SIZE // 2),
+                               self.constants.GRID_SIZE // 3)
 
         # 绘制血条
         self._draw_health_bar(surface, x, y)
\ No newline at end of file
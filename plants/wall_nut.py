@@ -8,6 +8,8 @@ from .base_plant import BasePlant
 class WallNut(BasePlant):
     """坚果墙：高血量防御植物"""
 
+    __slots__ = ()
+
     def __init__(self, row, col, constants, images, level_manager):
         super().__init__(row, col, "wall_nut", constants, images, level_manager)
         # 基类已经设置了血量为1500
@@ -33,17 +35,17 @@ class WallNut(BasePlant):
         if not self.constants:
             return
 
-        x = self.constants['BATTLEFIELD_LEFT'] + self.col * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP'])
-        y = self.constants['BATTLEFIELD_TOP'] + self.row * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP'])
+        x = self.constants.cell_x(self.col)
+        y = self.constants.cell_y(self.row)
 
         if self.images and self.images.get('wall_nut_img'):
             surface.blit(self.images['wall_nut_img'], (x, y))
         else:
             # 默认棕色圆形
             pygame.draw.circle(surface, (139, 69, 19),
-                               (x + self.constants['GRID_SIZE'] // 2,
-                                y + self.constants['GRID_SIZE'] // 2),
-                               self.constants['GRID_SIZE'] // 3)
+                               (x + self.constants.GRID_SIZE // 2,
+                                y + self.constants.GRID_SIZE // 2),
+                               self.constants.GRID_SIZE // 3)
 
         # 绘制血条
         self._draw_health_bar(surface, x, y)
\ No newline at end of file
@@ -0,0 +1,287 @@
+"""
+回放播放工具 - 重现录制的对局，并统计每帧耗时
+运行方式：
+    python replay_player.py replays/level12_20250101_120000.pvzr            # 无界面，最快速度
+    python replay_player.py replays/level12_20250101_120000.pvzr --speed 2  # 带画面，2倍速
+    python replay_player.py xxx.pvzr --speed 8 --report perf.json
+带画面回放支持 1/2/8 倍速：每个渲染帧推进对应数量的逻辑帧
+录制文件中带有状态摘要时，回放到对应帧会比对状态，报告中的 sync 列出不同步的帧
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from core.replay import ReplayLog, INPUT_CLICK, INPUT_RIGHT_CLICK, INPUT_SPACE
+
+RENDER_SPEEDS = (1, 2, 8)
+# 报告中列出的最慢帧数量
+SLOWEST_TICKS_REPORTED = 10
+
+
+class ReplayPlayer:
+    """回放器：挂在 GameManager 上，负责设定种子、应用录制时的配置并注入输入"""
+
+    def __init__(self, log):
+        self.log = log
+        self.event_index = 0
+        self.loaded = False
+        self.checksums = log.metadata.get("checksums", {})  # 录制时各帧的状态摘要
+        self.checked_ticks = 0
+        self.desync_ticks = []
+
+    def seed_session(self):
+        """关卡加载前调用：恢复随机种子和模拟时钟"""
+        from core import sim_clock
+
+        random.seed(self.log.seed)
+        sim_clock.set_tick(self.log.start_clock_tick)
+        return self.log.seed
+
+    def on_level_loaded(self, game_manager):
+        """关卡加载后调用：用录制时的配置覆盖当前配置"""
+        metadata = self.log.metadata
+        level_manager = game_manager.game["level_manager"]
+
+        level_config = metadata.get("level_config")
+        if level_config and level_config != level_manager.level_config:
+            print("提示：当前关卡配置与录制时不同，使用录制时的配置")
+            level_manager.level_config = dict(level_config)
+            level_manager.max_waves = level_config.get("max_waves", level_manager.max_waves)
+
+        if "level_settings" in metadata:
+            game_manager.level_settings = dict(metadata["level_settings"])
+        if "initial_sun" in metadata:
+            game_manager.game["sun"] = metadata["initial_sun"]
+
+        self.loaded = True
+
+    def pending_events(self, tick):
+        """取出当前帧需要注入的输入"""
+        events = []
+        while self.event_index < len(self.log.events) and self.log.events[self.event_index][0] <= tick:
+            events.append(self.log.events[self.event_index])
+            self.event_index += 1
+        return events
+
+    def check_sync(self, game_manager):
+        """录制时在这一帧记录过状态摘要的，与回放的状态比对，不一致的帧号记入 desync_ticks"""
+        expected = self.checksums.get(str(game_manager.replay_tick))
+        if expected is None:
+            return True
+        self.checked_ticks += 1
+        if game_manager.snapshot().digest() == expected:
+            return True
+        if not self.desync_ticks:
+            print(f"回放不同步：第 {game_manager.replay_tick} 帧的状态与录制时不一致")
+        self.desync_ticks.append(game_manager.replay_tick)
+        return False
+
+    def is_finished(self, game_manager):
+        """输入已全部注入且到达录制结束帧，或已离开游戏界面"""
+        if not self.loaded:
+            return False
+        if game_manager.state_manager.game_state != "playing":
+            return True
+        return self.event_index >= len(self.log.events) and game_manager.replay_tick >= self.log.end_tick
+
+
+def _create_game_manager(headless):
+    """创建使用临时存档的 GameManager，避免回放改动玩家数据"""
+    if headless:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    from main import GameManager
+    from database import GameDatabase
+
+    fd, db_path = tempfile.mkstemp(prefix="pvz_replay_", suffix=".json")
+    os.close(fd)
+    os.remove(db_path)
+
+    game_manager = GameManager(game_db=GameDatabase(db_path))
+    game_manager.replay_recording_enabled = False
+    return game_manager, db_path
+
+
+def _apply_input(game_manager, event, headless):
+    """把录制的输入交给事件处理器"""
+    _, kind, x, y = event
+    handler = game_manager.event_handler
+
+    if kind == INPUT_CLICK:
+        # 部分按钮区域在渲染时才计算，无界面回放时先补一次渲染，与实际游玩时的状态保持一致
+        if headless:
+            game_manager.renderer_manager.render_game()
+        handler.handle_mouse_click((x, y))
+    elif kind == INPUT_RIGHT_CLICK:
+        handler._handle_right_click_cancel()
+    elif kind == INPUT_SPACE:
+        handler._handle_space_key()
+
+
+def play_replay(path, speed=None):
+    """播放回放，speed 为 None 时无界面全速运行；返回性能报告"""
+    import pygame
+
+    log = ReplayLog.read(path)
+    headless = speed is None
+    game_manager, db_path = _create_game_manager(headless)
+
+    player = ReplayPlayer(log)
+    game_manager.replay_playback = player
+
+    # 恢复录制时的商店购买状态（小推车、锤子、第七卡槽），只改内存不写盘
+    purchased = log.metadata.get("purchased_items")
+    if purchased is not None:
+        game_manager.shop_manager.purchased_items = set(purchased)
+        game_manager.cart_manager.reinitialize_carts()
+        game_manager.invalidate_card_bar()
+
+    # 走与正常选关相同的过渡流程，保证帧号与录制时一致
+    game_manager.state_manager.game_state = "level_select"
+    game_manager.state_manager.set_pending_game_data(None, log.level)
+    game_manager.begin_level_transition()
+
+    update_times = []
+    render_times = []
+    slowest = []  # (耗时, 帧号, 波次, 僵尸数)
+    wall_start = time.perf_counter()
+    running = True
+
+    try:
+        while running and not player.is_finished(game_manager):
+            ticks_this_frame = 1 if headless else speed
+            for _ in range(ticks_this_frame):
+                if player.loaded:
+                    for event in player.pending_events(game_manager.replay_tick):
+                        _apply_input(game_manager, event, headless)
+
+                start = time.perf_counter()
+                game_manager.update_game_logic()
+                elapsed = time.perf_counter() - start
+
+                if player.loaded:
+                    update_times.append(elapsed)
+                    player.check_sync(game_manager)
+                    game = game_manager.game
+                    slowest.append((elapsed, game_manager.replay_tick,
+                                    game["level_manager"].current_wave, len(game["zombies"])))
+                    if len(slowest) > SLOWEST_TICKS_REPORTED * 4:
+                        slowest.sort(reverse=True)
+                        del slowest[SLOWEST_TICKS_REPORTED:]
+
+                if player.is_finished(game_manager):
+                    break
+
+            if not headless:
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        running = False
+
+                start = time.perf_counter()
+                game_manager.renderer_manager.render_game()
+                render_times.append(time.perf_counter() - start)
+                game_manager.clock.tick(60)
+    finally:
+        # 临时存档不需要落盘，避免退出时又写回已删除的文件
+        game_manager.game_db.close(flush=False)
+        try:
+            os.remove(db_path)
+        except OSError:
+            pass
+
+    wall_time = time.perf_counter() - wall_start
+    slowest.sort(reverse=True)
+    return _build_report(path, log, game_manager, player, speed, wall_time, update_times, render_times,
+                         slowest[:SLOWEST_TICKS_REPORTED])
+
+
+def _percentile(sorted_values, fraction):
+    """取已排序列表的分位数"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def _timing_stats(values):
+    """耗时统计（毫秒）"""
+    values = sorted(values)
+    if not values:
+        return {}
+    return {
+        "mean_ms": round(statistics.fmean(values) * 1000, 4),
+        "p50_ms": round(_percentile(values, 0.5) * 1000, 4),
+        "p95_ms": round(_percentile(values, 0.95) * 1000, 4),
+        "p99_ms": round(_percentile(values, 0.99) * 1000, 4),
+        "max_ms": round(values[-1] * 1000, 4),
+    }
+
+
+def _build_report(path, log, game_manager, player, speed, wall_time, update_times, render_times, slowest):
+    """生成回放性能报告"""
+    game = game_manager.game
+    if game.get("level_completed", False):
+        outcome = "won"
+    elif game.get("game_over", False):
+        outcome = "lost"
+    else:
+        outcome = "incomplete"
+
+    return {
+        "replay": path,
+        "level": log.level,
+        "seed": log.seed,
+        "mode": "headless" if speed is None else f"rendered_{speed}x",
+        "recorded_ticks": log.end_tick,
+        "replayed_ticks": len(update_times),
+        "inputs": len(log.events),
+        "outcome": outcome,
+        "final_state": {
+            "sun": game.get("sun", 0),
+            "plants": len(game.get("plants", [])),
+            "zombies": len(game.get("zombies", [])),
+            "zombies_killed": game.get("zombies_killed", 0),
+        },
+        "sync": {
+            "checked_ticks": player.checked_ticks,
+            "desync_ticks": player.desync_ticks[:SLOWEST_TICKS_REPORTED],
+        },
+        "wall_time_s": round(wall_time, 3),
+        "update": _timing_stats(update_times),
+        "render": _timing_stats(render_times),
+        "slowest_ticks": [
+            {"ms": round(t * 1000, 4), "tick": tick, "wave": wave, "zombies": zombies}
+            for t, tick, wave, zombies in slowest
+        ],
+    }
+
+
+def main():
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="播放对局回放并统计帧耗时")
+    parser.add_argument("replay", help="回放文件路径（.pvzr）")
+    parser.add_argument("--speed", type=int, choices=RENDER_SPEEDS, default=None,
+                        help="带画面回放倍速，不指定时无界面全速回放")
+    parser.add_argument("--report", default=None, help="性能报告 JSON 输出路径")
+    args = parser.parse_args()
+
+    report = play_replay(args.replay, args.speed)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"性能报告已写入 {args.report}")
+    else:
+        print(text)
+
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
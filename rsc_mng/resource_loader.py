@@ -78,6 +78,18 @@ def load_all_images():
         return {}
 
 
+# 游戏中会持续旋转的图片，启动时预先渲染全部角度
+ROTATING_IMAGE_KEYS = ('spike_img', 'dandelion_seed_img', 'trophy_img')
+
+
+def prewarm_rotations(images):
+    """预先渲染旋转图片的所有角度帧"""
+    from .rotation_cache import rotation_cache
+    for key in ROTATING_IMAGE_KEYS:
+        if images.get(key):
+            rotation_cache.prewarm(images[key])
+
+
 def get_images():
     """获取图片字典，供Plant、Zombie和Bullet类使用"""
     images = load_all_images()
@@ -0,0 +1,87 @@
+"""
+旋转帧缓存 - 按固定角度步长预先旋转精灵图，旋转中的实体每帧只取最接近的一帧 blit，
+不再每次绘制都调用 pygame.transform.rotate 创建新表面
+步数由画质档位决定，档位越高转动越平滑、占用内存越多
+档位通过环境变量 PVZ_ROTATION_QUALITY 设置（low / medium / high），默认 medium
+"""
+import os
+
+import pygame
+
+# 各画质档位一圈预渲染的角度步数
+ROTATION_QUALITY_STEPS = {
+    "low": 24,
+    "medium": 64,
+    "high": 128,
+}
+DEFAULT_ROTATION_QUALITY = "medium"
+# 默认档位的步数（每步 5.625 度）
+ROTATION_STEPS = ROTATION_QUALITY_STEPS[DEFAULT_ROTATION_QUALITY]
+# 启动时使用的画质档位
+ROTATION_QUALITY = os.environ.get("PVZ_ROTATION_QUALITY", DEFAULT_ROTATION_QUALITY)
+
+
+class RotationCache:
+    """按 (源图, 尺寸) 缓存各角度的旋转帧，首次用到某个角度时才渲染；源图换了会自动重建"""
+
+    def __init__(self, steps=ROTATION_STEPS):
+        self.steps = steps
+        self._frames = {}  # (id(源图), 尺寸) -> (源图, [各角度的帧，未渲染为 None])
+
+    def set_quality(self, quality):
+        """切换画质档位，步数变化时清空已渲染的帧"""
+        steps = ROTATION_QUALITY_STEPS.get(quality)
+        if steps is None:
+            print(f"未知的旋转画质档位: {quality}")
+            return
+        if steps != self.steps:
+            self.steps = steps
+            self._frames.clear()
+
+    def step_of(self, angle):
+        """角度（度）对应的最近步号"""
+        return int(round(angle * self.steps / 360.0)) % self.steps
+
+    def _entry(self, image, size):
+        key = (id(image), size)
+        entry = self._frames.get(key)
+        # 保留源图引用，保证 id 在缓存期间不会被其他对象复用
+        if entry is None or entry[0] is not image:
+            entry = (image, [None] * self.steps)
+            self._frames[key] = entry
+        return entry[1]
+
+    def _render(self, image, size, step):
+        source = pygame.transform.scale(image, size) if size is not None else image
+        return pygame.transform.rotate(source, step * 360.0 / self.steps)
+
+    def get(self, image, angle, size=None):
+        """与 angle 最接近的旋转帧，角度方向与 pygame.transform.rotate 相同（逆时针为正）
+        size 不为空时先缩放到该尺寸再旋转
+        返回的帧是共享的，需要整体透明度的调用方每次绘制前都要自己 set_alpha"""
+        frames = self._entry(image, size)
+        step = self.step_of(angle)
+        frame = frames[step]
+        if frame is None:
+            frame = frames[step] = self._render(image, size, step)
+        return frame
+
+    def get_centered(self, image, angle, center, size=None):
+        """旋转帧及其绘制矩形，矩形中心固定在 center，转动时不会抖动"""
+        frame = self.get(image, angle, size)
+        return frame, frame.get_rect(center=center)
+
+    def prewarm(self, image, size=None):
+        """一次渲染所有角度（加载素材时调用，避免游戏中首次转到某个角度时卡顿）"""
+        frames = self._entry(image, size)
+        for step in range(self.steps):
+            if frames[step] is None:
+                frames[step] = self._render(image, size, step)
+
+    def clear(self):
+        """清空所有缓存"""
+        self._frames.clear()
+
+
+rotation_cache = RotationCache()
+rotation_cache.set_quality(ROTATION_QUALITY)
@@ -1,17 +1,17 @@
 """
 商店管理器 - 处理商品展示、分页和购买逻辑
 """
-import json
-import os
 
 
 class ShopManager:
     """商店管理器 - 处理商品展示、分页和购买逻辑"""
 
-    def __init__(self):
+    def __init__(self, game_db):
         self.items_per_page = 8  # 每页显示8个商品（4x2网格）
         self.current_page = 0
-        self.purchased_items = self.load_purchased_items()
+        # 购买记录由存档数据库负责持久化，这里只保留内存副本供每帧查询
+        self.game_db = game_db
+        self.purchased_items = game_db.get_purchased_items()
 
         # 商店商品列表
         self.shop_items = [
@@ -81,29 +81,11 @@ class ShopManager:
             }
         ]
 
-    def load_purchased_items(self):
-        """从文件加载已购买物品"""
-        try:
-            if os.path.exists("database/purchased_items.json"):  # 修改路径
-                with open("database/purchased_items.json", "r", encoding="utf-8") as f:
-                    return set(json.load(f))
-            return set()
-        except:
-            return set()
-
-    def save_purchased_items(self):
-        """保存已购买物品到文件"""
-        try:
-            with open("database/purchased_items.json", "w", encoding="utf-8") as f:  # 修改路径
-                json.dump(list(self.purchased_items), f, ensure_ascii=False, indent=2)
-        except:
-            pass
-
     def purchase_item(self, item_id):
         """购买物品"""
         if item_id not in self.purchased_items:
             self.purchased_items.add(item_id)
-            self.save_purchased_items()
+            self.game_db.add_purchased_item(item_id)
             return True
         return False
 
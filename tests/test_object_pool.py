@@ -0,0 +1,61 @@
+"""
+对象池回收测试 - 回收复用的僵尸不能继承旧对象留下的子弹命中记录
+"""
+import os
+import random
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pytest
+
+import bullets
+from core.constants import get_constants
+from core.game_logic import forget_zombie
+from zombies import create_zombie, release_zombie
+from zombies.zombie_factory import _zombie_pools
+
+
+@pytest.fixture(autouse=True)
+def empty_zombie_pools():
+    for pool in _zombie_pools.values():
+        pool.cleanup()
+    random.seed(1)
+
+
+def _new_zombie():
+    zombie = create_zombie(0, has_armor_prob=0.0, constants=get_constants())
+    zombie.immunity_chance = 0.0
+    zombie.col = 3.0
+    return zombie
+
+
+def _hit_then_recycle(bullet_type):
+    """子弹击中僵尸后僵尸离场回收，返回 (子弹, 复用得到的僵尸, 原僵尸 id)"""
+    zombie = _new_zombie()
+    old_id = id(zombie)
+    bullet = bullets.create_bullet(bullet_type, 0, 3.0, can_penetrate=True, constants=get_constants())
+    game = {"zombies": [zombie], "bullets": [bullet]}
+    assert bullet.attack_zombie(zombie, None) == 1
+
+    # 与游戏中僵尸离场的顺序相同
+    game["zombies"].remove(zombie)
+    forget_zombie(game, zombie)
+    release_zombie(zombie)
+    del zombie
+    return bullet, _new_zombie(), old_id
+
+
+def test_penetrating_pea_hits_recycled_zombie():
+    pea, recycled, old_id = _hit_then_recycle("pea")
+    assert id(recycled) == old_id  # 确实复用了同一个对象
+    health = recycled.health
+    assert pea.attack_zombie(recycled, None) == 1
+    assert recycled.health < health
+
+
+def test_ice_bullet_freezes_recycled_zombie():
+    ice, recycled, old_id = _hit_then_recycle("ice")
+    assert id(recycled) == old_id
+    assert ice.attack_zombie(recycled, None) == 1
+    assert recycled.is_frozen
@@ -0,0 +1,184 @@
+"""
+界面点击区域索引 - 每个界面的控件布局只构建一次，
+鼠标悬浮和点击通过均匀网格直接定位到控件ID，不再每个事件重建 Rect
+布局坐标需要与 ui_manager 中对应的绘制函数保持一致
+"""
+import pygame
+
+from core.constants import *
+
+# 网格单元边长（像素）
+HIT_CELL_SIZE = 64
+
+
+class HitTestIndex:
+    """均匀网格索引：查询时只检查鼠标所在格子里的少量控件"""
+
+    def __init__(self, cell_size=HIT_CELL_SIZE):
+        self.cell_size = cell_size
+        self.rects = {}  # 控件ID -> Rect
+        self._cells = {}  # (格x, 格y) -> [(控件ID, Rect)]，按注册顺序排列
+
+    def add(self, widget_id, rect):
+        """注册控件，先注册的控件在重叠时优先命中"""
+        rect = pygame.Rect(rect)
+        self.rects[widget_id] = rect
+        size = self.cell_size
+        for cell_x in range(rect.left // size, (rect.right - 1) // size + 1):
+            for cell_y in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                self._cells.setdefault((cell_x, cell_y), []).append((widget_id, rect))
+
+    def hit(self, pos):
+        """返回该点命中的控件ID，没有则为 None"""
+        x, y = pos
+        bucket = self._cells.get((int(x) // self.cell_size, int(y) // self.cell_size))
+        if bucket:
+            for widget_id, rect in bucket:
+                if rect.collidepoint(x, y):
+                    return widget_id
+        return None
+
+
+class UILayouts:
+    """按界面缓存布局，布局参数（如卡片数量、商品数量）变化时才重建"""
+
+    def __init__(self):
+        self._layouts = {}  # 界面名 -> (布局参数, HitTestIndex)
+
+    def get(self, name, key, builder):
+        """获取界面布局，builder(key) 用于构建新布局"""
+        entry = self._layouts.get(name)
+        if entry is None or entry[0] != key:
+            entry = (key, builder(key))
+            self._layouts[name] = entry
+        return entry[1]
+
+    def clear(self):
+        """清空所有布局（如窗口尺寸等全局参数变化时）"""
+        self._layouts.clear()
+
+
+# ---------- 各界面的布局构建（与对应的绘制函数保持一致） ----------
+
+BACK_BUTTON_RECT = (20, 20, 100, 40)
+MAIN_MENU_LABELS = ("主线模式", "挑战模式", "无尽模式", "设置")
+LEVEL_GRID_WIDTH = 7
+LEVEL_GRID_HEIGHT = 4
+LEVEL_BUTTON_SIZE = 80
+LEVEL_BUTTON_SPACING = 20
+MAX_LEVEL_BUTTONS = 28
+
+
+def build_main_menu_layout(_key=None):
+    """主菜单：模式按钮、商店按钮、图鉴按钮（与 draw_main_menu 一致）"""
+    index = HitTestIndex()
+    menu_width = 250
+    menu_x = BASE_WIDTH - menu_width - 50
+    menu_y = 150
+    for i in range(len(MAIN_MENU_LABELS)):
+        index.add(("menu", i), (menu_x, menu_y + i * 70, menu_width, 50))
+    index.add("shop", (100, BASE_HEIGHT // 2 + 50, 80, 80))
+    index.add("codex", (CODEX_BUTTON_X, CODEX_BUTTON_Y, CODEX_BUTTON_SIZE, CODEX_BUTTON_SIZE))
+    return index
+
+
+def build_level_select_layout(_key=None):
+    """选关界面：返回按钮和关卡按钮（与 draw_level_select 一致）"""
+    index = HitTestIndex()
+    index.add("back", BACK_BUTTON_RECT)
+    step = LEVEL_BUTTON_SIZE + LEVEL_BUTTON_SPACING
+    grid_start_x = (BASE_WIDTH - (LEVEL_GRID_WIDTH * step - LEVEL_BUTTON_SPACING)) // 2
+    grid_start_y = 100
+    for row in range(LEVEL_GRID_HEIGHT):
+        for col in range(LEVEL_GRID_WIDTH):
+            level_num = row * LEVEL_GRID_WIDTH + col + 1
+            if level_num > MAX_LEVEL_BUTTONS:
+                break
+            index.add(("level", level_num), (grid_start_x + col * step, grid_start_y + row * step,
+                                             LEVEL_BUTTON_SIZE, LEVEL_BUTTON_SIZE))
+    return index
+
+
+def build_codex_layout(_key=None):
+    """图鉴主页：返回按钮、植物图鉴和僵尸图鉴按钮（与 draw_codex_page 一致）"""
+    index = HitTestIndex()
+    index.add("back", BACK_BUTTON_RECT)
+    button_width = 320
+    button_height = 400
+    button_spacing = 60
+    start_x = (BASE_WIDTH - (2 * button_width + button_spacing)) // 2
+    start_y = 120
+    index.add("plants", (start_x, start_y, button_width, button_height))
+    index.add("zombies", (start_x + button_width + button_spacing, start_y, button_width, button_height))
+    return index
+
+
+def build_codex_detail_layout(item_count):
+    """详细图鉴：返回按钮和 6x5 图鉴网格（与 draw_codex_detail_page 一致）"""
+    index = HitTestIndex()
+    index.add("back", BACK_BUTTON_RECT)
+    grid_cols = 6
+    grid_rows = 5
+    cell_size = 80
+    cell_spacing = 8
+    for i in range(min(item_count, grid_cols * grid_rows)):
+        row, col = divmod(i, grid_cols)
+        index.add(("grid", i), (50 + col * (cell_size + cell_spacing),
+                                120 + row * (cell_size + cell_spacing), cell_size, cell_size))
+    return index
+
+
+def build_shop_layout(item_count):
+    """商店：当前页商品和分页按钮（与 draw_shop_page 一致）"""
+    index = HitTestIndex()
+    grid_cols = 4
+    item_width = 120
+    item_height = 140
+    item_spacing_x = 30
+    item_spacing_y = 20
+    grid_start_x = (BASE_WIDTH - (grid_cols * item_width + (grid_cols - 1) * item_spacing_x)) // 2
+    grid_start_y = 120
+    for i in range(item_count):
+        row, col = divmod(i, grid_cols)
+        index.add(("item", i), (grid_start_x + col * (item_width + item_spacing_x),
+                                grid_start_y + row * (item_height + item_spacing_y),
+                                item_width, item_height))
+
+    page_y = grid_start_y + (2 * item_height + item_spacing_y) + 40
+    index.add("prev_page", (BASE_WIDTH // 2 - 120, page_y, 80, 35))
+    index.add("next_page", (BASE_WIDTH // 2 + 40, page_y, 80, 35))
+    return index
+
+
+def build_settings_layout(in_game):
+    """设置菜单按钮（与 show_settings_menu_with_hotreload 一致）"""
+    index = HitTestIndex()
+    popup_width = 400
+    popup_height = 400 if in_game else 300
+    left = (BASE_WIDTH - popup_width) // 2
+    top = (BASE_HEIGHT - popup_height) // 2
+
+    index.add("fullscreen", (left + 75, top + 120, 250, 40))
+    if in_game:
+        index.add("restart_game", (left + 75, top + 175, 250, 40))
+        index.add("return_level_select", (left + 75, top + 230, 250, 40))
+        index.add("continue", (left + 50, top + 285, 140, 35))
+        index.add("quit", (left + 210, top + 285, 140, 35))
+    else:
+        index.add("reset", (left + 75, top + 175, 250, 40))
+        index.add("continue", (left + 50, top + 235, 140, 35))
+        index.add("quit", (left + 210, top + 235, 140, 35))
+    return index
+
+
+def build_playing_layout(key):
+    """游戏界面工具栏：设置按钮、铲子、锤子和卡槽，key 为 (卡片数量, 是否有锤子)"""
+    card_count, has_hammer = key
+    index = HitTestIndex()
+    index.add("settings", (SETTINGS_BUTTON_X, SETTINGS_BUTTON_Y, SETTINGS_BUTTON_WIDTH, SETTINGS_BUTTON_HEIGHT))
+    index.add("shovel", (SHOVEL_X, SHOVEL_Y, SHOVEL_WIDTH, SHOVEL_HEIGHT))
+    if has_hammer:
+        index.add("hammer", (HAMMER_X, HAMMER_Y, HAMMER_WIDTH, HAMMER_HEIGHT))
+    for i in range(card_count):
+        index.add(("card", i), (CARD_START_X + i * CARD_WIDTH, CARD_Y, CARD_WIDTH, CARD_HEIGHT))
+    return index
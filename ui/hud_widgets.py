@@ -0,0 +1,100 @@
+"""
+HUD 控件缓存 - 卡槽、铲子、锤子、进度条用到的各种状态图（缩放、灰化、半透明、冷却遮罩、文字）
+每种素材的每个状态只渲染一次，之后每帧只做固定数量的 blit，不再创建新的 Surface
+"""
+from collections import OrderedDict
+
+import pygame
+
+# 文字缓存上限（阳光、金币数值会不断变化，只保留最近用到的）
+TEXT_CACHE_SIZE = 256
+# 卡槽价格使用的字体字号
+PRICE_FONT_SIZE = 24
+
+
+class HudWidgets:
+    """HUD 状态图缓存，源图换了（如重新加载素材）会自动重建对应的变体"""
+
+    def __init__(self):
+        self._variants = {}  # (变体类型, id(源图), 参数) -> (源图, 变体表面)
+        self._overlays = {}  # (尺寸, 颜色) -> 纯色半透明表面
+        self._texts = OrderedDict()  # (字体, 文字, 颜色) -> 文字表面
+        self._price_font = None
+
+    @property
+    def price_font(self):
+        """卡槽价格字体，首次使用时创建"""
+        if self._price_font is None:
+            self._price_font = pygame.font.Font(None, PRICE_FONT_SIZE)
+        return self._price_font
+
+    def _variant(self, kind, source, param, builder):
+        key = (kind, id(source), param)
+        entry = self._variants.get(key)
+        # 保留源图引用，保证 id 在缓存期间不会被其他对象复用
+        if entry is None or entry[0] is not source:
+            entry = (source, builder())
+            self._variants[key] = entry
+        return entry[1]
+
+    def scaled(self, image, size):
+        """缩放图"""
+        return self._variant("scaled", image, size, lambda: pygame.transform.scale(image, size))
+
+    def gray(self, image):
+        """灰化图（冷却中、阳光不足）"""
+        def build():
+            gray_image = image.copy()
+            gray_image.fill((128, 128, 128), special_flags=pygame.BLEND_MULT)
+            return gray_image
+        return self._variant("gray", image, None, build)
+
+    def faded(self, image, alpha):
+        """整体半透明图（工具被拿起后原位置的残影）"""
+        def build():
+            faded_image = image.copy()
+            faded_image.set_alpha(alpha)
+            return faded_image
+        return self._variant("faded", image, alpha, build)
+
+    def overlay(self, size, color):
+        """纯色半透明遮罩（冷却遮罩等）"""
+        key = (size, color)
+        surface = self._overlays.get(key)
+        if surface is None:
+            surface = pygame.Surface(size, pygame.SRCALPHA)
+            surface.fill(color)
+            self._overlays[key] = surface
+        return surface
+
+    def glow(self, size, color, center, radius):
+        """带半透明圆形光晕的表面（大波旗帜）"""
+        key = ("glow", size, color, center, radius)
+        surface = self._overlays.get(key)
+        if surface is None:
+            surface = pygame.Surface(size, pygame.SRCALPHA)
+            pygame.draw.circle(surface, color, center, radius)
+            self._overlays[key] = surface
+        return surface
+
+    def text(self, font, text, color):
+        """抗锯齿文字"""
+        key = (font, text, color)
+        surface = self._texts.get(key)
+        if surface is None:
+            surface = font.render(text, True, color)
+            self._texts[key] = surface
+            if len(self._texts) > TEXT_CACHE_SIZE:
+                self._texts.popitem(last=False)
+        else:
+            self._texts.move_to_end(key)
+        return surface
+
+    def clear(self):
+        """清空所有缓存"""
+        self._variants.clear()
+        self._overlays.clear()
+        self._texts.clear()
+
+
+hud_widgets = HudWidgets()
@@ -0,0 +1,45 @@
+"""
+菜单页面缓存 - 选关、图鉴、商店等静态页面只在内容变化时重绘一次，
+之后每帧只按入场/退出动画的偏移把缓存的页面表面贴到屏幕上
+缓存键由调用方给出，需要包含影响页面内容的全部状态（页码、悬浮项、通关进度等）
+"""
+from collections import OrderedDict
+
+# 每个页面保留的缓存数量：悬浮在几个按钮之间来回移动时不必重绘
+PAGE_CACHE_SIZE = 6
+
+
+class PageSurfaceCache:
+    """按页面名缓存 (表面, 附带数据)，每个页面按最近使用保留少量版本"""
+
+    def __init__(self, max_entries=PAGE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._pages = {}  # 页面名 -> OrderedDict(缓存键 -> 构建结果)
+        self.builds = 0  # 累计重绘次数，便于观察缓存命中情况
+
+    def get(self, name, key, builder):
+        """获取页面，缓存中没有时调用 builder() 构建"""
+        entries = self._pages.get(name)
+        if entries is None:
+            entries = self._pages[name] = OrderedDict()
+
+        result = entries.get(key)
+        if result is None:
+            result = builder()
+            self.builds += 1
+            entries[key] = result
+            if len(entries) > self.max_entries:
+                entries.popitem(last=False)
+        else:
+            entries.move_to_end(key)
+        return result
+
+    def invalidate(self, name=None):
+        """清除指定页面（默认全部）的缓存，如配置热重载后"""
+        if name is None:
+            self._pages.clear()
+        else:
+            self._pages.pop(name, None)
+
+
+page_cache = PageSurfaceCache()
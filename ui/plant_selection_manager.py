@@ -247,6 +247,8 @@ class PlantSelectionManager:
     def hide_plant_selection(self):
         """隐藏植物选择界面"""
         self.show_plant_select = False
+        # 选卡完成，卡槽内容随之变化
+        self._invalidate_card_bar()
 
     def clear_plant_selection_state(self):
         """清空植物选择相关的所有状态"""
@@ -254,6 +256,12 @@ class PlantSelectionManager:
         self.flying_plants = []
         self.flying_selections = []
         self.show_plant_select = False
+        self._invalidate_card_bar()
+
+    def _invalidate_card_bar(self):
+        """通知游戏管理器重建卡槽缓存"""
+        if self.game_manager is not None:
+            self.game_manager.invalidate_card_bar()
 
     def mark_returning_to_plant_select(self):
         """标记正在返回植物选择界面，用于保持植物选择状态"""
@@ -11,6 +11,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from core.constants import *
 # 使用相对导入引用同一文件夹下的ui_manager
 from . import ui_manager
+from .hud_widgets import hud_widgets
 from core.cards_manager import get_available_cards_new
 
 
@@ -20,6 +21,9 @@ class RendererManager:
     def __init__(self, game_manager):
         self.game_manager = game_manager
         self.finish_btn = None  # 新增：存储开始战斗按钮
+        # 淡入淡出遮罩只创建一次，透明度变化时重新填充
+        self._fade_surface = None
+        self._fade_surface_alpha = None
 
     def render_game(self):
         """渲染游戏画面"""
@@ -172,9 +176,22 @@ class RendererManager:
         # 绘制奖杯
         self._render_trophy()
 
+        # 绘制倍速提示
+        self._render_game_speed_indicator()
+
         # 绘制淡入淡出效果
         self._render_fade_effect()
 
+    def _render_game_speed_indicator(self):
+        """倍速大于1时在战场右上角显示当前倍速"""
+        speed = self.game_manager.game_speed
+        if speed <= 1:
+            return
+        text_surface = self.game_manager.font_medium.render(f"{speed}x", True, (255, 255, 0))
+        x = BATTLEFIELD_LEFT + total_battlefield_width - text_surface.get_width() - 10
+        y = BATTLEFIELD_TOP - text_surface.get_height() - 5
+        self.game_manager.game_surface.blit(text_surface, (x, max(y, 0)))
+
     def _render_portals(self):
         """渲染传送门"""
         # 检查关卡管理器是否有传送门系统特性
@@ -219,12 +236,11 @@ class RendererManager:
                             self.game_manager.images.get('hammer_img')):
                         # 使用锤子图像
                         hammer_img = self.game_manager.images['hammer_img']
-                        hammer_scaled = pygame.transform.scale(hammer_img, (hammer_size, hammer_size))
+                        hammer_scaled = hud_widgets.scaled(hammer_img, (hammer_size, hammer_size))
 
                         # 添加轻微的阴影效果
                         shadow_offset = 2
-                        shadow_surface = pygame.Surface((hammer_size, hammer_size), pygame.SRCALPHA)
-                        shadow_surface.fill((0, 0, 0, 100))  # 半透明黑色阴影
+                        shadow_surface = hud_widgets.overlay((hammer_size, hammer_size), (0, 0, 0, 100))  # 半透明黑色阴影
                         self.game_manager.game_surface.blit(shadow_surface,
                                                             (hammer_x + shadow_offset, hammer_y + shadow_offset))
 
@@ -237,12 +253,9 @@ class RendererManager:
 
                     else:
                         # 没有图像时绘制简单的锤子形状
-                        from constants import HAMMER_COLOR
-
                         # 绘制阴影
                         shadow_rect = pygame.Rect(hammer_x + 2, hammer_y + 2, hammer_size, hammer_size)
-                        shadow_surface = pygame.Surface((hammer_size, hammer_size), pygame.SRCALPHA)
-                        shadow_surface.fill((0, 0, 0, 100))
+                        shadow_surface = hud_widgets.overlay((hammer_size, hammer_size), (0, 0, 0, 100))
                         self.game_manager.game_surface.blit(shadow_surface, shadow_rect.topleft)
 
                         # 绘制锤子矩形
@@ -312,15 +325,45 @@ class RendererManager:
                 self.game_manager.scaled_images
             )
 
+    def capture_previous_positions(self):
+        """逻辑帧开始前记录移动对象的位置，供渲染时插值"""
+        if self.game_manager.state_manager.game_state != "playing":
+            return
+        for obj in self.game_manager.game["zombies"]:
+            obj.prev_col = obj.col
+            obj.prev_row = obj.row
+        for obj in self.game_manager.game["bullets"]:
+            obj.prev_col = obj.col
+            obj.prev_row = obj.row
+
+    def _draw_interpolated(self, obj, alpha):
+        """在上一逻辑帧与当前逻辑帧的位置之间插值绘制，绘制后恢复真实位置"""
+        prev_col = obj.prev_col
+        col, row = obj.col, obj.row
+        # 新生成的对象或传送门瞬移时不插值
+        if prev_col is None or abs(col - prev_col) > INTERPOLATION_MAX_JUMP:
+            obj.draw(self.game_manager.game_surface)
+            return
+
+        obj.col = prev_col + (col - prev_col) * alpha
+        # 只有连续移动的浮点行坐标（如尖刺子弹）才插值，整数行的变化是传送
+        if isinstance(row, float) and abs(row - obj.prev_row) <= INTERPOLATION_MAX_JUMP:
+            obj.row = obj.prev_row + (row - obj.prev_row) * alpha
+        try:
+            obj.draw(self.game_manager.game_surface)
+        finally:
+            obj.col, obj.row = col, row
+
     def _render_game_objects(self):
         """渲染游戏对象（植物、僵尸、子弹）"""
+        alpha = self.game_manager.render_alpha
         # 正常游戏时绘制游戏对象
         for p in self.game_manager.game["plants"]:
             p.draw(self.game_manager.game_surface)
         for z in self.game_manager.game["zombies"]:
-            z.draw(self.game_manager.game_surface)
+            self._draw_interpolated(z, alpha)
         for b in self.game_manager.game["bullets"]:
-            b.draw(self.game_manager.game_surface)
+            self._draw_interpolated(b, alpha)
         if "dandelion_seeds" in self.game_manager.game:
             for seed in self.game_manager.game["dandelion_seeds"]:
                 seed.draw(self.game_manager.game_surface)
@@ -335,9 +378,13 @@ class RendererManager:
     def _render_fade_effect(self):
         """渲染淡入淡出效果"""
         if self.game_manager.game["fade_state"] != "none":
-            fade_surface = pygame.Surface((BASE_WIDTH, BASE_HEIGHT), pygame.SRCALPHA)
-            fade_surface.fill((0, 0, 0, self.game_manager.game["fade_alpha"]))
-            self.game_manager.game_surface.blit(fade_surface, (0, 0))
+            fade_alpha = self.game_manager.game["fade_alpha"]
+            if self._fade_surface is None:
+                self._fade_surface = pygame.Surface((BASE_WIDTH, BASE_HEIGHT), pygame.SRCALPHA)
+            if fade_alpha != self._fade_surface_alpha:
+                self._fade_surface.fill((0, 0, 0, fade_alpha))
+                self._fade_surface_alpha = fade_alpha
+            self.game_manager.game_surface.blit(self._fade_surface, (0, 0))
 
     def _render_common_ui(self):
         """渲染通用UI元素"""
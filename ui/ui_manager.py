@@ -11,6 +11,12 @@ import os
 
 from core.constants import *
 from animation.effects import AnimationEffects
+from .page_cache import page_cache
+from .hud_widgets import hud_widgets
+
+# 卡片和工具冷却遮罩颜色
+COOLDOWN_OVERLAY_COLOR = (0, 0, 0, 150)
+
 
 def draw_grid(surface, grid_bg_img=None):
     """绘制战场网格（使用背景图片或棕色边框）"""
@@ -125,14 +131,13 @@ def draw_progress_bar(surface, level_manager, game_state, wave_mode, font_small)
     # 为激活状态的旗帜添加发光效果
     if show_glow:
         # 绘制半透明的发光圈
-        glow_surface = pygame.Surface((flag_size * 3, flag_size * 3), pygame.SRCALPHA)
         glow_center = (flag_size * 1.5, flag_size * 1.5)
         glow_color = (255, 255, 100, 50)  # 半透明黄色
-        pygame.draw.circle(glow_surface, glow_color, glow_center, flag_size + 3)
+        glow_surface = hud_widgets.glow((flag_size * 3, flag_size * 3), glow_color, glow_center, flag_size + 3)
         surface.blit(glow_surface, (flag_x - flag_size * 1.5, flag_y - flag_size // 2))
 
     # 在旗帜下方显示"终点"文字
-    end_text = font_small.render("大波", True, WHITE)
+    end_text = hud_widgets.text(font_small, "大波", WHITE)
     text_x = flag_x - end_text.get_width() // 2
     text_y = bar_y + bar_height + 5  # 进度条下方5像素
     surface.blit(end_text, (text_x - 5, text_y))
@@ -150,10 +155,10 @@ def draw_ui(surface, sun, cards, shovel, selected, level_manager, wave_mode=Fals
                      (0, BATTLEFIELD_TOP + total_battlefield_height, BASE_WIDTH, bottom_height))
 
     # 3. 显示阳光数量（左上）
-    sun_text = font_medium.render(f"阳光: {int(sun)}", True, YELLOW)
+    sun_text = hud_widgets.text(font_medium, f"阳光: {int(sun)}", YELLOW)
     surface.blit(sun_text, (20, 20))
     if hasattr(game_manager, 'coins'):
-        coins_text = font_medium.render(f"金币: {game_manager.coins}", True, (255, 215, 0))  # 金色
+        coins_text = hud_widgets.text(font_medium, f"金币: {game_manager.coins}", (255, 215, 0))  # 金色
         surface.blit(coins_text, (20, 55))
 
     # 4. 显示关卡信息（移动到左下角原来进度条的位置）
@@ -164,17 +169,17 @@ def draw_ui(surface, sun, cards, shovel, selected, level_manager, wave_mode=Fals
     title_y = BASE_HEIGHT - 65  # 比原来进度条位置稍微上一点
 
     # 使用较大的字体绘制关卡名称
-    name_text = font_medium.render(level_name, True, WHITE)
+    name_text = hud_widgets.text(font_medium, level_name, WHITE)
     surface.blit(name_text, (title_x, title_y))
 
     # 在关卡名称下方显示向日葵种植限制
     sunflower_status = level_manager.get_sunflower_status_text()
     if sunflower_status:
-        status_text = font_small.render(sunflower_status, True, ORANGE)
+        status_text = hud_widgets.text(font_small, sunflower_status, ORANGE)
         surface.blit(status_text, (title_x, title_y + 35))  # 关卡名称下方25像素
 
         if not level_manager.can_plant_sunflower():
-            warning_text = font_small.render("", True, RED)
+            warning_text = hud_widgets.text(font_small, "", RED)
             surface.blit(warning_text, (title_x, title_y + 45))
 
     # 5. 绘制进度条（移动到设置按钮左边）
@@ -206,13 +211,11 @@ def draw_ui(surface, sun, cards, shovel, selected, level_manager, wave_mode=Fals
         # 绘制锤子背景和图标
         if images and images.get('hammer_img') and is_hammer_ready:
             # 锤子可用时显示正常图像，完全填充按钮
-            hammer_img_scaled = pygame.transform.scale(images['hammer_img'], (SHOVEL_WIDTH, SHOVEL_HEIGHT))
+            hammer_img_scaled = hud_widgets.scaled(images['hammer_img'], (SHOVEL_WIDTH, SHOVEL_HEIGHT))
 
             if hammer_selected:
                 # 锤子被选中时，原位置显示半透明图像
-                hammer_img_alpha = hammer_img_scaled.copy()
-                hammer_img_alpha.set_alpha(80)  # 设置为半透明
-                surface.blit(hammer_img_alpha, (HAMMER_X, HAMMER_Y))
+                surface.blit(hud_widgets.faded(hammer_img_scaled, 80), (HAMMER_X, HAMMER_Y))
 
                 # 绘制空槽边框，表示锤子已被拿起
                 pygame.draw.rect(surface, (100, 100, 100), hammer_rect, 2)
@@ -222,19 +225,14 @@ def draw_ui(surface, sun, cards, shovel, selected, level_manager, wave_mode=Fals
 
         elif images and images.get('hammer_img'):
             # 锤子冷却中显示灰色图像，完全填充按钮
-            hammer_img_scaled = pygame.transform.scale(images['hammer_img'], (SHOVEL_WIDTH, SHOVEL_HEIGHT))
-            hammer_img_gray = hammer_img_scaled.copy()
-            hammer_img_gray.fill((128, 128, 128), special_flags=pygame.BLEND_MULT)
-            surface.blit(hammer_img_gray, (HAMMER_X, HAMMER_Y))
+            hammer_img_scaled = hud_widgets.scaled(images['hammer_img'], (SHOVEL_WIDTH, SHOVEL_HEIGHT))
+            surface.blit(hud_widgets.gray(hammer_img_scaled), (HAMMER_X, HAMMER_Y))
         else:
             # 没有图像时绘制简单矩形，使用和铲子一样的尺寸
             if hammer_selected:
                 # 锤子被选中时，原位置显示半透明矩形
                 color = (*HAMMER_COLOR[:3], 80) if is_hammer_ready else (100, 100, 100, 80)
-                # 创建半透明表面
-                alpha_surface = pygame.Surface((SHOVEL_WIDTH, SHOVEL_HEIGHT), pygame.SRCALPHA)
-                alpha_surface.fill(color)
-                surface.blit(alpha_surface, (HAMMER_X, HAMMER_Y))
+                surface.blit(hud_widgets.overlay((SHOVEL_WIDTH, SHOVEL_HEIGHT), color), (HAMMER_X, HAMMER_Y))
                 # 绘制空槽边框
                 pygame.draw.rect(surface, (100, 100, 100), hammer_rect, 2)
             else:
@@ -251,19 +249,17 @@ def draw_ui(surface, sun, cards, shovel, selected, level_manager, wave_mode=Fals
 
         # 显示冷却倒计时
         if hammer_cooldown > 0:
-            # 绘制冷却覆盖层
-            cooldown_surface = pygame.Surface((SHOVEL_WIDTH, SHOVEL_HEIGHT), pygame.SRCALPHA)
-            cooldown_surface.fill((0, 0, 0, 150))  # 半透明黑色
-            surface.blit(cooldown_surface, (HAMMER_X, HAMMER_Y))
+            # 绘制冷却覆盖层（半透明黑色）
+            surface.blit(hud_widgets.overlay((SHOVEL_WIDTH, SHOVEL_HEIGHT), COOLDOWN_OVERLAY_COLOR), (HAMMER_X, HAMMER_Y))
 
             # 绘制冷却倒计时
             cooldown_seconds = int(hammer_cooldown / 60) + 1  # 转换为秒，向上取整
-            cooldown_text = font_medium.render(str(cooldown_seconds), True, WHITE)
+            cooldown_text = hud_widgets.text(font_medium, str(cooldown_seconds), WHITE)
             text_rect = cooldown_text.get_rect(center=(HAMMER_X + SHOVEL_WIDTH // 2, HAMMER_Y + SHOVEL_HEIGHT // 2))
             surface.blit(cooldown_text, text_rect)
 
-    # 创建卡槽价格专用字体
-    price_font = pygame.font.Font(None, 24)
+    # 卡槽价格专用字体（只创建一次）
+    price_font = hud_widgets.price_font
 
     # 7. 绘制植物卡槽（包含冷却效果和阳光不足灰化）
     card_cooldowns = game_state.get("card_cooldowns", {}) if game_state else {}
@@ -322,9 +318,7 @@ def draw_ui(surface, sun, cards, shovel, selected, level_manager, wave_mode=Fals
                 if card_fully_available:
                     surface.blit(images['card_bg_img'], (card_x, CARD_Y))
                 else:
-                    gray_surface = images['card_bg_img'].copy()
-                    gray_surface.fill((128, 128, 128), special_flags=pygame.BLEND_MULT)
-                    surface.blit(gray_surface, (card_x, CARD_Y))
+                    surface.blit(hud_widgets.gray(images['card_bg_img']), (card_x, CARD_Y))
             else:
                 color = card["color"] if card_fully_available else (100, 100, 100)
                 pygame.draw.rect(surface, color, card_rect)
@@ -369,7 +363,7 @@ def draw_ui(surface, sun, cards, shovel, selected, level_manager, wave_mode=Fals
 
             # 绘制卡片成本（右下）- 使用24号字体
             cost_color = WHITE if sun_sufficient else RED  # 阳光不足时成本显示为红色
-            cost_text = price_font.render(f"{card['cost']}", True, cost_color)
+            cost_text = hud_widgets.text(price_font, f"{card['cost']}", cost_color)
             surface.blit(cost_text, (card_rect.right - 55, card_rect.bottom - 25))
 
             # 如果卡片不可用（向日葵限制），显示禁用标识
@@ -379,14 +373,12 @@ def draw_ui(surface, sun, cards, shovel, selected, level_manager, wave_mode=Fals
 
             # 绘制冷却效果
             if is_cooling:
-                # 绘制冷却覆盖层
-                cooldown_surface = pygame.Surface((CARD_WIDTH, CARD_HEIGHT), pygame.SRCALPHA)
-                cooldown_surface.fill((0, 0, 0, 150))  # 半透明黑色
-                surface.blit(cooldown_surface, (card_x, CARD_Y))
+                # 绘制冷却覆盖层（半透明黑色）
+                surface.blit(hud_widgets.overlay((CARD_WIDTH, CARD_HEIGHT), COOLDOWN_OVERLAY_COLOR), (card_x, CARD_Y))
 
                 # 绘制冷却倒计时
                 cooldown_seconds = int(cooldown_remaining / 60) + 1  # 转换为秒，向上取整
-                cooldown_text = font_medium.render(str(cooldown_seconds), True, WHITE)
+                cooldown_text = hud_widgets.text(font_medium, str(cooldown_seconds), WHITE)
                 text_rect = cooldown_text.get_rect(center=(card_x + CARD_WIDTH // 2, CARD_Y + CARD_HEIGHT // 2))
                 surface.blit(cooldown_text, text_rect)
         else:
@@ -854,30 +846,8 @@ def draw_main_menu(surface, animation_timer, exit_animation=False, has_saved_gam
     return buttons
 
 
-def draw_codex_page(surface, animation_timer, animation_complete, exit_animation, exit_timer,
-                    font_large, font_medium, state_manager=None):
-    """绘制图鉴页面 - 支持入场和退出动画，包含植物和僵尸两个大按钮"""
-
-    # 计算页面偏移（图鉴从右侧滑入和滑出）
-    if exit_animation:
-        # 退出动画：从当前位置向右滑出屏幕
-        exit_duration = 60
-        progress = min(1.0, exit_timer / exit_duration)
-        eased_progress = ease_in_cubic(progress)  # 加速退出
-
-        page_start_x = 0  # 当前位置
-        page_end_x = BASE_WIDTH  # 滑出到右侧屏幕外
-        page_offset_x = int(page_start_x + (page_end_x - page_start_x) * eased_progress)
-    else:
-        # 入场动画：从右侧滑入
-        animation_duration = 80
-        progress = min(1.0, animation_timer / animation_duration) if not animation_complete else 1.0
-        eased_progress = ease_out_quart(progress)
-
-        page_start_x = BASE_WIDTH  # 从右侧屏幕外开始
-        page_end_x = 0  # 最终位置
-        page_offset_x = int(page_start_x + (page_end_x - page_start_x) * eased_progress)
-
+def _build_codex_page(font_large, font_medium, is_plant_hovered, is_zombie_hovered):
+    """绘制图鉴主页（不含动画偏移），返回 (页面表面, 按钮矩形)"""
     # 创建临时表面来绘制整个图鉴界面
     codex_surface = pygame.Surface((BASE_WIDTH, BASE_HEIGHT), pygame.SRCALPHA)
 
@@ -914,8 +884,6 @@ def draw_codex_page(surface, animation_timer, animation_complete, exit_animation
 
     # 植物按钮（左侧）
     plant_btn = pygame.Rect(start_x, start_y, button_width, button_height)
-    is_plant_hovered = state_manager and state_manager.is_button_hovered("plants", "codex")
-
     plant_color = (100, 180, 100) if not is_plant_hovered else (120, 200, 120)
     pygame.draw.rect(codex_surface, plant_color, plant_btn)
     pygame.draw.rect(codex_surface, (255, 255, 255), plant_btn, 4)
@@ -948,8 +916,6 @@ def draw_codex_page(surface, animation_timer, animation_complete, exit_animation
 
     # 僵尸按钮（右侧）
     zombie_btn = pygame.Rect(start_x + button_width + button_spacing, start_y, button_width, button_height)
-    is_zombie_hovered = state_manager and state_manager.is_button_hovered("zombies", "codex")
-
     zombie_color = (180, 100, 100) if not is_zombie_hovered else (200, 120, 120)
     pygame.draw.rect(codex_surface, zombie_color, zombie_btn)
     pygame.draw.rect(codex_surface, (255, 255, 255), zombie_btn, 4)
@@ -988,50 +954,53 @@ def draw_codex_page(surface, animation_timer, animation_complete, exit_animation
     zombie_text_y = zombie_btn.bottom - 80
     codex_surface.blit(zombie_title, (zombie_btn.centerx - zombie_title.get_width() // 2, zombie_text_y))
 
+    return codex_surface, (back_btn, plant_btn, zombie_btn)
 
-    # 将整个图鉴表面绘制到主表面，应用水平偏移
-    surface.blit(codex_surface, (page_offset_x, 0))
-
-    # 调整按钮位置（考虑页面偏移）
-    adjusted_back_btn = pygame.Rect(back_btn.x + page_offset_x, back_btn.y, back_btn.width, back_btn.height)
-    adjusted_plant_btn = pygame.Rect(plant_btn.x + page_offset_x, plant_btn.y, plant_btn.width, plant_btn.height)
-    adjusted_zombie_btn = pygame.Rect(zombie_btn.x + page_offset_x, zombie_btn.y, zombie_btn.width, zombie_btn.height)
-
-    return adjusted_back_btn, adjusted_plant_btn, adjusted_zombie_btn
-
-
-def draw_level_select(surface, game_db, level_settings=None, menu_bg_img=None,
-                      font_medium=None, font_small=None, settings_img=None,
-                      animation_timer=0, animation_complete=False, exit_animation=False, exit_timer=0, hover_pos=None,
-                      hover_level=None, state_manager=None):
-    """绘制选关界面 - 支持入场和退出动画，新增关卡解锁系统"""
 
-    # 绘制背景
-    if menu_bg_img:
-        surface.blit(menu_bg_img, (0, 0))
-    else:
-        surface.fill((0, 100, 0))
+def draw_codex_page(surface, animation_timer, animation_complete, exit_animation, exit_timer,
+                    font_large, font_medium, state_manager=None):
+    """绘制图鉴页面 - 支持入场和退出动画，包含植物和僵尸两个大按钮"""
 
-    # 计算页面偏移
+    # 计算页面偏移（图鉴从右侧滑入和滑出）
     if exit_animation:
-        # 退出动画：从当前位置向左滑出屏幕
+        # 退出动画：从当前位置向右滑出屏幕
         exit_duration = 60
         progress = min(1.0, exit_timer / exit_duration)
         eased_progress = ease_in_cubic(progress)  # 加速退出
 
         page_start_x = 0  # 当前位置
-        page_end_x = -BASE_WIDTH  # 滑出到左侧屏幕外
+        page_end_x = BASE_WIDTH  # 滑出到右侧屏幕外
         page_offset_x = int(page_start_x + (page_end_x - page_start_x) * eased_progress)
     else:
-        # 入场动画：从左侧滑入
+        # 入场动画：从右侧滑入
         animation_duration = 80
         progress = min(1.0, animation_timer / animation_duration) if not animation_complete else 1.0
         eased_progress = ease_out_quart(progress)
 
-        page_start_x = -BASE_WIDTH  # 从左侧屏幕外开始
+        page_start_x = BASE_WIDTH  # 从右侧屏幕外开始
         page_end_x = 0  # 最终位置
         page_offset_x = int(page_start_x + (page_end_x - page_start_x) * eased_progress)
 
+    # 页面内容只在悬浮按钮变化时重绘
+    is_plant_hovered = bool(state_manager and state_manager.is_button_hovered("plants", "codex"))
+    is_zombie_hovered = bool(state_manager and state_manager.is_button_hovered("zombies", "codex"))
+    codex_surface, (back_btn, plant_btn, zombie_btn) = page_cache.get(
+        "codex", (is_plant_hovered, is_zombie_hovered),
+        lambda: _build_codex_page(font_large, font_medium, is_plant_hovered, is_zombie_hovered))
+
+    # 将整个图鉴表面绘制到主表面，应用水平偏移
+    surface.blit(codex_surface, (page_offset_x, 0))
+
+    # 调整按钮位置（考虑页面偏移）
+    adjusted_back_btn = pygame.Rect(back_btn.x + page_offset_x, back_btn.y, back_btn.width, back_btn.height)
+    adjusted_plant_btn = pygame.Rect(plant_btn.x + page_offset_x, plant_btn.y, plant_btn.width, plant_btn.height)
+    adjusted_zombie_btn = pygame.Rect(zombie_btn.x + page_offset_x, zombie_btn.y, zombie_btn.width, zombie_btn.height)
+
+    return adjusted_back_btn, adjusted_plant_btn, adjusted_zombie_btn
+
+
+def _build_level_select_page(font_medium, font_small, completed_levels, hover_level):
+    """绘制选关页面（不含动画偏移），返回 (页面表面, 返回按钮, 可点击关卡, 下一个可玩关卡)"""
     # 创建临时表面来绘制整个选关界面
     level_select_surface = pygame.Surface((BASE_WIDTH, BASE_HEIGHT), pygame.SRCALPHA)
 
@@ -1043,13 +1012,10 @@ def draw_level_select(surface, game_db, level_settings=None, menu_bg_img=None,
                                           back_btn.centery - back_text.get_height() // 2))
 
     # 绘制统计信息
-    completed_count = game_db.get_completion_count()
+    completed_count = len(completed_levels)
     stats_text = font_medium.render(f"已通关: {completed_count}/28", True, WHITE)
     level_select_surface.blit(stats_text, (BASE_WIDTH - stats_text.get_width() - 20, 30))
 
-    # 获取已通关的关卡列表
-    completed_levels = game_db.get_completed_levels()
-
     # 计算下一个可玩关卡（最高通关关卡+1，但不超过28）
     if completed_levels:
         next_playable_level = max(completed_levels) + 1
@@ -1148,12 +1114,51 @@ def draw_level_select(surface, game_db, level_settings=None, menu_bg_img=None,
                 lock_ring_rect = pygame.Rect(lock_x + 6, lock_y, lock_size - 12, lock_size - 8)
                 pygame.draw.arc(level_select_surface, (80, 80, 80), lock_ring_rect, 0, 3.14, 3)
 
-            # 调整按钮矩形位置（考虑页面偏移）
-            adjusted_level_rect = pygame.Rect(level_x + page_offset_x, level_y, level_size, level_size)
-
             # 只有非锁定状态的关卡才能点击
             if not is_locked:
-                level_buttons.append((adjusted_level_rect, level_num))
+                level_buttons.append((level_rect, level_num))
+
+    return level_select_surface, back_btn, level_buttons, next_playable_level
+
+
+def draw_level_select(surface, game_db, level_settings=None, menu_bg_img=None,
+                      font_medium=None, font_small=None, settings_img=None,
+                      animation_timer=0, animation_complete=False, exit_animation=False, exit_timer=0, hover_pos=None,
+                      hover_level=None, state_manager=None):
+    """绘制选关界面 - 支持入场和退出动画，新增关卡解锁系统"""
+
+    # 绘制背景
+    if menu_bg_img:
+        surface.blit(menu_bg_img, (0, 0))
+    else:
+        surface.fill((0, 100, 0))
+
+    # 计算页面偏移
+    if exit_animation:
+        # 退出动画：从当前位置向左滑出屏幕
+        exit_duration = 60
+        progress = min(1.0, exit_timer / exit_duration)
+        eased_progress = ease_in_cubic(progress)  # 加速退出
+
+        page_start_x = 0  # 当前位置
+        page_end_x = -BASE_WIDTH  # 滑出到左侧屏幕外
+        page_offset_x = int(page_start_x + (page_end_x - page_start_x) * eased_progress)
+    else:
+        # 入场动画：从左侧滑入
+        animation_duration = 80
+        progress = min(1.0, animation_timer / animation_duration) if not animation_complete else 1.0
+        eased_progress = ease_out_quart(progress)
+
+        page_start_x = -BASE_WIDTH  # 从左侧屏幕外开始
+        page_end_x = 0  # 最终位置
+        page_offset_x = int(page_start_x + (page_end_x - page_start_x) * eased_progress)
+
+    # 页面内容只在通关进度或悬浮关卡变化时重绘
+    completed_levels = game_db.get_completed_levels()
+    level_select_surface, back_btn, page_buttons, next_playable_level = page_cache.get(
+        "level_select", (tuple(completed_levels), hover_level),
+        lambda: _build_level_select_page(font_medium, font_small, completed_levels, hover_level))
+    level_buttons = [(level_rect.move(page_offset_x, 0), level_num) for level_rect, level_num in page_buttons]
 
     # 将整个临时表面绘制到主表面，应用水平偏移
     surface.blit(level_select_surface, (page_offset_x, 0))
@@ -1161,7 +1166,6 @@ def draw_level_select(surface, game_db, level_settings=None, menu_bg_img=None,
     # 绘制工具提示（悬浮时显示关卡名称）
     if hover_level and hover_pos and not exit_animation:
         # 根据关卡状态显示不同的提示信息
-        completed_levels = game_db.get_completed_levels()
         is_completed = hover_level in completed_levels
         is_next_playable = (hover_level == next_playable_level)
         is_locked = not is_completed and not is_next_playable
@@ -1178,21 +1182,14 @@ def draw_level_select(surface, game_db, level_settings=None, menu_bg_img=None,
     return adjusted_back_btn, level_buttons
 
 
-def draw_level_tooltip(surface, level_num, mouse_pos, font_small, game_db, status):
-    """绘制带状态的关卡工具提示"""
-    # 添加类型检查，防止传入错误的参数类型
-    if not isinstance(mouse_pos, (tuple, list)) or len(mouse_pos) != 2:
-        return  # 直接返回，不绘制提示
-
+def _build_level_tooltip(level_num, font_small, status, is_completed):
+    """绘制关卡提示框的背景和文字，返回 (背景表面, 文字表面)"""
     # 获取关卡名称（需要创建临时关卡管理器获取配置）
     from core.level_manager import LevelManager
     temp_level_manager = LevelManager("database/levels.json")
     temp_level_manager.start_level(level_num)
     level_name = temp_level_manager.get_level_name()
 
-    # 获取通关状态
-    is_completed = game_db.is_level_completed(level_num)
-
     # 根据状态组合显示文本
     if status == "locked":
         tooltip_text = f"{level_name} (已锁定)"
@@ -1207,17 +1204,6 @@ def draw_level_tooltip(surface, level_num, mouse_pos, font_small, game_db, statu
     tooltip_width = text_surface.get_width() + 20
     tooltip_height = text_surface.get_height() + 10
 
-    # 计算工具提示位置（鼠标右下方，但不超出屏幕）
-    mouse_x, mouse_y = mouse_pos
-    tooltip_x = mouse_x + 15
-    tooltip_y = mouse_y + 15
-
-    # 防止超出屏幕边界
-    if tooltip_x + tooltip_width > BASE_WIDTH:
-        tooltip_x = mouse_x - tooltip_width - 5
-    if tooltip_y + tooltip_height > BASE_HEIGHT:
-        tooltip_y = mouse_y - tooltip_height - 5
-
     # 绘制工具提示背景
     tooltip_bg = pygame.Surface((tooltip_width, tooltip_height), pygame.SRCALPHA)
     if status == "locked":
@@ -1229,6 +1215,34 @@ def draw_level_tooltip(surface, level_num, mouse_pos, font_small, game_db, statu
 
     pygame.draw.rect(tooltip_bg, border_color, (0, 0, tooltip_width, tooltip_height), 1)
 
+    return tooltip_bg, text_surface
+
+
+def draw_level_tooltip(surface, level_num, mouse_pos, font_small, game_db, status):
+    """绘制带状态的关卡工具提示"""
+    # 添加类型检查，防止传入错误的参数类型
+    if not isinstance(mouse_pos, (tuple, list)) or len(mouse_pos) != 2:
+        return  # 直接返回，不绘制提示
+
+    # 提示框只在关卡或状态变化时重建（关卡名需要读取关卡配置）
+    is_completed = game_db.is_level_completed(level_num)
+    tooltip_bg, text_surface = page_cache.get(
+        "level_tooltip", (level_num, status, is_completed),
+        lambda: _build_level_tooltip(level_num, font_small, status, is_completed))
+    tooltip_width = tooltip_bg.get_width()
+    tooltip_height = tooltip_bg.get_height()
+
+    # 计算工具提示位置（鼠标右下方，但不超出屏幕）
+    mouse_x, mouse_y = mouse_pos
+    tooltip_x = mouse_x + 15
+    tooltip_y = mouse_y + 15
+
+    # 防止超出屏幕边界
+    if tooltip_x + tooltip_width > BASE_WIDTH:
+        tooltip_x = mouse_x - tooltip_width - 5
+    if tooltip_y + tooltip_height > BASE_HEIGHT:
+        tooltip_y = mouse_y - tooltip_height - 5
+
     surface.blit(tooltip_bg, (tooltip_x, tooltip_y))
     surface.blit(text_surface, (tooltip_x + 10, tooltip_y + 5))
 
@@ -1591,31 +1605,8 @@ def get_button_color(base_color, is_hovered, hover_boost=30):
         return tuple(min(255, c + hover_boost) if i < 3 else c for i, c in enumerate(base_color))
 
 
-def draw_shop_page(surface, animation_timer, animation_complete, exit_animation, exit_timer,
-                   font_large, font_medium, state_manager, shop_manager, scaled_images=None, font_tiny=None,
-                   font_small=None, game_manager=None):
-    """绘制商店页面 - 支持入场和退出动画，显示小推车图片和购买状态"""
-
-    # 计算页面偏移（商店从右侧滑入和滑出）
-    if exit_animation:
-        # 退出动画：从当前位置向右滑出屏幕
-        exit_duration = 60
-        progress = min(1.0, exit_timer / exit_duration)
-        eased_progress = ease_in_cubic(progress)  # 加速退出
-
-        page_start_x = 0  # 当前位置
-        page_end_x = BASE_WIDTH  # 滑出到右侧屏幕外
-        page_offset_x = int(page_start_x + (page_end_x - page_start_x) * eased_progress)
-    else:
-        # 入场动画：从右侧滑入
-        animation_duration = 80
-        progress = min(1.0, animation_timer / animation_duration) if not animation_complete else 1.0
-        eased_progress = ease_out_quart(progress)
-
-        page_start_x = BASE_WIDTH  # 从右侧屏幕外开始
-        page_end_x = 0  # 最终位置
-        page_offset_x = int(page_start_x + (page_end_x - page_start_x) * eased_progress)
-
+def _build_shop_page(font_medium, font_tiny, font_small, shop_manager, scaled_images, coins, hover_button):
+    """绘制商店页面（不含动画偏移），返回 (页面表面, (返回按钮, 商品矩形, 上一页按钮, 下一页按钮))"""
     # 创建临时表面来绘制整个商店界面
     shop_surface = pygame.Surface((BASE_WIDTH, BASE_HEIGHT), pygame.SRCALPHA)
 
@@ -1627,8 +1618,8 @@ def draw_shop_page(surface, animation_timer, animation_complete, exit_animation,
                                   back_btn.centery - back_text.get_height() // 2))
 
     # 改进的金币显示 - 动态调整宽度
-    if hasattr(game_manager, 'coins'):
-        coins_text = font_medium.render(f"金币: {game_manager.coins}", True, (255, 255, 255))
+    if coins is not None:
+        coins_text = font_medium.render(f"金币: {coins}", True, (255, 255, 255))
         text_width = coins_text.get_width()
         text_height = coins_text.get_height()
 
@@ -1696,7 +1687,7 @@ def draw_shop_page(surface, animation_timer, animation_complete, exit_animation,
         item_rect = pygame.Rect(item_x, item_y, item_width, item_height)
 
         # 检查是否悬浮
-        is_hovered = state_manager and state_manager.is_button_hovered(f"item_{i}", "shop")
+        is_hovered = (hover_button == f"item_{i}")
 
         # 检查是否已购买
         is_purchased = shop_manager.is_purchased(item['id'])
@@ -1774,8 +1765,7 @@ def draw_shop_page(surface, animation_timer, animation_complete, exit_animation,
         shop_surface.blit(buy_text, (buy_text_x, buy_text_y))
 
         # 保存商品矩形（用于点击检测）
-        adjusted_item_rect = pygame.Rect(item_x + page_offset_x, item_y, item_width, item_height)
-        item_rects.append((adjusted_item_rect, item, i))
+        item_rects.append((item_rect, item, i))
 
     # 绘制分页按钮
     page_y = grid_start_y + total_grid_height + 40
@@ -1809,15 +1799,53 @@ def draw_shop_page(surface, animation_timer, animation_complete, exit_animation,
     next_text_y = next_btn.centery - next_text.get_height() // 2
     shop_surface.blit(next_text, (next_text_x, next_text_y))
 
+    return shop_surface, (back_btn, item_rects, prev_btn if prev_enabled else None,
+                          next_btn if next_enabled else None)
+
+
+def draw_shop_page(surface, animation_timer, animation_complete, exit_animation, exit_timer,
+                   font_large, font_medium, state_manager, shop_manager, scaled_images=None, font_tiny=None,
+                   font_small=None, game_manager=None):
+    """绘制商店页面 - 支持入场和退出动画，显示小推车图片和购买状态"""
+
+    # 计算页面偏移（商店从右侧滑入和滑出）
+    if exit_animation:
+        # 退出动画：从当前位置向右滑出屏幕
+        exit_duration = 60
+        progress = min(1.0, exit_timer / exit_duration)
+        eased_progress = ease_in_cubic(progress)  # 加速退出
+
+        page_start_x = 0  # 当前位置
+        page_end_x = BASE_WIDTH  # 滑出到右侧屏幕外
+        page_offset_x = int(page_start_x + (page_end_x - page_start_x) * eased_progress)
+    else:
+        # 入场动画：从右侧滑入
+        animation_duration = 80
+        progress = min(1.0, animation_timer / animation_duration) if not animation_complete else 1.0
+        eased_progress = ease_out_quart(progress)
+
+        page_start_x = BASE_WIDTH  # 从右侧屏幕外开始
+        page_end_x = 0  # 最终位置
+        page_offset_x = int(page_start_x + (page_end_x - page_start_x) * eased_progress)
+
+    # 页面内容只在页码、悬浮商品、购买状态或金币变化时重绘
+    current_items = shop_manager.get_current_page_items()
+    coins = game_manager.coins if hasattr(game_manager, 'coins') else None
+    hover_button = state_manager.hover_button if state_manager and state_manager.hover_button_type == "shop" else None
+    page_key = (shop_manager.current_page, hover_button, coins,
+                tuple(shop_manager.is_purchased(item['id']) for item in current_items))
+    shop_surface, (back_btn, page_item_rects, prev_btn, next_btn) = page_cache.get(
+        "shop", page_key,
+        lambda: _build_shop_page(font_medium, font_tiny, font_small, shop_manager, scaled_images, coins, hover_button))
+
     # 将整个商店表面绘制到主表面，应用水平偏移
     surface.blit(shop_surface, (page_offset_x, 0))
 
     # 调整按钮位置（考虑页面偏移）
-    adjusted_back_btn = pygame.Rect(back_btn.x + page_offset_x, back_btn.y, back_btn.width, back_btn.height)
-    adjusted_prev_btn = pygame.Rect(prev_btn.x + page_offset_x, prev_btn.y, prev_btn.width,
-                                    prev_btn.height) if prev_enabled else None
-    adjusted_next_btn = pygame.Rect(next_btn.x + page_offset_x, next_btn.y, next_btn.width,
-                                    next_btn.height) if next_enabled else None
+    adjusted_back_btn = back_btn.move(page_offset_x, 0)
+    item_rects = [(item_rect.move(page_offset_x, 0), item, i) for item_rect, item, i in page_item_rects]
+    adjusted_prev_btn = prev_btn.move(page_offset_x, 0) if prev_btn else None
+    adjusted_next_btn = next_btn.move(page_offset_x, 0) if next_btn else None
 
     return adjusted_back_btn, item_rects, adjusted_prev_btn, adjusted_next_btn
 
@@ -1906,22 +1934,10 @@ def wrap_text_chinese(text, max_chars_per_line=11):
     return lines
 
 
-def draw_codex_detail_page(surface, detail_type, selected_index, font_large, font_medium, font_small, font_tiny,
-                           scaled_images=None, state_manager=None):
-    """
-    绘制详细图鉴页面（修复版本 - 支持中文按字符数换行）
-
-    Args:
-        surface: 绘制表面
-        detail_type: "plants" 或 "zombies"
-        selected_index: 当前选中的项目索引
-        font_large/medium/small: 字体
-        scaled_images: 缩放后的图像字典
-        state_manager: 状态管理器
-
-    Returns:
-        (back_btn, grid_rects): 返回按钮和网格矩形列表
-    """
+def _build_codex_detail_page(detail_type, selected_index, hover_button, font_large, font_medium,
+                             font_small, font_tiny, scaled_images):
+    """绘制详细图鉴页面（整屏不透明），返回 (页面表面, (返回按钮, 网格矩形))"""
+    page_surface = pygame.Surface((BASE_WIDTH, BASE_HEIGHT))
 
     # 清除背景（深蓝紫色渐变）
     for y in range(BASE_HEIGHT):
@@ -1929,13 +1945,13 @@ def draw_codex_detail_page(surface, detail_type, selected_index, font_large, fon
         r = int(20 + (40 - 20) * ratio)
         g = int(30 + (60 - 30) * ratio)
         b = int(80 + (120 - 80) * ratio)
-        pygame.draw.line(surface, (r, g, b), (0, y), (BASE_WIDTH, y))
+        pygame.draw.line(page_surface, (r, g, b), (0, y), (BASE_WIDTH, y))
 
     # 绘制返回按钮
     back_btn = pygame.Rect(20, 20, 100, 40)
-    pygame.draw.rect(surface, RED, back_btn)
+    pygame.draw.rect(page_surface, RED, back_btn)
     back_text = font_medium.render("返回", True, WHITE)
-    surface.blit(back_text, (back_btn.centerx - back_text.get_width() // 2,
+    page_surface.blit(back_text, (back_btn.centerx - back_text.get_width() // 2,
                              back_btn.centery - back_text.get_height() // 2))
 
     # 绘制标题
@@ -1943,7 +1959,7 @@ def draw_codex_detail_page(surface, detail_type, selected_index, font_large, fon
     title = font_large.render(title_text, True, WHITE)
     title_x = (BASE_WIDTH - title.get_width()) // 2
     title_y = 30
-    surface.blit(title, (title_x, title_y))
+    page_surface.blit(title, (title_x, title_y))
 
     # 定义数据
     if detail_type == "plants":
@@ -1966,8 +1982,8 @@ def draw_codex_detail_page(surface, detail_type, selected_index, font_large, fon
     # 绘制网格背景板
     grid_bg = pygame.Rect(grid_start_x - 15, grid_start_y - 15,
                           total_grid_width + 30, total_grid_height + 30)
-    pygame.draw.rect(surface, (40, 40, 60, 200), grid_bg)
-    pygame.draw.rect(surface, (100, 100, 150), grid_bg, 3)
+    pygame.draw.rect(page_surface, (40, 40, 60, 200), grid_bg)
+    pygame.draw.rect(page_surface, (100, 100, 150), grid_bg, 3)
 
     # 绘制左侧网格
     grid_rects = []
@@ -1987,8 +2003,7 @@ def draw_codex_detail_page(surface, detail_type, selected_index, font_large, fon
 
             # 检查是否选中或悬浮
             is_selected = (index == selected_index)
-            is_hovered = (state_manager and
-                          state_manager.is_button_hovered(f"grid_{index}", "codex_detail"))
+            is_hovered = (hover_button == f"grid_{index}")
 
             # 绘制单元格背景
             if is_selected:
@@ -1998,8 +2013,8 @@ def draw_codex_detail_page(surface, detail_type, selected_index, font_large, fon
             else:
                 cell_color = (60, 60, 80)  # 默认颜色
 
-            pygame.draw.rect(surface, cell_color, cell_rect)
-            pygame.draw.rect(surface, (150, 150, 200), cell_rect, 2)
+            pygame.draw.rect(page_surface, cell_color, cell_rect)
+            pygame.draw.rect(page_surface, (150, 150, 200), cell_rect, 2)
 
             # 绘制图标
             if scaled_images and item_data.get('icon_key') in scaled_images:
@@ -2008,13 +2023,13 @@ def draw_codex_detail_page(surface, detail_type, selected_index, font_large, fon
                 icon_scaled = pygame.transform.scale(icon_img, (cell_size - 10, cell_size - 10))
                 icon_x = cell_x + 5
                 icon_y = cell_y + 5
-                surface.blit(icon_scaled, (icon_x, icon_y))
+                page_surface.blit(icon_scaled, (icon_x, icon_y))
             else:
                 # 绘制默认图标（彩色矩形）
                 default_color = item_data.get('color', (150, 150, 150))
                 icon_rect = pygame.Rect(cell_x + 10, cell_y + 10, cell_size - 20, cell_size - 20)
-                pygame.draw.rect(surface, default_color, icon_rect)
-                pygame.draw.rect(surface, WHITE, icon_rect, 1)
+                pygame.draw.rect(page_surface, default_color, icon_rect)
+                pygame.draw.rect(page_surface, WHITE, icon_rect, 1)
 
                 # 在默认图标中绘制名称首字母
                 if item_data.get('name'):
@@ -2022,7 +2037,7 @@ def draw_codex_detail_page(surface, detail_type, selected_index, font_large, fon
                     char_text = font_medium.render(first_char, True, WHITE)
                     char_x = icon_rect.centerx - char_text.get_width() // 2
                     char_y = icon_rect.centery - char_text.get_height() // 2
-                    surface.blit(char_text, (char_x, char_y))
+                    page_surface.blit(char_text, (char_x, char_y))
 
             grid_rects.append((cell_rect, item_data))
 
@@ -2034,8 +2049,8 @@ def draw_codex_detail_page(surface, detail_type, selected_index, font_large, fon
 
     # 绘制展示区域背景
     display_bg = pygame.Rect(display_start_x, display_start_y, display_width, display_height)
-    pygame.draw.rect(surface, (50, 50, 70, 220), display_bg)
-    pygame.draw.rect(surface, (120, 120, 180), display_bg, 3)
+    pygame.draw.rect(page_surface, (50, 50, 70, 220), display_bg)
+    pygame.draw.rect(page_surface, (120, 120, 180), display_bg, 3)
 
     # 获取当前选中的项目数据
     if 0 <= selected_index < len(codex_data):
@@ -2045,15 +2060,15 @@ def draw_codex_detail_page(surface, detail_type, selected_index, font_large, fon
         name_text = font_medium.render(selected_item.get('name', '未知'), True, WHITE)
         name_x = display_start_x + (display_width - name_text.get_width()) // 2
         name_y = display_start_y + 10  # 修改：从20改为10，向上移动
-        surface.blit(name_text, (name_x, name_y))
+        page_surface.blit(name_text, (name_x, name_y))
 
         # 绘制大图区域
         large_img_y = name_y + 50
         large_img_height = 200
         large_img_rect = pygame.Rect(display_start_x + 20, large_img_y,
                                      display_width - 40, large_img_height)
-        pygame.draw.rect(surface, (30, 30, 50), large_img_rect)
-        pygame.draw.rect(surface, (100, 100, 150), large_img_rect, 2)
+        pygame.draw.rect(page_surface, (30, 30, 50), large_img_rect)
+        pygame.draw.rect(page_surface, (100, 100, 150), large_img_rect, 2)
 
         # 绘制大图
         if scaled_images and selected_item.get('large_icon_key') in scaled_images:
@@ -2068,14 +2083,14 @@ def draw_codex_detail_page(surface, detail_type, selected_index, font_large, fon
             large_img_scaled = pygame.transform.scale(large_img, (new_width, new_height))
             img_x = large_img_rect.centerx - new_width // 2
             img_y = large_img_rect.centery - new_height // 2
-            surface.blit(large_img_scaled, (img_x, img_y))
+            page_surface.blit(large_img_scaled, (img_x, img_y))
         else:
             # 绘制默认大图标
             default_color = selected_item.get('color', (150, 150, 150))
             default_large_rect = pygame.Rect(large_img_rect.centerx - 80, large_img_rect.centery - 80,
                                              160, 160)
-            pygame.draw.rect(surface, default_color, default_large_rect)
-            pygame.draw.rect(surface, WHITE, default_large_rect, 3)
+            pygame.draw.rect(page_surface, default_color, default_large_rect)
+            pygame.draw.rect(page_surface, WHITE, default_large_rect, 3)
 
             # 绘制大号名称首字母
             if selected_item.get('name'):
@@ -2083,18 +2098,18 @@ def draw_codex_detail_page(surface, detail_type, selected_index, font_large, fon
                 char_text = font_large.render(first_char, True, WHITE)
                 char_x = default_large_rect.centerx - char_text.get_width() // 2
                 char_y = default_large_rect.centery - char_text.get_height() // 2
-                surface.blit(char_text, (char_x, char_y))
+                page_surface.blit(char_text, (char_x, char_y))
 
         # 绘制描述区域
         desc_y = large_img_y + large_img_height + 20
         desc_height = display_height - (desc_y - display_start_y) - 20
         desc_rect = pygame.Rect(display_start_x + 20, desc_y, display_width - 40, desc_height)
-        pygame.draw.rect(surface, (20, 20, 40), desc_rect)
-        pygame.draw.rect(surface, (80, 80, 120), desc_rect, 2)
+        pygame.draw.rect(page_surface, (20, 20, 40), desc_rect)
+        pygame.draw.rect(page_surface, (80, 80, 120), desc_rect, 2)
 
         # 绘制描述文字标题 - 使用小字体
         desc_title = font_small.render("描述:", True, WHITE)
-        surface.blit(desc_title, (desc_rect.x + 15, desc_rect.y + 15))
+        page_surface.blit(desc_title, (desc_rect.x + 15, desc_rect.y + 15))
 
         # 绘制描述内容 - 使用按字符数换行（关键修改）
         desc_text = selected_item.get('description', '详细描述待添加...')
@@ -2119,12 +2134,41 @@ def draw_codex_detail_page(surface, detail_type, selected_index, font_large, fon
                     prev_line_text = wrapped_lines[i - 1]
                     prev_line_surface = font_tiny.render(prev_line_text, True, (200, 200, 200))
                     ellipsis_x = desc_rect.x + 15 + prev_line_surface.get_width() + 5
-                    surface.blit(ellipsis, (ellipsis_x, prev_line_y))
+                    page_surface.blit(ellipsis, (ellipsis_x, prev_line_y))
                 break
 
             # 渲染当前行
             line_surface = font_tiny.render(line, True, (200, 200, 200))
-            surface.blit(line_surface, (desc_rect.x + 15, line_y))
+            page_surface.blit(line_surface, (desc_rect.x + 15, line_y))
+
+    return page_surface, (back_btn, grid_rects)
+
+
+def draw_codex_detail_page(surface, detail_type, selected_index, font_large, font_medium, font_small, font_tiny,
+                           scaled_images=None, state_manager=None):
+    """
+    绘制详细图鉴页面（修复版本 - 支持中文按字符数换行）
+
+    Args:
+        surface: 绘制表面
+        detail_type: "plants" 或 "zombies"
+        selected_index: 当前选中的项目索引
+        font_large/medium/small: 字体
+        scaled_images: 缩放后的图像字典
+        state_manager: 状态管理器
+
+    Returns:
+        (back_btn, grid_rects): 返回按钮和网格矩形列表
+    """
+
+    # 页面内容只在选中项或悬浮格子变化时重绘，描述换行等也只在重绘时计算
+    hover_button = (state_manager.hover_button
+                    if state_manager and state_manager.hover_button_type == "codex_detail" else None)
+    page_surface, (back_btn, grid_rects) = page_cache.get(
+        "codex_detail", (detail_type, selected_index, hover_button),
+        lambda: _build_codex_detail_page(detail_type, selected_index, hover_button, font_large, font_medium,
+                                         font_small, font_tiny, scaled_images))
+    surface.blit(page_surface, (0, 0))
 
     return back_btn, grid_rects
 
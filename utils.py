@@ -313,12 +313,12 @@ def can_place_plant_at_position(game, plant_type, row, col, level_manager):
         bool: 是否可以种植
     """
     # 检查该位置是否已有植物
-    for plant in game["plants"]:
-        if plant.row == row and plant.col == col:
-            # 如果是坚果墙且血量不满，可以修复
-            if plant_type == "wall_nut" and plant.plant_type == "wall_nut":
-                return plant.health < plant.max_health
-            return False
+    plant = game["plants"].get(row, col)
+    if plant is not None:
+        # 如果是坚果墙且血量不满，可以修复
+        if plant_type == "wall_nut" and plant.plant_type == "wall_nut":
+            return plant.health < plant.max_health
+        return False
 
     # 检查向日葵种植限制
     if plant_type == "sunflower":
@@ -414,11 +414,7 @@ def should_show_plant_preview(game, selected_plant_type, target_row, target_col)
         tuple: (是否显示预览, 是否可以放置)
     """
     # 检查目标位置是否有植物
-    target_plant = None
-    for plant in game["plants"]:
-        if plant.row == target_row and plant.col == target_col:
-            target_plant = plant
-            break
+    target_plant = game["plants"].get(target_row, target_col)
 
     # 如果目标位置没有植物，正常显示预览
     if target_plant is None:
@@ -5,7 +5,7 @@
 from .base_zombie import BaseZombie
 from .normal_zombie import NormalZombie
 from .giant_zombie import GiantZombie
-from .zombie_factory import ZombieFactory, create_zombie
+from .zombie_factory import ZombieFactory, create_zombie, release_zombie, zombie_class
 from .effects import CucumberSprayParticle
 
 # 为了保持向后兼容，导出Zombie类
@@ -17,6 +17,8 @@ __all__ = [
     'GiantZombie',
     'ZombieFactory',
     'create_zombie',
+    'release_zombie',
+    'zombie_class',
     'Zombie',
     'CucumberSprayParticle'
 ]
\ No newline at end of file
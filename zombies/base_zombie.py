@@ -5,16 +5,33 @@ import pygame
 import random
 import math
 
+# 波次模式下快速僵尸的移动速度倍数（每帧按基础速度重新计算）
+WAVE_FAST_SPEED_MULTIPLIER = 2.5
+
 
 class BaseZombie:
     """所有僵尸的基类，包含通用属性和方法"""
 
+    # 所有字段在这里声明，实例不再带 __dict__；子类只声明自己新增的字段
+    __slots__ = (
+        'row', 'col', 'zombie_type', 'constants', 'sounds', 'images',
+        'health', 'max_health', 'base_speed', 'speed', 'attack_dmg', 'size_multiplier',
+        'is_fast', 'wave_mode', 'is_attacking', 'bite_timer',
+        'has_armor', 'armor_health', 'max_armor_health',
+        'immunity_chance', 'is_stunned', 'is_spraying', 'stun_visual_timer',
+        'spray_particles', 'spray_particle_timer', 'cucumber_marked_for_death',
+        'is_frozen', 'freeze_start_time', 'original_speed',
+        'is_dying', 'death_animation_timer', 'death_animation_duration', 'current_alpha',
+        'death_speed_reduction', 'prev_col', 'prev_row',
+        '__weakref__',  # 追踪子弹以弱引用持有目标
+    )
+
     def __init__(self, row, has_armor_prob=0.3, is_fast=False, wave_mode=False,
                  fast_multiplier=2.5, constants=None, sounds=None, images=None,
                  level_settings=None, zombie_type="normal"):
         # 基础属性
         self.row = row
-        self.col = constants['GRID_WIDTH'] if constants else 9  # 从最右侧生成
+        self.col = constants.GRID_WIDTH if constants else 9  # 从最右侧生成
         self.zombie_type = zombie_type
 
         # 存储引用
@@ -37,6 +54,13 @@ class BaseZombie:
         self.is_spraying = False  # 是否正在喷射
         self.stun_visual_timer = 0  # 眩晕视觉效果计时器
         self.spray_particles = []  # 喷射粒子列表
+        self.spray_particle_timer = 0  # 喷射粒子生成计时器
+        self.cucumber_marked_for_death = False  # 黄瓜喷射结束后死亡
+
+        # 冰冻属性（寒冰子弹），未冰冻时开始时间和原始速度为 None
+        self.is_frozen = False
+        self.freeze_start_time = None
+        self.original_speed = None
 
         # 死亡动画属性
         self.is_dying = False
@@ -45,6 +69,10 @@ class BaseZombie:
         self.current_alpha = 255
         self.death_speed_reduction = 1.0
 
+        # 上一逻辑帧的位置，供渲染插值使用
+        self.prev_col = None
+        self.prev_row = None
+
         # 应用等级设置
         if level_settings:
             if level_settings.get("zombie_health_reduce", False):
@@ -59,6 +87,15 @@ class BaseZombie:
         # 计算最终速度
         self.speed = self.base_speed * (fast_multiplier if (self.wave_mode and self.is_fast) else 1)
 
+    def reset(self, row, **kwargs):
+        """回收复用：按新的参数重新初始化全部字段，结果与新建的僵尸完全相同（随机数消耗也相同）"""
+        type(self).__init__(self, row, **kwargs)
+
+    @classmethod
+    def wave_walk_speed(cls, is_fast=False):
+        """波次模式下每帧的行走速度（格/帧）"""
+        return cls.BASE_SPEED * (WAVE_FAST_SPEED_MULTIPLIER if is_fast else 1)
+
     def start_death_animation(self):
         """开始死亡动画"""
         if not self.is_dying:
@@ -107,12 +144,12 @@ class BaseZombie:
             return
 
         # 正确处理速度更新，考虑冰冻状态
-        if hasattr(self, 'is_frozen') and self.is_frozen:
+        if self.is_frozen:
             # 冰冻状态下不更新速度，保持减速状态
             pass
         else:
             # 只有在非冰冻状态下才重新计算速度
-            self.speed = self.base_speed * (2.5 if (self.wave_mode and self.is_fast) else 1)
+            self.speed = self.base_speed * (WAVE_FAST_SPEED_MULTIPLIER if (self.wave_mode and self.is_fast) else 1)
 
         # 调用子类的具体攻击逻辑
         self._update_attack_logic(plants)
@@ -139,12 +176,10 @@ class BaseZombie:
         from .effects import CucumberSprayParticle
 
         # 计算僵尸的像素位置
-        zombie_x = (self.constants['BATTLEFIELD_LEFT'] +
-                    self.col * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP']) +
-                    self.constants['GRID_SIZE'] // 2)
-        zombie_y = (self.constants['BATTLEFIELD_TOP'] +
-                    self.row * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP']) +
-                    self.constants['GRID_SIZE'] // 2)
+        zombie_x = (self.constants.cell_x(self.col) +
+                    self.constants.GRID_SIZE // 2)
+        zombie_y = (self.constants.cell_y(self.row) +
+                    self.constants.GRID_SIZE // 2)
 
         # 创建喷射粒子（向前方喷射）
         for _ in range(particles_count):
@@ -157,17 +192,15 @@ class BaseZombie:
             return
 
         # 计算基础位置
-        base_x = self.constants['BATTLEFIELD_LEFT'] + int(
-            self.col * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP']))
-        base_y = self.constants['BATTLEFIELD_TOP'] + self.row * (
-                self.constants['GRID_SIZE'] + self.constants['GRID_GAP'])
+        base_x = self.constants.BATTLEFIELD_LEFT + int(self.col * self.constants.CELL_STEP)
+        base_y = self.constants.cell_y(self.row)
 
         # 根据size_multiplier计算实际大小
-        actual_size = int(self.constants['GRID_SIZE'] * self.size_multiplier)
+        actual_size = int(self.constants.GRID_SIZE * self.size_multiplier)
 
         # 居中调整位置（让大僵尸不会偏移）
-        x = base_x - int((actual_size - self.constants['GRID_SIZE']) / 2)
-        y = base_y - int((actual_size - self.constants['GRID_SIZE']) / 2)
+        x = base_x - int((actual_size - self.constants.GRID_SIZE) / 2)
+        y = base_y - int((actual_size - self.constants.GRID_SIZE) / 2)
 
         # 死亡动画：应用透明度
         if self.is_dying:
@@ -237,7 +270,7 @@ class BaseZombie:
                     surface.blit(self.images['armor_img'], (armor_x, armor_y))
 
                 # 如果僵尸被冰冻，在防具上也应用冰冻效果
-                if hasattr(self, 'is_frozen') and self.is_frozen:
+                if self.is_frozen:
                     ice_overlay = pygame.Surface((armor_size, armor_size), pygame.SRCALPHA)
                     ice_overlay.fill((70, 130, 180, 80))
                     surface.blit(ice_overlay, (armor_x, armor_y))
@@ -247,9 +280,9 @@ class BaseZombie:
                 armor_x = x + armor_offset
                 armor_y = y + armor_offset
 
-                armor_color = self.constants['ARMOR_COLOR']
+                armor_color = self.constants.ARMOR_COLOR
                 # 如果僵尸被冰冻，防具也变成冰蓝色
-                if hasattr(self, 'is_frozen') and self.is_frozen:
+                if self.is_frozen:
                     armor_color = (70, 130, 180)
 
                 pygame.draw.rect(surface, armor_color, (armor_x, armor_y, armor_size, armor_size))
@@ -278,11 +311,11 @@ class BaseZombie:
         # 绘制僵尸血条（下方）
         health_ratio = self.health / self.max_health if self.max_health > 0 else 0
         health_bar_width = health_ratio * actual_size
-        blood_bar_y = base_y + self.constants['GRID_SIZE']
+        blood_bar_y = base_y + self.constants.GRID_SIZE
 
-        pygame.draw.rect(surface, self.constants['RED'],
+        pygame.draw.rect(surface, self.constants.RED,
                          (base_x, blood_bar_y, actual_size, 5))
-        pygame.draw.rect(surface, self.constants['BLUE'],
+        pygame.draw.rect(surface, self.constants.BLUE,
                          (base_x, blood_bar_y, health_bar_width, 5))
 
         # 绘制防具血条（上方）
@@ -291,9 +324,9 @@ class BaseZombie:
             armor_bar_width = armor_ratio * actual_size
             armor_bar_y = base_y - 15
 
-            pygame.draw.rect(surface, self.constants['RED'],
+            pygame.draw.rect(surface, self.constants.RED,
                              (base_x, armor_bar_y, actual_size, 5))
-            pygame.draw.rect(surface, self.constants['ARMOR_COLOR'],
+            pygame.draw.rect(surface, self.constants.ARMOR_COLOR,
                              (base_x, armor_bar_y, armor_bar_width, 5))
 
     def _draw_stun_indicator(self, surface, base_x, base_y, actual_size):
@@ -9,6 +9,9 @@ import math
 class CucumberSprayParticle:
     """黄瓜喷射粒子 - 乳白色，向前喷射"""
 
+    __slots__ = ('x', 'y', 'radius', 'max_radius', 'direction', 'vx', 'vy', 'gravity', 'friction', 'color',
+                 'life', 'max_life', 'alpha', 'rotation', 'rotation_speed', 'pulse_speed')
+
     def __init__(self, x, y, direction=1):
         self.x = x
         self.y = y
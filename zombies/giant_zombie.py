@@ -8,13 +8,17 @@ from .base_zombie import BaseZombie
 class GiantZombie(BaseZombie):
     """巨人僵尸实现"""
 
+    __slots__ = ('smash_attack_delay', 'smash_attack_interval', 'smash_timer', 'has_attacked_once', 'attack_target')
+
+    BASE_SPEED = 0.003  # 移动更慢
+
     def __init__(self, row, has_armor_prob=0.3, is_fast=False, wave_mode=False,
                  fast_multiplier=2.5, constants=None, sounds=None, images=None,
                  level_settings=None):
         # 设置巨人僵尸的基础属性
         self.health = 1700
         self.max_health = 1700
-        self.base_speed = 0.003  # 移动更慢
+        self.base_speed = self.BASE_SPEED
         self.attack_dmg = 750  # 砸击伤害更高
         self.size_multiplier = 1.35  # 体积更大
 
@@ -36,25 +40,10 @@ class GiantZombie(BaseZombie):
     def _update_attack_logic(self, plants):
         """巨人僵尸的砸击攻击逻辑"""
         # 检测是否碰撞植物（更精确的碰撞检测）
-        collision_plant = None
-        for plant in plants:
-            if plant.row == self.row:
-                # 计算实际的碰撞检测范围
-                zombie_actual_size = self.constants['GRID_SIZE'] * self.size_multiplier
-                plant_size = self.constants['GRID_SIZE']
-
-                # 僵尸位置（考虑大小）
-                zombie_left = self.col
-                zombie_right = self.col + (zombie_actual_size / self.constants['GRID_SIZE'])
-
-                # 植物位置
-                plant_left = plant.col
-                plant_right = plant.col + 1
-
-                # 检测重叠
-                if zombie_left < plant_right and zombie_right > plant_left:
-                    collision_plant = plant
-                    break
+        # 僵尸位置（考虑大小），植物占 [col, col+1)，用植物网格查找重叠的格子
+        zombie_left = self.col
+        zombie_right = self.col + self.size_multiplier
+        collision_plant = plants.first_in_span(self.row, zombie_left, zombie_right)
 
         if collision_plant:
             # 发现碰撞，开始攻击状态
@@ -109,7 +98,7 @@ class GiantZombie(BaseZombie):
             scaled_img = pygame.transform.scale(original_img, (actual_size, actual_size))
 
             # 修复：改进冰冻效果 - 使用海蓝色覆盖层
-            if hasattr(self, 'is_frozen') and self.is_frozen:
+            if self.is_frozen:
                 # 创建海蓝色冰冻效果
                 freeze_surface = scaled_img.copy()
 
@@ -132,10 +121,10 @@ class GiantZombie(BaseZombie):
                 surface.blit(scaled_img, (x, y))
         else:
             # 没有图片时使用矩形
-            color = self.constants.get('GIANT_COLOR', self.constants['GRAY'])
+            color = self.constants.GRAY
 
             # 根据状态改变颜色
-            if hasattr(self, 'is_frozen') and self.is_frozen:
+            if self.is_frozen:
                 color = (70, 130, 180)  # 海蓝色表示冰冻
             elif self.is_stunned:
                 color = (255, 255, 0)  # 黄色表示眩晕
@@ -150,7 +139,7 @@ class GiantZombie(BaseZombie):
             scaled_img = pygame.transform.scale(original_img, (actual_size, actual_size))
             surface.blit(scaled_img, (x, y))
         else:
-            color = self.constants.get('GIANT_COLOR', self.constants.get('GRAY', (128, 128, 128)))
+            color = self.constants.GRAY
             pygame.draw.rect(surface, color, (x, y, actual_size, actual_size))
 
     def draw(self, surface):
@@ -8,13 +8,17 @@ from .base_zombie import BaseZombie
 class NormalZombie(BaseZombie):
     """普通僵尸实现"""
 
+    __slots__ = ()
+
+    BASE_SPEED = 0.004
+
     def __init__(self, row, has_armor_prob=0.3, is_fast=False, wave_mode=False,
                  fast_multiplier=2.5, constants=None, sounds=None, images=None,
                  level_settings=None):
         # 设置普通僵尸的基础属性
         self.health = 150
         self.max_health = 150
-        self.base_speed = 0.004
+        self.base_speed = self.BASE_SPEED
         self.attack_dmg = 1
         self.size_multiplier = 1.0
 
@@ -33,27 +37,26 @@ class NormalZombie(BaseZombie):
         if not self.is_attacking:
             self.col -= self.speed
 
-        # 检测是否碰撞植物（同列同排）
-        self.is_attacking = False
-        for plant in plants:
-            if plant.row == self.row and abs(self.col - plant.col) < 0.5:
-                self.is_attacking = True
+        # 检测是否碰撞植物（同列同排），通过植物网格直接定位所在格子
+        plant = plants.plant_near(self.row, self.col)
+        self.is_attacking = plant is not None
+        if plant is None:
+            return
 
-                # 修复：使用植物的 take_damage 方法而不是直接修改血量
-                plant.take_damage(self.attack_dmg)
+        # 修复：使用植物的 take_damage 方法而不是直接修改血量
+        plant.take_damage(self.attack_dmg)
 
-                # 控制啃咬音效播放（每0.5秒一次）
-                bite_interval = self.constants.get('BITE_INTERVAL', 30)
-                self.bite_timer += 1
-                if self.bite_timer >= bite_interval:
-                    if self.sounds and self.sounds.get("bite"):
-                        self.sounds["bite"].play()
-                    self.bite_timer = 0
+        # 控制啃咬音效播放（每0.5秒一次）
+        bite_interval = self.constants.BITE_INTERVAL
+        self.bite_timer += 1
+        if self.bite_timer >= bite_interval:
+            if self.sounds and self.sounds.get("bite"):
+                self.sounds["bite"].play()
+            self.bite_timer = 0
 
-                # 修复：检查植物是否死亡，使用统一的死亡判断方法
-                if not plant.is_alive():
-                    plants.remove(plant)  # 植物死亡移除
-                break
+        # 修复：检查植物是否死亡，使用统一的死亡判断方法
+        if not plant.is_alive():
+            plants.remove(plant)  # 植物死亡移除
 
     def _draw_zombie_body(self, surface, x, y, base_x, base_y, actual_size):
         """绘制普通僵尸本体"""
@@ -61,7 +64,7 @@ class NormalZombie(BaseZombie):
             zombie_img = self.images['zombie_img']
 
             # 修复：改进冰冻效果处理
-            if hasattr(self, 'is_frozen') and self.is_frozen:
+            if self.is_frozen:
                 # 先绘制原图
                 surface.blit(zombie_img, (base_x, base_y))
 
@@ -81,10 +84,10 @@ class NormalZombie(BaseZombie):
                 surface.blit(zombie_img, (base_x, base_y))
         else:
             # 没有图片时使用矩形
-            color = self.constants['GRAY']
+            color = self.constants.GRAY
 
             # 根据状态改变颜色
-            if hasattr(self, 'is_frozen') and self.is_frozen:
+            if self.is_frozen:
                 color = (70, 130, 180)  # 海蓝色表示冰冻
             elif self.is_stunned:
                 color = (255, 255, 0)  # 黄色表示眩晕
@@ -96,5 +99,5 @@ class NormalZombie(BaseZombie):
         if self.images and self.images.get('zombie_img'):
             surface.blit(self.images['zombie_img'], (x, y))
         else:
-            color = self.constants.get('GRAY', (128, 128, 128))
+            color = self.constants.GRAY
             pygame.draw.rect(surface, color, (x, y, actual_size, actual_size))
\ No newline at end of file
@@ -1,9 +1,33 @@
 """
 僵尸工厂类 - 用于创建不同类型的僵尸
 """
+from performance import ObjectPool
 from .normal_zombie import NormalZombie
 from .giant_zombie import GiantZombie
 
+# 僵尸类型 -> 僵尸类，未知类型按普通僵尸处理
+ZOMBIE_CLASSES = {
+    "normal": NormalZombie,
+    "giant": GiantZombie,
+}
+
+# 每种僵尸一个对象池，移出场地的僵尸回收后用 reset 重新初始化复用
+ZOMBIE_POOL_SIZE = 64
+_zombie_pools = {cls: ObjectPool(cls, cls.reset, ZOMBIE_POOL_SIZE, cls.__name__)
+                 for cls in ZOMBIE_CLASSES.values()}
+
+
+def zombie_class(zombie_type):
+    """僵尸类型对应的类"""
+    return ZOMBIE_CLASSES.get(zombie_type, NormalZombie)
+
+
+def release_zombie(zombie):
+    """回收已经移出场地的僵尸（调用方不能再使用它）"""
+    pool = _zombie_pools.get(type(zombie))
+    if pool is not None:
+        pool.return_object(zombie)
+
 
 class ZombieFactory:
     """僵尸工厂类 - 为了保持向后兼容性"""
@@ -11,7 +35,7 @@ class ZombieFactory:
     @staticmethod
     def create_zombie(row, zombie_type="normal", **kwargs):
         """
-        创建指定类型的僵尸
+        创建指定类型的僵尸（优先复用对象池中回收的僵尸）
 
         Args:
             row: 僵尸所在行
@@ -21,13 +45,7 @@ class ZombieFactory:
         Returns:
             相应类型的僵尸实例
         """
-        if zombie_type == "giant":
-            return GiantZombie(row, **kwargs)
-        elif zombie_type == "normal":
-            return NormalZombie(row, **kwargs)
-        else:
-            # 默认创建普通僵尸
-            return NormalZombie(row, **kwargs)
+        return _zombie_pools[zombie_class(zombie_type)].get_object(row, **kwargs)
 
     def __new__(cls, row, has_armor_prob=0.3, is_fast=False, wave_mode=False,
                 fast_multiplier=2.5, constants=None, sounds=None, images=None,
@@ -69,4 +87,5 @@ def create_zombie(row, zombie_type="normal", **kwargs):
         # 创建巨人僵尸
         zombie2 = create_zombie(1, "giant", is_fast=True)
     """
-    return ZombieFactory.create_zombie(row, zombie_type, **kwargs)
\ No newline at end of file
+    return ZombieFactory.create_zombie(row, zombie_type, **kwargs)
+